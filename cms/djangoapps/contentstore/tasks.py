@@ -9,7 +9,7 @@ import os
 import shutil
 import tarfile
 from datetime import datetime
-from tempfile import NamedTemporaryFile, mkdtemp
+from tempfile import NamedTemporaryFile
 
 from celery.task import task
 from celery.utils.log import get_task_logger
@@ -45,7 +45,7 @@ from xmodule.exceptions import SerializationError
 from xmodule.modulestore import COURSE_ROOT, LIBRARY_ROOT
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import DuplicateCourseError, ItemNotFoundError
-from xmodule.modulestore.xml_exporter import export_course_to_xml, export_library_to_xml
+from xmodule.modulestore.xml_exporter import export_course_to_tar, export_library_to_tar
 from xmodule.modulestore.xml_importer import import_course_from_xml, import_library_from_xml
 
 
@@ -236,20 +236,19 @@ def create_export_tarball(course_module, course_key, context, status=None):
     """
     name = course_module.url_name
     export_file = NamedTemporaryFile(prefix=name + '.', suffix=".tar.gz")
-    root_dir = path(mkdtemp())
 
     try:
-        if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
-        else:
-            export_course_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
-
-        if status:
-            status.set_state(u'Compressing')
-            status.increment_completed_steps()
         LOGGER.debug(u'tar file being generated at %s', export_file.name)
+        # The course is exported straight into the tar file, without writing it to disk first.
         with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-            tar_file.add(root_dir / name, arcname=name)
+            if isinstance(course_key, LibraryLocator):
+                export_library_to_tar(modulestore(), contentstore(), course_key, name, tar_file)
+            else:
+                export_course_to_tar(modulestore(), contentstore(), course_module.id, name, tar_file)
+
+            if status:
+                status.set_state(u'Compressing')
+                status.increment_completed_steps()
 
     except SerializationError as exc:
         LOGGER.exception(u'There was an error exporting %s', course_key)
@@ -282,9 +281,6 @@ def create_export_tarball(course_module, course_key, context, status=None):
         if status:
             status.fail(json.dumps({'raw_error_msg': context['raw_err_msg']}))
         raise
-    finally:
-        if os.path.exists(root_dir / name):
-            shutil.rmtree(root_dir / name)
 
     return export_file
 
@@ -472,7 +468,8 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
                 settings.GITHUB_REPO_ROOT, [dirpath],
                 load_error_modules=False,
                 static_content_store=contentstore(),
-                target_id=courselike_key
+                target_id=courselike_key,
+                static_import_threads=settings.COURSE_IMPORT_STATIC_THREADS,
             )
 
         new_location = courselike_items[0].location
@@ -326,6 +326,8 @@ else:
 
 USER_TASKS_ARTIFACT_STORAGE = COURSE_IMPORT_EXPORT_STORAGE
 
+COURSE_IMPORT_STATIC_THREADS = ENV_TOKENS.get('COURSE_IMPORT_STATIC_THREADS', COURSE_IMPORT_STATIC_THREADS)
+
 DATABASES = AUTH_TOKENS['DATABASES']
 
 # The normal database user does not have enough permissions to run migrations.
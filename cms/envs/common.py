@@ -557,6 +557,10 @@ MESSAGE_STORAGE = 'django.contrib.messages.storage.session.SessionStorage'
 
 COURSE_IMPORT_EXPORT_STORAGE = 'django.core.files.storage.FileSystemStorage'
 
+# The number of threads which import the static assets of an uploaded course
+# while its blocks are imported; 0 imports them before the blocks.
+COURSE_IMPORT_STATIC_THREADS = 0
+
 ##### EMBARGO #####
 EMBARGO_SITE_REDIRECT_URL = None
 
@@ -1,8 +1,11 @@
 """
 MongoDB/GridFS-level code for the contentstore.
 """
+import calendar
 import os
 import json
+import posixpath
+import tarfile
 import pymongo
 import gridfs
 from gridfs.errors import NoFile
@@ -170,6 +173,31 @@ class MongoContentStore(ContentStore):
         with disk_fs.open(export_name, 'wb') as asset_file:
             asset_file.write(content.data)
 
+    def export_to_tar(self, location, tar_file, output_directory):
+        """
+        Write the asset at location to tar_file, at the same path under output_directory
+        as export would write it to. The asset is streamed from GridFS in chunks rather
+        than being read into memory.
+        """
+        content_id, __ = self.asset_db_key(location)
+        try:
+            fp = self.fs.get(content_id)
+        except NoFile:
+            raise NotFoundError(content_id)
+
+        with fp:
+            import_path = getattr(fp, 'import_path', None)
+            if import_path is not None:
+                output_directory = posixpath.join(output_directory, posixpath.dirname(import_path))
+
+            # Escape invalid char from filename.
+            export_name = escape_invalid_characters(name=fp.displayname, invalid_char_list=['/', '\\'])
+
+            tar_info = tarfile.TarInfo(posixpath.normpath(posixpath.join(output_directory, export_name)))
+            tar_info.size = fp.length
+            tar_info.mtime = calendar.timegm(fp.uploadDate.utctimetuple())
+            tar_file.addfile(tar_info, fp)
+
     def export_all_for_course(self, course_key, output_directory, assets_policy_file):
         """
         Export all of this course's assets to the output_directory. Export all of the assets'
@@ -194,13 +222,39 @@ class MongoContentStore(ContentStore):
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
             self.export(asset['asset_key'], output_directory)
-            for attr, value in asset.iteritems():
-                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
-                    policy.setdefault(asset['asset_key'].name, {})[attr] = value
+            self._add_asset_policy(policy, asset)
 
         with open(assets_policy_file, 'w') as f:
             json.dump(policy, f, sort_keys=True, indent=4)
 
+    def export_all_for_course_to_tar(self, course_key, tar_file, output_directory):
+        """
+        Stream all of this course's assets into tar_file under output_directory, and return
+        their attributes, as export_all_for_course writes them to the policy file.
+
+        Args:
+            course_key (CourseKey): the :class:`CourseKey` identifying the course
+            tar_file (tarfile.TarFile): the tar file to write the asset files to
+            output_directory: the path in tar_file under which to put all the asset files
+        """
+        policy = {}
+        assets, __ = self.get_all_content_for_course(course_key)
+
+        for asset in assets:
+            self.export_to_tar(asset['asset_key'], tar_file, output_directory)
+            self._add_asset_policy(policy, asset)
+
+        return policy
+
+    @staticmethod
+    def _add_asset_policy(policy, asset):
+        """
+        Add the exported attributes of the given asset to the assets policy.
+        """
+        for attr, value in asset.iteritems():
+            if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
+                policy.setdefault(asset['asset_key'].name, {})[attr] = value
+
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
 
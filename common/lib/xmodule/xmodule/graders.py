@@ -5,6 +5,7 @@ Code used to calculate learner grades.
 from __future__ import division
 
 import abc
+from array import array
 from collections import OrderedDict
 import inspect
 import logging
@@ -105,6 +106,68 @@ def aggregate_scores(scores):
     return all_total, graded_total
 
 
+def aggregate_score_matrix(earned, possible, block_sections, num_sections):
+    """
+    Batch counterpart of aggregate_scores, which sums the graded scores of
+    many students on the same blocks into their scores on the subsections
+    containing those blocks.
+
+    earned: A students x blocks matrix (a sequence of sequences) of the
+        weighted points earned by each student on each block
+    possible: A students x blocks matrix of the weighted points possible
+        for each student on each block
+    block_sections: For each block (column), the index of the subsection
+        containing it, or None if the block is not graded
+    num_sections: The number of subsections
+    returns: A tuple (earned, possible) of students x subsections
+        matrices (lists of arrays) of the students' graded totals, as used
+        by GradeSheetMatrix
+    """
+    columns = [(block, section) for block, section in enumerate(block_sections) if section is not None]
+    section_earned = []
+    section_possible = []
+    for earned_row, possible_row in zip(earned, possible):
+        earned_totals = array('d', [0.0]) * num_sections
+        possible_totals = array('d', [0.0]) * num_sections
+        for block, section in columns:
+            earned_totals[section] += earned_row[block]
+            possible_totals[section] += possible_row[block]
+        section_earned.append(earned_totals)
+        section_possible.append(possible_totals)
+    return section_earned, section_possible
+
+
+class GradeSheetMatrix(object):
+    """
+    The batch counterpart of a grade_sheet, holding the graded totals of
+    many students on the same subsections, for grading all of the
+    students at once with CourseGrader.grade_batch.
+
+    section_formats: The format of each subsection (column)
+    earned: A students x subsections matrix of the weighted points earned
+        by each student on each subsection, as returned by
+        aggregate_score_matrix
+    possible: A students x subsections matrix of the weighted points
+        possible for each student on each subsection
+
+    As with the grade_sheets of CourseGrade, a subsection is excluded from
+    a student's grade if there are no points possible for the student.
+    """
+    def __init__(self, section_formats, earned, possible):
+        self.section_formats = section_formats
+        self.earned = earned
+        self.possible = possible
+
+    def __len__(self):
+        return len(self.earned)
+
+    def columns(self, section_format):
+        """
+        Returns the indices of the subsections of the given format.
+        """
+        return [index for index, value in enumerate(self.section_formats) if value == section_format]
+
+
 def invalid_args(func, argdict):
     """
     Given a function and a dictionary of arguments, returns a set of arguments
@@ -205,6 +268,14 @@ class CourseGrader(object):
         '''Given a grade sheet, return a dict containing grading information'''
         raise NotImplementedError
 
+    def grade_batch(self, grade_sheets):
+        """
+        Given a GradeSheetMatrix of many students, return a dict whose 'percent'
+        is an array of the final percentage score of each student, as would be
+        computed by grade().  Breakdowns for display are not computed.
+        """
+        raise NotImplementedError
+
 
 class WeightedSubsectionsGrader(CourseGrader):
     """
@@ -250,6 +321,27 @@ class WeightedSubsectionsGrader(CourseGrader):
             'grade_breakdown': grade_breakdown
         }
 
+    def grade_batch(self, grade_sheets):
+        """
+        In addition to the 'percent' of each student, the returned dict
+        contains a 'grade_breakdown' of each student's weighted percent,
+        keyed by category.
+        """
+        total_percents = array('d', [0.0]) * len(grade_sheets)
+        grade_breakdown = OrderedDict()
+
+        for subgrader, assignment_type, weight in self.subgraders:
+            subgrade_percents = subgrader.grade_batch(grade_sheets)['percent']
+            weighted_percents = array('d', (percent * weight for percent in subgrade_percents))
+            for student, weighted_percent in enumerate(weighted_percents):
+                total_percents[student] += weighted_percent
+            grade_breakdown[assignment_type] = weighted_percents
+
+        return {
+            'percent': total_percents,
+            'grade_breakdown': grade_breakdown,
+        }
+
 
 class AssignmentFormatGrader(CourseGrader):
     """
@@ -407,3 +499,27 @@ class AssignmentFormatGrader(CourseGrader):
             'section_breakdown': breakdown,
             # No grade_breakdown here
         }
+
+    def grade_batch(self, grade_sheets):
+        columns = grade_sheets.columns(self.type)
+        percents = array('d')
+
+        for earned_row, possible_row in zip(grade_sheets.earned, grade_sheets.possible):
+            section_percents = [
+                earned_row[column] / possible_row[column] for column in columns if possible_row[column] > 0
+            ]
+            section_percents.extend([0.0] * (self.min_count - len(section_percents)))
+
+            # Drop the lowest scores, as grade() does, summing the others in their original order.
+            dropped_indices = set()
+            if self.drop_count > 0:
+                sorted_indices = sorted(range(len(section_percents)), key=lambda index: -section_percents[index])
+                dropped_indices.update(sorted_indices[-self.drop_count:])
+            total_percent = float_sum(
+                percent for index, percent in enumerate(section_percents) if index not in dropped_indices
+            )
+            if len(section_percents) - self.drop_count > 0:
+                total_percent /= len(section_percents) - self.drop_count
+            percents.append(total_percent)
+
+        return {'percent': percents}
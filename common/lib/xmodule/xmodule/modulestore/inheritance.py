@@ -298,6 +298,16 @@ class InheritingFieldData(KvsFieldData):
             # block so that if it has a different default than the root
             # node of the tree, the block's default will be used.
             field = block.fields[name]
+
+            # If the kvs can resolve inherited values without loading the block's ancestors, do so,
+            # unless the parent is already loaded (and so may have been changed in memory).
+            inherited_value_resolver = getattr(self._kvs, 'inherited_value_resolver', None)
+            if inherited_value_resolver is not None and not block.has_cached_parent:
+                try:
+                    return inherited_value_resolver(name)
+                except KeyError:
+                    return super(InheritingFieldData, self).default(block, name)
+
             ancestor = block.get_parent()
             # In case, if block's parent is of type 'library_content',
             # bypass inheritance and use kvs' default instead of reusing
@@ -330,10 +340,17 @@ class InheritanceKeyValueStore(KeyValueStore):
     dict-based storage of fields and lookup of inherited values.
 
     Note: inherited_settings is a dict of key to json values (internal xblock field repr)
+
+    Rather than having inherited settings pushed down to it, a kvs can be given an
+    inherited_value_resolver: a function which takes a field name and returns the json value of
+    the field on the nearest ancestor that sets it (or raises KeyError if none does). The
+    InheritingFieldData then uses it to look up inherited values on demand, instead of loading
+    each of the block's ancestors.
     """
-    def __init__(self, initial_values=None, inherited_settings=None):
+    def __init__(self, initial_values=None, inherited_settings=None, inherited_value_resolver=None):
         super(InheritanceKeyValueStore, self).__init__()
         self.inherited_settings = inherited_settings or {}
+        self.inherited_value_resolver = inherited_value_resolver
         self._fields = initial_values or {}
 
     def get(self, key):
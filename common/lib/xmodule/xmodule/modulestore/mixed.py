@@ -6,6 +6,7 @@ In this way, courses can be served up via either SplitMongoModuleStore or MongoM
 """
 
 import logging
+from collections import defaultdict
 from contextlib import contextmanager
 import itertools
 import functools
@@ -30,6 +31,11 @@ new_contract('long', long)
 
 log = logging.getLogger(__name__)
 
+# The request cache keys of the courselike keys which aren't in any store (per MixedModuleStore
+# instance) and of the routing counters.
+UNKNOWN_COURSELIKES_CACHE_KEY = 'mixed_modulestore_unknown_courselikes'
+ROUTING_STATS_CACHE_KEY = 'mixed_modulestore_routing_stats'
+
 
 def strip_key(func):
     """
@@ -133,6 +139,8 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
     """
     ModuleStore knows how to route requests to the right persistence ms
     """
+    _instance_ids = itertools.count()
+
     def __init__(
             self,
             contentstore,
@@ -156,6 +164,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
 
         self.modulestores = []
         self.mappings = {}
+        self._instance_id = next(self._instance_ids)
 
         for course_id, store_name in mappings.iteritems():
             try:
@@ -206,23 +215,90 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         If locator is None, returns the first (ordered) store as the default
         """
         if locator is not None:
+            # Most locators are already clean, so try them as they are before cleaning them.
+            mapping = self.mappings.get(locator, None)
+            if mapping is not None:
+                self._increment_routing_stat('mapped')
+                return mapping
+
             locator = self._clean_locator_for_mapping(locator)
             mapping = self.mappings.get(locator, None)
             if mapping is not None:
+                self._increment_routing_stat('mapped')
                 return mapping
+
+            unknown_courselikes = self._unknown_courselikes()
+            if unknown_courselikes is not None and locator in unknown_courselikes:
+                self._increment_routing_stat('unknown')
             else:
                 if isinstance(locator, LibraryLocator):
                     has_locator = lambda store: hasattr(store, 'has_library') and store.has_library(locator)
                 else:
                     has_locator = lambda store: store.has_course(locator)
                 for store in self.modulestores:
+                    self._increment_routing_stat('store_probes')
                     if has_locator(store):
+                        self._increment_routing_stat('probed')
                         self.mappings[locator] = store
                         return store
 
+                self._increment_routing_stat('probed')
+                if unknown_courselikes is not None:
+                    unknown_courselikes.add(locator)
+        else:
+            self._increment_routing_stat('default')
+
         # return the default store
         return self.default_modulestore
 
+    def _unknown_courselikes(self):
+        """
+        Returns the set of clean courselike keys which were found not to be in any store during this
+        request, or None if there's no request cache.
+
+        These are only cached for the duration of the request, as the courselikes may be created by
+        other processes.
+        """
+        if self.request_cache is None:
+            return None
+        unknown_courselikes = self.request_cache.data.setdefault(UNKNOWN_COURSELIKES_CACHE_KEY, {})
+        return unknown_courselikes.setdefault(self._instance_id, set())
+
+    def _set_modulestore_for_courselike(self, locator, store):
+        """
+        Routes the given locator to the given store, or makes it be looked up again if store is None.
+        """
+        locator = self._clean_locator_for_mapping(locator)
+        if store is None:
+            self.mappings.pop(locator, None)
+        else:
+            self.mappings[locator] = store
+        unknown_courselikes = self._unknown_courselikes()
+        if unknown_courselikes is not None:
+            unknown_courselikes.discard(locator)
+
+    def _increment_routing_stat(self, stat):
+        """
+        Counts a routing outcome in the request's routing stats (see get_routing_stats).
+        """
+        if self.request_cache is not None:
+            self.request_cache.data.setdefault(ROUTING_STATS_CACHE_KEY, defaultdict(int))[stat] += 1
+
+    def get_routing_stats(self):
+        """
+        Returns a dict of the counts of how the courselike keys of this request have been routed to
+        the stores:
+
+            mapped: found in the routing table
+            probed: looked up in the stores
+            store_probes: the number of stores asked whether they have a courselike
+            unknown: already known not to be in any store during this request
+            default: no courselike key, so routed to the default store
+        """
+        if self.request_cache is None:
+            return {}
+        return dict(self.request_cache.data.get(ROUTING_STATS_CACHE_KEY, {}))
+
     def _get_modulestore_by_type(self, modulestore_type):
         """
         This method should only really be used by tests and migration scripts when necessary.
@@ -422,7 +498,9 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         """
         assert isinstance(course_key, CourseKey)
         store = self._get_modulestore_for_courselike(course_key)
-        return store.delete_course(course_key, user_id)
+        result = store.delete_course(course_key, user_id)
+        self._set_modulestore_for_courselike(course_key, None)
+        return result
 
     @contract(asset_metadata='AssetMetadata', user_id='int|long', import_only=bool)
     def save_asset_metadata(self, asset_metadata, user_id, import_only=False):
@@ -648,7 +726,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         course = store.create_course(org, course, run, user_id, **kwargs)
 
         # add new course to the mapping
-        self.mappings[course_key] = store
+        self._set_modulestore_for_courselike(course_key, store)
 
         return course
 
@@ -676,7 +754,7 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         library = store.create_library(org, library, user_id, fields, **kwargs)
 
         # add new library to the mapping
-        self.mappings[lib_key] = store
+        self._set_modulestore_for_courselike(lib_key, store)
 
         return library
 
@@ -697,12 +775,15 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         # to have only course re-runs go to split. This code, however, uses the config'd priority
         dest_modulestore = self._get_modulestore_for_courselike(dest_course_id)
         if source_modulestore == dest_modulestore:
-            return source_modulestore.clone_course(source_course_id, dest_course_id, user_id, fields, **kwargs)
+            result = source_modulestore.clone_course(source_course_id, dest_course_id, user_id, fields, **kwargs)
+            self._set_modulestore_for_courselike(dest_course_id, dest_modulestore)
+            return result
 
         if dest_modulestore.get_modulestore_type() == ModuleStoreEnum.Type.split:
             split_migrator = SplitMigrator(dest_modulestore, source_modulestore)
             split_migrator.migrate_mongo_course(source_course_id, user_id, dest_course_id.org,
                                                 dest_course_id.course, dest_course_id.run, fields, **kwargs)
+            self._set_modulestore_for_courselike(dest_course_id, dest_modulestore)
 
             # the super handles assets and any other necessities
             super(MixedModuleStore, self).clone_course(source_course_id, dest_course_id, user_id, fields, **kwargs)
@@ -47,6 +47,7 @@ from xmodule.modulestore.draft_and_published import ModuleStoreDraftAndPublished
 from xmodule.modulestore.edit_info import EditInfoRuntimeMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError, DuplicateCourseError, ReferentialIntegrityError
 from xmodule.modulestore.inheritance import InheritanceMixin, inherit_metadata, InheritanceKeyValueStore
+from xmodule.modulestore.query_profile import profile_query
 from xmodule.modulestore.xml import CourseLocationManager
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.services import SettingsService
@@ -467,13 +468,47 @@ def as_published(location):
     return location.replace(revision=MongoRevisionKey.published)
 
 
+def _document_key(item_id):
+    """
+    Returns a hashable key for the given item '_id' (SON or dict), regardless of the order of its fields.
+    """
+    return tuple(item_id.get(field) for field in ('tag', 'org', 'course', 'category', 'name', 'revision'))
+
+
 class MongoBulkOpsRecord(BulkOpsRecord):
     """
     Tracks whether there've been any writes per course and disables inheritance generation
+
+    Also caches the item documents (and the metadata inheritance tree) read during the bulk
+    operation, until the course is next written.
     """
     def __init__(self):
         super(MongoBulkOpsRecord, self).__init__()
-        self.dirty = False
+        self._dirty = False
+        # {document key (see _document_key): item document, or None if there's no such item}
+        self.documents = {}
+        self.metadata_inheritance_tree = None
+
+    @property
+    def dirty(self):
+        """
+        Whether the course has been written during the bulk operation.
+        """
+        return self._dirty
+
+    @dirty.setter
+    def dirty(self, value):
+        # every write marks the course as dirty, which makes the cached reads stale
+        if value:
+            self.clear_cache()
+        self._dirty = value
+
+    def clear_cache(self):
+        """
+        Forget the documents and inheritance tree read during the bulk operation.
+        """
+        self.documents.clear()
+        self.metadata_inheritance_tree = None
 
 
 class MongoBulkOpsMixin(BulkOperationsMixin):
@@ -488,6 +523,7 @@ class MongoBulkOpsMixin(BulkOperationsMixin):
         """
         # ensure it starts clean
         bulk_ops_record.dirty = False
+        bulk_ops_record.clear_cache()
 
     def _end_outermost_bulk_operation(self, bulk_ops_record, structure_key):
         """
@@ -495,6 +531,7 @@ class MongoBulkOpsMixin(BulkOperationsMixin):
         Refresh the meta-data inheritance cache now since it was temporarily disabled.
         """
         dirty = False
+        bulk_ops_record.clear_cache()
         if bulk_ops_record.dirty:
             self.refresh_cached_metadata_inheritance_tree(structure_key)
             dirty = True
@@ -574,6 +611,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             )
 
             self.collection = self.database[collection]
+            self.collection_name = collection
 
             # Collection which stores asset metadata.
             if asset_collection is None:
@@ -708,7 +746,9 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             record_filter['metadata.{0}'.format(field_name)] = 1
 
         # call out to the DB
-        resultset = self.collection.find(query, record_filter)
+        with profile_query('compute_metadata_inheritance_tree', self.collection_name) as profiled_query:
+            resultset = list(self.collection.find(query, record_filter))
+            profiled_query.measure(*resultset)
 
         # it's ok to keep these as deprecated strings b/c the overall cache is indexed by course_key and this
         # is a dictionary relative to that course
@@ -775,11 +815,16 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         tree = {}
 
         course_id = self.fill_in_run(course_id)
+        bulk_record = self._get_bulk_ops_record(course_id)
         if not force_refresh:
             # see if we are first in the request cache (if present)
             if self.request_cache is not None and unicode(course_id) in self.request_cache.data.get('metadata_inheritance', {}):
                 return self.request_cache.data['metadata_inheritance'][unicode(course_id)]
 
+            # then in the bulk operation, which computes it once per version of the course
+            if bulk_record.active and bulk_record.metadata_inheritance_tree is not None:
+                return bulk_record.metadata_inheritance_tree
+
             # then look in any caching subsystem (e.g. memcached)
             if self.metadata_inheritance_cache_subsystem is not None:
                 tree = self.metadata_inheritance_cache_subsystem.get(unicode(course_id), {})
@@ -806,6 +851,8 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             if 'metadata_inheritance' not in self.request_cache.data:
                 self.request_cache.data['metadata_inheritance'] = {}
             self.request_cache.data['metadata_inheritance'][unicode(course_id)] = tree
+        if bulk_record.active:
+            bulk_record.metadata_inheritance_tree = tree
 
         return tree
 
@@ -837,12 +884,49 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         Generate a pymongo in query for finding the items and return the payloads
         """
         # first get non-draft in a round-trip
-        query = {
-            '_id': {'$in': [
-                course_key.make_usage_key_from_deprecated_string(item).to_deprecated_son() for item in items
-            ]}
-        }
-        return list(self.collection.find(query))
+        return self._find_documents(
+            course_key,
+            [course_key.make_usage_key_from_deprecated_string(item).to_deprecated_son() for item in items],
+            'cache_children',
+        )
+
+    def _find_documents(self, course_key, item_ids, operation):
+        """
+        Returns the documents of the items with the given ids (deprecated SONs) which exist,
+        finding them all with a single $in query. Duplicate ids are only returned once.
+
+        Inside a bulk operation on the course, the documents found (and the ids which weren't)
+        are cached until the course is next written, so that items which are read repeatedly,
+        e.g. by get_item and then again as children, are only queried once.
+        """
+        bulk_record = self._get_bulk_ops_record(course_key)
+        cache = bulk_record.documents if bulk_record.active else {}
+
+        found = {}
+        to_find = []
+        for item_id in item_ids:
+            key = _document_key(item_id)
+            if key in found:
+                continue
+            if key in cache:
+                found[key] = copy.deepcopy(cache[key])
+            else:
+                found[key] = None
+                to_find.append(item_id)
+
+        if to_find:
+            with profile_query(operation, self.collection_name, keys=len(to_find)) as profiled_query:
+                documents = list(self.collection.find({'_id': {'$in': to_find}}))
+                profiled_query.measure(*documents)
+            for document in documents:
+                found[_document_key(document['_id'])] = document
+            if bulk_record.active:
+                # the callers modify the documents, so cache copies of them
+                for item_id in to_find:
+                    key = _document_key(item_id)
+                    cache[key] = copy.deepcopy(found[key])
+
+        return [document for document in found.itervalues() if document is not None]
 
     def _cache_children(self, course_key, items, depth=0):
         """
@@ -1067,12 +1151,10 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         ItemNotFoundError.
         '''
         assert isinstance(location, UsageKey)
-        item = self.collection.find_one(
-            {'_id': location.to_deprecated_son()}
-        )
-        if item is None:
+        items = self._find_documents(location.course_key, [location.to_deprecated_son()], 'find_one')
+        if not items:
             raise ItemNotFoundError(location)
-        return item
+        return items[0]
 
     def make_course_key(self, org, course, run):
         """
@@ -1134,7 +1216,8 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                     course_query[key] = re.compile(r"(?i)^{}$".format(course_query[key]))
         else:
             course_query = {'_id': location.to_deprecated_son()}
-        course = self.collection.find_one(course_query, projection={'_id': True})
+        with profile_query('has_course', self.collection_name, keys=1):
+            course = self.collection.find_one(course_query, projection={'_id': True})
         if course:
             return SlashSeparatedCourseKey(course['_id']['org'], course['_id']['course'], course['_id']['name'])
         else:
@@ -1260,14 +1343,16 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             query['definition.children'] = qualifiers.pop('children')
 
         query.update(qualifiers)
-        items = self.collection.find(
-            query,
-            sort=[SORT_REVISION_FAVOR_DRAFT],
-        )
+        with profile_query('get_items', self.collection_name) as profiled_query:
+            items = list(self.collection.find(
+                query,
+                sort=[SORT_REVISION_FAVOR_DRAFT],
+            ))
+            profiled_query.measure(*items)
 
         modules = self._load_items(
             course_id,
-            list(items),
+            items,
             using_descriptor_system=using_descriptor_system
         )
         return modules
@@ -1641,9 +1726,10 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             return parent_loc
 
         # query the collection, sorting by DRAFT first
-        parents = list(
-            self.collection.find(query, {'_id': True}, sort=[SORT_REVISION_FAVOR_DRAFT])
-        )
+        with profile_query('get_parent_location', self.collection_name):
+            parents = list(
+                self.collection.find(query, {'_id': True}, sort=[SORT_REVISION_FAVOR_DRAFT])
+            )
         if len(parents) == 0:
             # no parents were found
             return cache_and_return(None)
@@ -164,6 +164,7 @@ class DraftModuleStore(MongoModuleStore):
 
         # delete all of the db records for the course
         course_query = self._course_key_to_son(course_key)
+        self._get_bulk_ops_record(course_key).clear_cache()
         self.collection.remove(course_query, multi=True)
         self.delete_all_asset_metadata(course_key, user_id)
 
@@ -810,35 +811,37 @@ class DraftModuleStore(MongoModuleStore):
         delete_draft_only(location)
 
     def _query_children_for_cache_children(self, course_key, items):
-        # first get non-draft in a round-trip
-        to_process_non_drafts = super(DraftModuleStore, self)._query_children_for_cache_children(course_key, items)
+        item_ids = []
+        for item in items:
+            item_usage_key = course_key.make_usage_key_from_deprecated_string(item)
+            item_ids.append(item_usage_key.to_deprecated_son())
+            # find the drafts in the same round-trip as the non-drafts
+            if (
+                    self.get_branch_setting() == ModuleStoreEnum.Branch.draft_preferred and
+                    item_usage_key.category not in DIRECT_ONLY_CATEGORIES
+            ):
+                item_ids.append(as_draft(item_usage_key).to_deprecated_son())
+        documents = self._find_documents(course_key, item_ids, 'cache_children')
 
         to_process_dict = {}
-        for non_draft in to_process_non_drafts:
-            to_process_dict[Location._from_deprecated_son(non_draft["_id"], course_key.run)] = non_draft
-
-        if self.get_branch_setting() == ModuleStoreEnum.Branch.draft_preferred:
-            # now query all draft content in another round-trip
-            query = []
-            for item in items:
-                item_usage_key = course_key.make_usage_key_from_deprecated_string(item)
-                if item_usage_key.category not in DIRECT_ONLY_CATEGORIES:
-                    query.append(as_draft(item_usage_key).to_deprecated_son())
-            if query:
-                query = {'_id': {'$in': query}}
-                to_process_drafts = list(self.collection.find(query))
-
-                # now we have to go through all drafts and replace the non-draft
-                # with the draft. This is because the semantics of the DraftStore is to
-                # always return the draft - if available
-                for draft in to_process_drafts:
-                    draft_loc = Location._from_deprecated_son(draft["_id"], course_key.run)
-                    draft_as_non_draft_loc = as_published(draft_loc)
-
-                    # does non-draft exist in the collection
-                    # if so, replace it
-                    if draft_as_non_draft_loc in to_process_dict:
-                        to_process_dict[draft_as_non_draft_loc] = draft
+        drafts = []
+        for document in documents:
+            if document['_id'].get('revision') == MongoRevisionKey.draft:
+                drafts.append(document)
+            else:
+                to_process_dict[Location._from_deprecated_son(document["_id"], course_key.run)] = document
+
+        # now we have to go through all drafts and replace the non-draft
+        # with the draft. This is because the semantics of the DraftStore is to
+        # always return the draft - if available
+        for draft in drafts:
+            draft_loc = Location._from_deprecated_son(draft["_id"], course_key.run)
+            draft_as_non_draft_loc = as_published(draft_loc)
+
+            # does non-draft exist in the collection
+            # if so, replace it
+            if draft_as_non_draft_loc in to_process_dict:
+                to_process_dict[draft_as_non_draft_loc] = draft
 
         # convert the dict - which is used for look ups - back into a list
         queried_children = to_process_dict.values()
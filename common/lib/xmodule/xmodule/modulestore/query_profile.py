@@ -0,0 +1,207 @@
+"""
+Profiling of the Mongo operations made by the modulestores.
+
+While a :class:`QueryProfile` is active in a thread (see :func:`profile_queries`),
+every Mongo operation that the split and old mongo modulestores make in that
+thread is recorded in it, with the collection it was made on, the number of keys
+it was made for, the size of the documents it returned and how long it took.
+"""
+import logging
+import threading
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+from time import time
+
+from bson import BSON
+
+
+log = logging.getLogger(__name__)
+
+
+# A single Mongo operation.
+#  operation: The name of the modulestore operation which made it.
+#  collection: The name of the collection it was made on.
+#  keys: The number of ids it was made for, or None if it wasn't a lookup by id.
+#  size: The size, in bytes, of the documents it read or wrote, or None if it isn't measured.
+#  duration: How long it took, in seconds.
+QueryRecord = namedtuple('QueryRecord', ['operation', 'collection', 'keys', 'size', 'duration'])
+
+
+class QueryProfile(object):
+    """
+    The Mongo operations made while the profile was active.
+    """
+    def __init__(self):
+        self.records = []
+
+    def __len__(self):
+        return len(self.records)
+
+    def record(self, operation, collection, keys=None, size=None, duration=0.0):
+        """
+        Record a Mongo operation (see :class:`QueryRecord`).
+        """
+        self.records.append(QueryRecord(operation, collection, keys, size, duration))
+
+    def counts_by_collection(self):
+        """
+        Returns a dict of the number of operations made on each collection.
+        """
+        counts = defaultdict(int)
+        for record in self.records:
+            counts[record.collection] += 1
+        return dict(counts)
+
+    @property
+    def duration(self):
+        """
+        The total time taken by the operations, in seconds.
+        """
+        return sum(record.duration for record in self.records)
+
+    def summary(self):
+        """
+        Returns a one line summary of the operations, e.g.
+        "3 ops 4.2ms active_versions=1 structures=2".
+        """
+        return u'{} ops {:.1f}ms {}'.format(
+            len(self.records),
+            self.duration * 1000,
+            u' '.join(
+                u'{}={}'.format(collection, count)
+                for collection, count in sorted(self.counts_by_collection().iteritems())
+            ),
+        ).strip()
+
+    def exceeded_budget(self, budget):
+        """
+        Returns a list of (collection, count, limit) for each limit of the budget which the
+        operations exceed. The collection is None for the limit on the total number of operations.
+
+        Arguments:
+            budget (int or dict): The maximum number of operations, or a dict of the maximum
+                number of operations on each collection, in which the key None limits the total.
+        """
+        if not isinstance(budget, dict):
+            budget = {None: budget}
+        counts = self.counts_by_collection()
+        counts[None] = len(self.records)
+        return [
+            (collection, counts.get(collection, 0), limit)
+            for collection, limit in sorted(budget.iteritems())
+            if counts.get(collection, 0) > limit
+        ]
+
+    def check_budget(self, budget, name):
+        """
+        Logs a warning, for the named request or block of code, if the operations exceed the
+        budget (see :meth:`exceeded_budget`). Returns whether they did.
+        """
+        exceeded = self.exceeded_budget(budget)
+        for collection, count, limit in exceeded:
+            log.warning(
+                u'%s made %d mongo operations on %s, over its budget of %d: %s',
+                name, count, collection or u'all collections', limit, self.summary(),
+            )
+        return bool(exceeded)
+
+
+class _ActiveProfiles(threading.local):
+    """
+    The profiles which are active in each thread.
+    """
+    def __init__(self):
+        super(_ActiveProfiles, self).__init__()
+        self.profiles = []
+
+
+_ACTIVE_PROFILES = _ActiveProfiles()
+
+
+def start_profile(profile):
+    """
+    Start recording the Mongo operations of the current thread in the profile.
+    """
+    _ACTIVE_PROFILES.profiles.append(profile)
+
+
+def stop_profile(profile):
+    """
+    Stop recording the Mongo operations of the current thread in the profile.
+    """
+    if profile in _ACTIVE_PROFILES.profiles:
+        _ACTIVE_PROFILES.profiles.remove(profile)
+
+
+@contextmanager
+def profile_queries(profile=None):
+    """
+    Context manager which records the Mongo operations of the current thread in the
+    given (or a new) QueryProfile, and yields it. Profiles may be nested.
+    """
+    if profile is None:
+        profile = QueryProfile()
+    start_profile(profile)
+    try:
+        yield profile
+    finally:
+        stop_profile(profile)
+
+
+def is_profiling():
+    """
+    Returns whether the Mongo operations of the current thread are being recorded.
+    """
+    return bool(_ACTIVE_PROFILES.profiles)
+
+
+def record_query(operation, collection, keys=None, size=None, duration=0.0):
+    """
+    Record a Mongo operation in the active profiles of the current thread, if there are any.
+    """
+    for profile in _ACTIVE_PROFILES.profiles:
+        profile.record(operation, collection, keys, size, duration)
+
+
+def document_size(*documents):
+    """
+    Returns the total BSON size of the given documents, in bytes.
+
+    This encodes the documents, so it should only be used while profiling.
+    """
+    return sum(len(BSON.encode(document)) for document in documents if document is not None)
+
+
+class _Query(object):
+    """
+    A Mongo operation being timed by :func:`profile_query`.
+    """
+    def __init__(self, keys):
+        self.keys = keys
+        self.size = None
+
+    def measure(self, *documents):
+        """
+        Set the size of the operation to the size of the given documents, if profiling.
+        """
+        if is_profiling():
+            self.size = document_size(*documents)
+
+
+@contextmanager
+def profile_query(operation, collection, keys=None):
+    """
+    Context manager which records the enclosed Mongo operation in the active profiles of the
+    current thread. It yields an object whose ``keys`` and ``size`` may be set by the block,
+    and whose ``measure(*documents)`` sets the size of the documents.
+    """
+    query = _Query(keys)
+    if not is_profiling():
+        yield query
+        return
+
+    start = time()
+    try:
+        yield query
+    finally:
+        record_query(operation, collection, query.keys, query.size, time() - start)
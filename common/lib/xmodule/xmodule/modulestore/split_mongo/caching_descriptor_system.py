@@ -1,5 +1,7 @@
 import sys
 import logging
+from collections import defaultdict
+from functools import partial
 
 from contracts import contract, new_contract
 from fs.osfs import OSFS
@@ -25,6 +27,12 @@ from xmodule.x_module import XModuleMixin
 
 log = logging.getLogger(__name__)
 
+# Maximum number of definitions fetched together by a lazily loading runtime
+DEFINITION_PREFETCH_CHUNK_SIZE = 100
+
+# Memoized in place of the value of a field which isn't set on any ancestor of a block
+_NOT_INHERITED = object()
+
 new_contract('BlockUsageLocator', BlockUsageLocator)
 new_contract('CourseLocator', CourseLocator)
 new_contract('LibraryLocator', LibraryLocator)
@@ -83,6 +91,12 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         self.default_class = default_class
         self.local_modules = {}
         self._services['library_tools'] = LibraryToolsService(modulestore)
+        # definitions fetched in batches, by definition id
+        self._prefetched_definitions = {}
+        # the ids of the definitions to fetch together with each pending definition, by definition id
+        self._definition_prefetch_groups = {}
+        # the json value each block inherits for each inheritable field, by (BlockKey, field name)
+        self._inherited_values = {}
 
     @lazy
     @contract(returns="dict(BlockKey: BlockKey)")
@@ -151,14 +165,104 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         """
         json_data = self.module_data.get(block_key)
         if json_data is None:
-            # deeper than initial descendant fetch or doesn't exist
-            self.modulestore.cache_items(self, [block_key], course_key, lazy=self.lazy)
+            # deeper than initial descendant fetch or doesn't exist. When loading lazily, cache its
+            # siblings along with it, so that their definitions are fetched together.
+            block_keys = [block_key]
+            if self.lazy:
+                block_keys.extend(self._get_sibling_keys(block_key))
+            self.modulestore.cache_items(self, block_keys, course_key, lazy=self.lazy)
             json_data = self.module_data.get(block_key)
             if json_data is None:
                 raise ItemNotFoundError(block_key)
 
         return json_data
 
+    def _get_sibling_keys(self, block_key):
+        """
+        Return the keys of the siblings of the given block which aren't in module_data yet.
+        """
+        parent = self.course_entry.structure['blocks'].get(self._parent_map.get(block_key))
+        if parent is None:
+            return []
+        return [
+            child for child in parent.fields.get('children', [])
+            if child != block_key and child not in self.module_data
+        ]
+
+    def plan_definition_prefetch(self, block_datas):
+        """
+        Plan to fetch the definitions of the given blocks (dict of BlockKey to BlockData, typically a
+        subtree which was just cached) as soon as the definition of any one of them is needed. Each
+        block's definition is fetched together with those of its siblings, in groups of at most
+        DEFINITION_PREFETCH_CHUNK_SIZE, so that rendering a container fetches its children's
+        definitions in one query, without fetching the definitions of the rest of the subtree.
+        """
+        groups = defaultdict(list)
+        for block_key, block_data in block_datas.iteritems():
+            if block_data.definition is not None and not block_data.definition_loaded:
+                if block_data.definition not in self._prefetched_definitions:
+                    groups[self._parent_map.get(block_key)].append(block_data.definition)
+
+        for definition_ids in groups.itervalues():
+            for index in xrange(0, len(definition_ids), DEFINITION_PREFETCH_CHUNK_SIZE):
+                group = set(definition_ids[index:index + DEFINITION_PREFETCH_CHUNK_SIZE])
+                for definition_id in group:
+                    self._definition_prefetch_groups.setdefault(definition_id, group)
+
+    def get_definition(self, course_key, definition_id):
+        """
+        Return the definition with the given id, fetching it along with the other definitions planned
+        to be fetched with it (see plan_definition_prefetch). Prefetched definitions are only kept
+        until they're read.
+        """
+        if definition_id not in self._prefetched_definitions and definition_id in self._definition_prefetch_groups:
+            group = self._definition_prefetch_groups[definition_id]
+            for definition in self.modulestore.get_definitions(course_key, group):
+                self._prefetched_definitions[definition['_id']] = definition
+            for grouped_id in group:
+                self._definition_prefetch_groups.pop(grouped_id, None)
+
+        definition = self._prefetched_definitions.pop(definition_id, None)
+        if definition is None:
+            definition = self.modulestore.get_definition(course_key, definition_id)
+        return definition
+
+    def get_inherited_value(self, block_key, field_name):
+        """
+        Return the json value of the field on the nearest ancestor of the block which sets it, as
+        stored in the structure, without loading the ancestors. Raises KeyError if no ancestor sets it,
+        or if the block's default value is to be used instead (as for the children of library_content
+        blocks, which get their defaults copied from the library).
+
+        The values are memoized for the structure, so this may only be used for persisted structures.
+        """
+        blocks = self.course_entry.structure['blocks']
+        parent_key = self._parent_map.get(block_key)
+        if parent_key is not None and parent_key.type == 'library_content' and field_name in blocks[block_key].defaults:
+            raise KeyError(field_name)
+
+        # walk up to the nearest ancestor which sets the field (or whose inherited value is known)
+        unresolved = []
+        value = _NOT_INHERITED
+        while parent_key is not None:
+            memo_key = (block_key, field_name)
+            if memo_key in self._inherited_values:
+                value = self._inherited_values[memo_key]
+                break
+            unresolved.append(memo_key)
+            parent_fields = blocks[parent_key].fields
+            if field_name in parent_fields:
+                value = parent_fields[field_name]
+                break
+            block_key, parent_key = parent_key, self._parent_map.get(parent_key)
+
+        for memo_key in unresolved:
+            self._inherited_values[memo_key] = value
+
+        if value is _NOT_INHERITED:
+            raise KeyError(field_name)
+        return value
+
     # xblock's runtime does not always pass enough contextual information to figure out
     # which named container (course x branch) or which parent is requesting an item. Because split allows
     # a many:1 mapping from named containers to structures and because item's identities encode
@@ -193,7 +297,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         if definition_id is not None and not block_data.definition_loaded:
             definition_loader = DefinitionLazyLoader(
-                self.modulestore,
+                self,
                 course_key,
                 block_key.type,
                 definition_id,
@@ -232,6 +336,16 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         except AttributeError:
             pass
 
+        # Inherited values are resolved from the structure, rather than by loading the block's
+        # ancestors, as long as the structure can't change.
+        if (  # pylint: disable=bad-continuation
+            block_key in self.course_entry.structure['blocks'] and
+            self.modulestore.is_persisted_structure(course_key, self.course_entry.structure)
+        ):
+            inherited_value_resolver = partial(self.get_inherited_value, block_key)
+        else:
+            inherited_value_resolver = None
+
         try:
             kvs = SplitMongoKVS(
                 definition_loader,
@@ -239,7 +353,8 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
                 converted_defaults,
                 parent=parent,
                 aside_fields=aside_fields,
-                field_decorator=kwargs.get('field_decorator')
+                field_decorator=kwargs.get('field_decorator'),
+                inherited_value_resolver=inherited_value_resolver,
             )
 
             if InheritanceMixin in self.modulestore.xblock_mixins:
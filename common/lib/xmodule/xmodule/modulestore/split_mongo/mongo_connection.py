@@ -4,18 +4,26 @@ Segregation of pymongo functions from the data modeling mechanisms for split mod
 import datetime
 import cPickle as pickle
 import math
+import mmap
+import os
+import tempfile
 import zlib
 import pymongo
 import pytz
 import re
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
 from time import time
 
 # Import this just to export it
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
+from pymongo.errors import BulkWriteError
 
 try:
+    from django.conf import settings
     from django.core.cache import caches, InvalidCacheBackendError
+    from django.core.exceptions import ImproperlyConfigured
     DJANGO_AVAILABLE = True
 except ImportError:
     DJANGO_AVAILABLE = False
@@ -27,6 +35,7 @@ from contracts import check, new_contract
 from mongodb_proxy import autoretry_read
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore import BlockData
+from xmodule.modulestore.query_profile import document_size, is_profiling, record_query
 from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.mongo_utils import connect_to_mongodb, create_collection_index
 
@@ -44,6 +53,51 @@ def get_cache(alias):
     return caches[alias]
 
 
+def get_structure_lru_cache_size():
+    """
+    Return the maximum size, in bytes, of the process-local structure cache
+    (as configured by ``settings.COURSE_STRUCTURE_LRU_CACHE_SIZE``).
+
+    Returns 0 (disabled) if django isn't available or configured.
+    """
+    if not DJANGO_AVAILABLE:
+        return 0
+    try:
+        return getattr(settings, 'COURSE_STRUCTURE_LRU_CACHE_SIZE', 0) or 0
+    except ImproperlyConfigured:
+        return 0
+
+
+def get_structure_mmap_store_dir():
+    """
+    Return the directory of the host-wide store of memory-mapped structures
+    (as configured by ``settings.COURSE_STRUCTURE_MMAP_STORE_DIR``).
+
+    Returns None (disabled) if django isn't available or configured.
+    """
+    if not DJANGO_AVAILABLE:
+        return None
+    try:
+        return getattr(settings, 'COURSE_STRUCTURE_MMAP_STORE_DIR', None)
+    except ImproperlyConfigured:
+        return None
+
+
+def get_structure_mmap_store_max_size():
+    """
+    Return the maximum total size, in bytes, of the files of the host-wide store of
+    memory-mapped structures (as configured by ``settings.COURSE_STRUCTURE_MMAP_STORE_MAX_SIZE``).
+
+    Returns 0 (unbounded) if django isn't available or configured.
+    """
+    if not DJANGO_AVAILABLE:
+        return 0
+    try:
+        return getattr(settings, 'COURSE_STRUCTURE_MMAP_STORE_MAX_SIZE', 0) or 0
+    except ImproperlyConfigured:
+        return 0
+
+
 def round_power_2(value):
     """
     Return value rounded up to the nearest power of 2.
@@ -63,6 +117,9 @@ class Tagger(object):
         self.added_tags = []
         self.measures = []
         self.sample_rate = default_sample_rate
+        # The number of ids and size of the documents of the timed Mongo operation, for query profiles.
+        self.keys = None
+        self.size = None
 
     def measure(self, name, size):
         """
@@ -75,6 +132,14 @@ class Tagger(object):
         """
         self.measures.append((name, size))
 
+    def measure_documents(self, *documents):
+        """
+        Record the size of the documents read or written by the timed Mongo operation, if
+        its query is being profiled (see :mod:`xmodule.modulestore.query_profile`).
+        """
+        if is_profiling():
+            self.size = document_size(*documents)
+
     def tag(self, **kwargs):
         """
         Add tags to the timer.
@@ -115,7 +180,7 @@ class QueryTimer(object):
         self._sample_rate = sample_rate
 
     @contextmanager
-    def timer(self, metric_name, course_context):
+    def timer(self, metric_name, course_context, collection=None):
         """
         Contextmanager which acts as a timer for the metric ``metric_name``,
         but which also yields a :class:`Tagger` object that allows the timed block
@@ -123,11 +188,16 @@ class QueryTimer(object):
         timer output. Measurements are recorded as histogram measurements in their own,
         and also as bucketed tags on the timer measurement.
 
+        If the timed code is a Mongo operation on ``collection``, it is also recorded in any
+        active query profiles (see :mod:`xmodule.modulestore.query_profile`).
+
         Arguments:
             metric_name: The name used to aggregate all of these metrics.
             course_context: The course which the query is being made for.
+            collection: The name of the collection the timed Mongo operation is made on, if any.
         """
         tagger = Tagger(self._sample_rate)
+        operation = metric_name
         metric_name = "{}.{}".format(self._metric_base, metric_name)
 
         start = time()
@@ -135,6 +205,8 @@ class QueryTimer(object):
             yield tagger
         finally:
             end = time()
+            if collection is not None:
+                record_query(operation, collection, tagger.keys, tagger.size, end - start)
             tags = tagger.tags
             tags.append('course:{}'.format(course_context))
             for name, size in tagger.measures:
@@ -225,16 +297,237 @@ def structure_to_mongo(structure, course_context=None):
         return new_structure
 
 
+class StructureLRUCache(object):
+    """
+    A bounded, process-local cache of pickled course structures, keyed by
+    structure id. Entries are evicted least-recently-used first once the
+    total size of the cached structures exceeds ``max_size`` bytes.
+
+    Course structures are immutable once written, so entries never need
+    to be invalidated. Each get unpickles a new copy of the structure, since
+    callers modify the structures they're given (e.g. ``cache_items`` loads
+    definitions into their blocks), and so mustn't share them with other
+    requests and threads.
+    """
+    def __init__(self, max_size):
+        """
+        Arguments:
+            max_size (int): The maximum total size, in bytes, of all cached
+                pickled structures.
+        """
+        self.max_size = max_size
+        self.current_size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """
+        Return a new copy of the structure cached for ``key`` (marking it as
+        most recently used), or None if it isn't cached.
+        """
+        with self._lock:
+            pickled_data = self._entries.pop(key, None)
+            if pickled_data is None:
+                return None
+            self._entries[key] = pickled_data
+        return pickle.loads(pickled_data)
+
+    def set(self, key, pickled_data):
+        """
+        Cache the pickled structure under ``key``, evicting the least recently
+        used structures until the cache fits in ``max_size`` again. Structures
+        that are larger than the whole cache aren't cached at all.
+
+        Arguments:
+            key: The structure id.
+            pickled_data (str): The pickled structure.
+        """
+        if len(pickled_data) > self.max_size:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_size -= len(previous)
+
+            self._entries[key] = pickled_data
+            self.current_size += len(pickled_data)
+
+            while self.current_size > self.max_size:
+                __, evicted = self._entries.popitem(last=False)
+                self.current_size -= len(evicted)
+
+    def clear(self):
+        """
+        Remove all structures from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_size = 0
+
+
+class MmapStructureStore(object):
+    """
+    A store of pickled course structures in files under a local directory,
+    keyed by structure id, which are read through memory maps. All of the
+    processes on a host which use the same directory share a single copy of
+    each structure's data through the page cache, rather than each fetching
+    and decompressing it from the django cache.
+
+    Course structures are immutable once written, so files are written once
+    (atomically, by renaming them into place) and never updated. Once the
+    files exceed ``max_size`` bytes, the least recently used are deleted
+    (their modification times are refreshed when they're read, at most once
+    per ``TOUCH_INTERVAL``). Processes which have already mapped a deleted
+    file keep reading it, and a deleted structure is simply stored again the
+    next time it's read from the django cache.
+    """
+    # Minimum number of seconds between refreshes of the modification time of a file when it's read.
+    TOUCH_INTERVAL = 60 * 60
+
+    # Number of seconds after which temporary files, left behind by processes which died
+    # while writing them, are deleted.
+    TEMP_FILE_MAX_AGE = 60 * 60
+
+    def __init__(self, directory, max_size=0):
+        """
+        Arguments:
+            directory (str): The directory of the structure files, which is
+                created if it doesn't exist.
+            max_size (int): The maximum total size, in bytes, of the structure
+                files, or 0 for no maximum.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                # Another process may have created it in the meantime
+                if not os.path.isdir(directory):
+                    raise
+
+    def _path(self, key):
+        """
+        Return the path of the file of the structure with the given id.
+        """
+        return os.path.join(self.directory, '{}.pickle'.format(key))
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def get(self, key):
+        """
+        Return the structure stored for ``key`` and its size in bytes, or
+        (None, 0) if it isn't stored, or if its file can't be read.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as structure_file:
+                mapped_file = mmap.mmap(structure_file.fileno(), 0, access=mmap.ACCESS_READ)
+                if time() - os.fstat(structure_file.fileno()).st_mtime > self.TOUCH_INTERVAL:
+                    os.utime(path, None)
+        except (IOError, OSError, ValueError):
+            return None, 0
+
+        try:
+            return pickle.load(mapped_file), mapped_file.size()
+        except Exception:  # pylint: disable=broad-except
+            # A truncated or otherwise corrupt file can fail to unpickle in many ways.
+            # It's deleted, so that the structure is stored again.
+            log.warning("Failed to read structure %s from %s", key, self.directory, exc_info=True)
+            self._delete(path)
+            return None, 0
+        finally:
+            mapped_file.close()
+
+    def set(self, key, pickled_data):
+        """
+        Store the pickled structure for ``key``, unless it's already stored,
+        and delete the least recently used structures if the store is too big.
+        """
+        if key in self:
+            return
+
+        temp_path = None
+        try:
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(file_descriptor, 'wb') as temp_file:
+                temp_file.write(pickled_data)
+            os.rename(temp_path, self._path(key))
+            temp_path = None
+        except (IOError, OSError):
+            log.warning("Failed to write structure %s to %s", key, self.directory, exc_info=True)
+        finally:
+            if temp_path is not None:
+                self._delete(temp_path)
+
+        if self.max_size:
+            self.prune()
+
+    def prune(self):
+        """
+        Delete the least recently used structure files until their total size
+        is at most ``max_size``, and any stale temporary files.
+        """
+        now = time()
+        files = []
+        for filename in os.listdir(self.directory):
+            path = os.path.join(self.directory, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Deleted by another process in the meantime
+                continue
+            if filename.endswith('.pickle'):
+                files.append((stat.st_mtime, stat.st_size, path))
+            elif filename.endswith('.tmp') and now - stat.st_mtime > self.TEMP_FILE_MAX_AGE:
+                self._delete(path)
+
+        total_size = sum(size for __, size, __ in files)
+        for __, size, path in sorted(files):
+            if total_size <= self.max_size:
+                break
+            self._delete(path)
+            total_size -= size
+
+    def _delete(self, path):
+        """
+        Delete the file at ``path``, if it still exists.
+        """
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
 class CourseStructureCache(object):
     """
     Wrapper around django cache object to cache course structure objects.
     The course structures are pickled and compressed when cached.
 
-    If the 'course_structure_cache' doesn't exist, then don't do anything for
-    for set and get.
+    If a :class:`StructureLRUCache` is supplied, it is consulted before the
+    django cache, and is populated with every structure read from or written
+    to the django cache.
+
+    If a :class:`MmapStructureStore` is supplied, it is consulted after the
+    :class:`StructureLRUCache` but before the django cache, and is populated
+    in the same way.
+
+    If the 'course_structure_cache' doesn't exist (and there is neither a
+    :class:`StructureLRUCache` nor a :class:`MmapStructureStore`), then
+    don't do anything for for set and get.
     """
-    def __init__(self):
+    def __init__(self, lru_cache=None, mmap_store=None):
         self.cache = None
+        self.lru_cache = lru_cache
+        self.mmap_store = mmap_store
         if DJANGO_AVAILABLE:
             try:
                 self.cache = get_cache('course_structure_cache')
@@ -243,10 +536,29 @@ class CourseStructureCache(object):
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
-        if self.cache is None:
+        if self.cache is None and self.lru_cache is None and self.mmap_store is None:
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
+            if self.lru_cache is not None:
+                structure = self.lru_cache.get(key)
+                tagger.tag(from_lru=str(structure is not None).lower())
+                tagger.measure('lru_size', self.lru_cache.current_size)
+                if structure is not None:
+                    return structure
+
+            if self.mmap_store is not None:
+                structure, size = self.mmap_store.get(key)
+                tagger.tag(from_mmap=str(structure is not None).lower())
+                if structure is not None:
+                    # The mapped file is already shared by the processes on the host, so it
+                    # isn't copied into the process-local cache.
+                    tagger.measure('uncompressed_size', size)
+                    return structure
+
+            if self.cache is None:
+                return None
+
             compressed_pickled_data = self.cache.get(key)
             tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
 
@@ -260,17 +572,31 @@ class CourseStructureCache(object):
             pickled_data = zlib.decompress(compressed_pickled_data)
             tagger.measure('uncompressed_size', len(pickled_data))
 
-            return pickle.loads(pickled_data)
+            structure = pickle.loads(pickled_data)
+            if self.lru_cache is not None:
+                self.lru_cache.set(key, pickled_data)
+            if self.mmap_store is not None:
+                self.mmap_store.set(key, pickled_data)
+            return structure
 
     def set(self, key, structure, course_context=None):
         """Given a structure, will pickle, compress, and write to cache."""
-        if self.cache is None:
+        if self.cache is None and self.lru_cache is None and self.mmap_store is None:
             return None
 
         with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
             pickled_data = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
             tagger.measure('uncompressed_size', len(pickled_data))
 
+            if self.lru_cache is not None:
+                self.lru_cache.set(key, pickled_data)
+
+            if self.mmap_store is not None:
+                self.mmap_store.set(key, pickled_data)
+
+            if self.cache is None:
+                return
+
             # 1 = Fastest (slightly larger results)
             compressed_pickled_data = zlib.compress(pickled_data, 1)
             tagger.measure('compressed_size', len(compressed_pickled_data))
@@ -279,6 +605,28 @@ class CourseStructureCache(object):
             self.cache.set(key, compressed_pickled_data, None)
 
 
+# The error code of Mongo write errors due to duplicate keys
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+
+def _insert_many_skipping_duplicates(collection, documents):
+    """
+    Insert the documents into the collection with a single unordered bulk write, ignoring the
+    documents which are already in the collection. Raises BulkWriteError for any other error.
+    """
+    try:
+        collection.insert_many(documents, ordered=False)
+    except BulkWriteError as error:
+        write_errors = error.details.get('writeErrors', [])
+        if error.details.get('writeConcernErrors') or any(
+                write_error['code'] != DUPLICATE_KEY_ERROR_CODE for write_error in write_errors
+        ):
+            raise
+        log.debug(
+            "Skipped inserting %d duplicate documents into %s", len(write_errors), collection.name
+        )
+
+
 class MongoConnection(object):
     """
     Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
@@ -304,6 +652,14 @@ class MongoConnection(object):
         self.structures = self.database[collection + '.structures']
         self.definitions = self.database[collection + '.definitions']
 
+        structure_lru_cache_size = get_structure_lru_cache_size()
+        self.structure_lru_cache = StructureLRUCache(structure_lru_cache_size) if structure_lru_cache_size else None
+
+        structure_mmap_store_dir = get_structure_mmap_store_dir()
+        self.structure_mmap_store = MmapStructureStore(
+            structure_mmap_store_dir, get_structure_mmap_store_max_size()
+        ) if structure_mmap_store_dir else None
+
     def heartbeat(self):
         """
         Check that the db is reachable.
@@ -320,7 +676,7 @@ class MongoConnection(object):
         This method will use a cached version of the structure if it is available.
         """
         with TIMER.timer("get_structure", course_context) as tagger_get_structure:
-            cache = CourseStructureCache()
+            cache = CourseStructureCache(lru_cache=self.structure_lru_cache, mmap_store=self.structure_mmap_store)
 
             structure = cache.get(key, course_context)
             tagger_get_structure.tag(from_cache=str(bool(structure)).lower())
@@ -328,7 +684,8 @@ class MongoConnection(object):
                 # Always log cache misses, because they are unexpected
                 tagger_get_structure.sample_rate = 1
 
-                with TIMER.timer("get_structure.find_one", course_context) as tagger_find_one:
+                with TIMER.timer("get_structure.find_one", course_context, 'structures') as tagger_find_one:
+                    tagger_find_one.keys = 1
                     doc = self.structures.find_one({'_id': key})
                     if doc is None:
                         log.warning(
@@ -337,6 +694,7 @@ class MongoConnection(object):
                         )
                         return None
                     tagger_find_one.measure("blocks", len(doc['blocks']))
+                    tagger_find_one.measure_documents(doc)
                     structure = structure_from_mongo(doc, course_context)
                     tagger_find_one.sample_rate = 1
 
@@ -352,12 +710,12 @@ class MongoConnection(object):
         Arguments:
             ids (list): A list of structure ids
         """
-        with TIMER.timer("find_structures_by_id", course_context) as tagger:
+        with TIMER.timer("find_structures_by_id", course_context, 'structures') as tagger:
             tagger.measure("requested_ids", len(ids))
-            docs = [
-                structure_from_mongo(structure, course_context)
-                for structure in self.structures.find({'_id': {'$in': ids}})
-            ]
+            tagger.keys = len(ids)
+            raw_docs = list(self.structures.find({'_id': {'$in': ids}}))
+            tagger.measure_documents(*raw_docs)
+            docs = [structure_from_mongo(structure, course_context) for structure in raw_docs]
             tagger.measure("structures", len(docs))
             return docs
 
@@ -369,8 +727,9 @@ class MongoConnection(object):
         Arguments:
             ids (list): A list of structure ids
         """
-        with TIMER.timer("find_course_blocks_by_id", course_context) as tagger:
+        with TIMER.timer("find_course_blocks_by_id", course_context, 'structures') as tagger:
             tagger.measure("requested_ids", len(ids))
+            tagger.keys = len(ids)
             docs = [
                 structure_from_mongo(structure, course_context)
                 for structure in self.structures.find(
@@ -389,7 +748,7 @@ class MongoConnection(object):
         Arguments:
             ids (list): A list of structure ids
         """
-        with TIMER.timer("find_structures_derived_from", course_context) as tagger:
+        with TIMER.timer("find_structures_derived_from", course_context, 'structures') as tagger:
             tagger.measure("base_ids", len(ids))
             docs = [
                 structure_from_mongo(structure, course_context)
@@ -407,7 +766,7 @@ class MongoConnection(object):
             original_version (str or ObjectID): The id of a structure
             block_key (BlockKey): The id of the block in question
         """
-        with TIMER.timer("find_ancestor_structures", course_context) as tagger:
+        with TIMER.timer("find_ancestor_structures", course_context, 'structures') as tagger:
             docs = [
                 structure_from_mongo(structure, course_context)
                 for structure in self.structures.find({
@@ -430,15 +789,31 @@ class MongoConnection(object):
         """
         Insert a new structure into the database.
         """
-        with TIMER.timer("insert_structure", course_context) as tagger:
+        with TIMER.timer("insert_structure", course_context, 'structures') as tagger:
             tagger.measure("blocks", len(structure["blocks"]))
+            tagger.keys = 1
             self.structures.insert(structure_to_mongo(structure, course_context))
 
+    def insert_structures(self, structures, course_context=None):
+        """
+        Insert new structures into the database, in a single unordered bulk write. Structures
+        which are already in the database are skipped.
+        """
+        with TIMER.timer("insert_structures", course_context, 'structures') as tagger:
+            tagger.measure("structures", len(structures))
+            tagger.keys = len(structures)
+            tagger.measure("blocks", sum(len(structure["blocks"]) for structure in structures))
+            _insert_many_skipping_duplicates(
+                self.structures,
+                [structure_to_mongo(structure, course_context) for structure in structures],
+            )
+
     def get_course_index(self, key, ignore_case=False):
         """
         Get the course_index from the persistence mechanism whose id is the given key
         """
-        with TIMER.timer("get_course_index", key):
+        with TIMER.timer("get_course_index", key, 'active_versions') as tagger:
+            tagger.keys = 1
             if ignore_case:
                 query = {
                     key_attr: re.compile(u'^{}$'.format(re.escape(getattr(key, key_attr))), re.IGNORECASE)
@@ -449,7 +824,9 @@ class MongoConnection(object):
                     key_attr: getattr(key, key_attr)
                     for key_attr in ('org', 'course', 'run')
                 }
-            return self.course_index.find_one(query)
+            course_index = self.course_index.find_one(query)
+            tagger.measure_documents(course_index)
+            return course_index
 
     def find_matching_course_indexes(self, branch=None, search_targets=None, org_target=None, course_context=None):
         """
@@ -462,7 +839,7 @@ class MongoConnection(object):
             org_target: If specified, this is an ORG filter so that only course_indexs are
                 returned for the specified ORG
         """
-        with TIMER.timer("find_matching_course_indexes", course_context):
+        with TIMER.timer("find_matching_course_indexes", course_context, 'active_versions'):
             query = {}
             if branch is not None:
                 query['versions.{}'.format(branch)] = {'$exists': True}
@@ -480,7 +857,7 @@ class MongoConnection(object):
         """
         Create the course_index in the db
         """
-        with TIMER.timer("insert_course_index", course_context):
+        with TIMER.timer("insert_course_index", course_context, 'active_versions'):
             course_index['last_update'] = datetime.datetime.now(pytz.utc)
             self.course_index.insert(course_index)
 
@@ -491,7 +868,7 @@ class MongoConnection(object):
         Arguments:
             from_index: If set, only update an index if it matches the one specified in `from_index`.
         """
-        with TIMER.timer("update_course_index", course_context):
+        with TIMER.timer("update_course_index", course_context, 'active_versions'):
             if from_index:
                 query = {"_id": from_index["_id"]}
                 # last_update not only tells us when this course was last updated but also helps
@@ -511,7 +888,7 @@ class MongoConnection(object):
         """
         Delete the course_index from the persistence mechanism whose id is the given course_index
         """
-        with TIMER.timer("delete_course_index", course_key):
+        with TIMER.timer("delete_course_index", course_key, 'active_versions'):
             query = {
                 key_attr: getattr(course_key, key_attr)
                 for key_attr in ('org', 'course', 'run')
@@ -522,8 +899,10 @@ class MongoConnection(object):
         """
         Get the definition from the persistence mechanism whose id is the given key
         """
-        with TIMER.timer("get_definition", course_context) as tagger:
+        with TIMER.timer("get_definition", course_context, 'definitions') as tagger:
+            tagger.keys = 1
             definition = self.definitions.find_one({'_id': key})
+            tagger.measure_documents(definition)
             tagger.measure("fields", len(definition['fields']))
             tagger.tag(block_type=definition['block_type'])
             return definition
@@ -532,8 +911,9 @@ class MongoConnection(object):
         """
         Retrieve all definitions listed in `definitions`.
         """
-        with TIMER.timer("get_definitions", course_context) as tagger:
+        with TIMER.timer("get_definitions", course_context, 'definitions') as tagger:
             tagger.measure('definitions', len(definitions))
+            tagger.keys = len(definitions)
             definitions = self.definitions.find({'_id': {'$in': definitions}})
             return definitions
 
@@ -541,11 +921,21 @@ class MongoConnection(object):
         """
         Create the definition in the db
         """
-        with TIMER.timer("insert_definition", course_context) as tagger:
+        with TIMER.timer("insert_definition", course_context, 'definitions') as tagger:
             tagger.measure('fields', len(definition['fields']))
             tagger.tag(block_type=definition['block_type'])
             self.definitions.insert(definition)
 
+    def insert_definitions(self, definitions, course_context=None):
+        """
+        Create the definitions in the db, in a single unordered bulk write. Definitions which
+        are already in the db are skipped.
+        """
+        with TIMER.timer("insert_definitions", course_context, 'definitions') as tagger:
+            tagger.measure('definitions', len(definitions))
+            tagger.keys = len(definitions)
+            _insert_many_skipping_duplicates(self.definitions, definitions)
+
     def ensure_indexes(self):
         """
         Ensure that all appropriate indexes are created that are needed by this modulestore, or raise
@@ -83,7 +83,8 @@ from xmodule.modulestore import (
 
 from ..exceptions import ItemNotFoundError
 from .caching_descriptor_system import CachingDescriptorSystem
-from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
+from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex, StructureIndexCache
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.error_module import ErrorDescriptor
@@ -243,28 +244,25 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
 
         dirty = False
 
-        # If the content is dirty, then update the database
-        for _id in bulk_write_record.structures.viewkeys() - bulk_write_record.structures_in_db:
+        # If the content is dirty, then update the database, writing all of the new structures and
+        # definitions in one batch each. We may not have looked up some of them inside this bulk
+        # operation, and thus didn't realize that they were already in the database. That's OK, the
+        # store is append only, so the batch inserts skip any which have already been written.
+        new_structures = [
+            bulk_write_record.structures[_id]
+            for _id in bulk_write_record.structures.viewkeys() - bulk_write_record.structures_in_db
+        ]
+        if new_structures:
             dirty = True
+            self.db_connection.insert_structures(new_structures, bulk_write_record.course_key)
 
-            try:
-                self.db_connection.insert_structure(bulk_write_record.structures[_id], bulk_write_record.course_key)
-            except DuplicateKeyError:
-                # We may not have looked up this structure inside this bulk operation, and thus
-                # didn't realize that it was already in the database. That's OK, the store is
-                # append only, so if it's already been written, we can just keep going.
-                log.debug("Attempted to insert duplicate structure %s", _id)
-
-        for _id in bulk_write_record.definitions.viewkeys() - bulk_write_record.definitions_in_db:
+        new_definitions = [
+            bulk_write_record.definitions[_id]
+            for _id in bulk_write_record.definitions.viewkeys() - bulk_write_record.definitions_in_db
+        ]
+        if new_definitions:
             dirty = True
-
-            try:
-                self.db_connection.insert_definition(bulk_write_record.definitions[_id], bulk_write_record.course_key)
-            except DuplicateKeyError:
-                # We may not have looked up this definition inside this bulk operation, and thus
-                # didn't realize that it was already in the database. That's OK, the store is
-                # append only, so if it's already been written, we can just keep going.
-                log.debug("Attempted to insert duplicate definition %s", _id)
+            self.db_connection.insert_definitions(new_definitions, bulk_write_record.course_key)
 
         if bulk_write_record.index is not None and bulk_write_record.index != bulk_write_record.initial_index:
             dirty = True
@@ -337,6 +335,14 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
             version_guid = course_key.as_object_id(version_guid)
             return self.db_connection.get_structure(version_guid, course_key)
 
+    def is_persisted_structure(self, course_key, structure):
+        """
+        Return whether the structure is persisted, and so can no longer change. Structures which
+        are being edited by the active bulk operation on course_key may still be modified in place.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        return not bulk_write_record.active or structure['_id'] in bulk_write_record.structures_in_db
+
     def update_structure(self, course_key, structure):
         """
         Update a course structure, respecting the current bulk operation status
@@ -425,19 +431,20 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
         bulk_write_record = self._get_bulk_ops_record(course_key)
         if bulk_write_record.active:
             # Only query for the definitions that aren't already cached.
-            for definition in bulk_write_record.definitions.values():
-                definition_id = definition.get('_id')
-                if definition_id in ids:
+            for definition_id in list(ids):
+                definition = bulk_write_record.definitions.get(definition_id)
+                if definition is not None:
                     ids.remove(definition_id)
                     definitions.append(definition)
 
         if len(ids):
             # Query the db for the definitions.
             defs_from_db = list(self.db_connection.get_definitions(list(ids), course_key))
-            defs_dict = {d.get('_id'): d for d in defs_from_db}
-            # Add the retrieved definitions to the cache.
-            bulk_write_record.definitions_in_db.update(defs_dict.iterkeys())
-            bulk_write_record.definitions.update(defs_dict)
+            if bulk_write_record.active:
+                # Add the retrieved definitions to the cache.
+                defs_dict = {d.get('_id'): d for d in defs_from_db}
+                bulk_write_record.definitions_in_db.update(defs_dict.iterkeys())
+                bulk_write_record.definitions.update(defs_dict)
             definitions.extend(defs_from_db)
         return definitions
 
@@ -653,6 +660,8 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
     # It won't recompute the value on operations such as update_course_index (e.g., to revert to a prev
     # version) but those functions will have an optional arg for setting these.
     SEARCH_TARGET_DICT = ['wiki_slug']
+    # the maximum number of structure versions whose block indexes are kept in memory
+    STRUCTURE_INDEX_CACHE_SIZE = 64
 
     def __init__(self, contentstore, doc_store_config, fs_root, render_template,
                  default_class=None,
@@ -666,6 +675,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
 
         self.db_connection = MongoConnection(**doc_store_config)
+        self._structure_indexes = StructureIndexCache(self.STRUCTURE_INDEX_CACHE_SIZE)
 
         if default_class is not None:
             module_path, __, class_name = default_class.rpartition('.')
@@ -743,8 +753,14 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                 )
 
             # This method supports lazy loading, where the descendent definitions aren't loaded
-            # until they're actually needed.
-            if not lazy:
+            # until they're actually needed. The definitions of the newly cached blocks are then
+            # fetched together with those of their siblings once the first of them is needed.
+            if lazy:
+                system.plan_definition_prefetch({
+                    block_key: block for block_key, block in new_module_data.iteritems()
+                    if block_key not in system.module_data
+                })
+            else:
                 # Non-lazy loading: Load all descendants by id.
                 descendent_definitions = self.get_definitions(
                     course_key,
@@ -1198,24 +1214,25 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         if settings is None:
             settings = {}
+        blocks = course.structure['blocks']
+        structure_index = self._get_structure_index(course)
         if 'name' in qualifiers:
             # odd case where we don't search just confirm
             block_name = qualifiers.pop('name')
-            block_ids = []
-            for block_id, block in course.structure['blocks'].iteritems():
-                # Don't do an in comparison blindly; first check to make sure
-                # that the name qualifier we're looking at isn't a plain string;
-                # if it is a string, then it should match exactly. If it's other
-                # than a string, we check whether it contains the block ID; this
-                # is so a list or other iterable can be passed with multiple
-                # valid qualifiers.
-                if isinstance(block_name, six.string_types):
-                    name_matches = block_id.id == block_name
-                else:
-                    name_matches = block_id.id in block_name
-                if name_matches and _block_matches_all(block):
-                    block_ids.append(block_id)
+            # Don't do an in comparison blindly; first check to make sure
+            # that the name qualifier we're looking at isn't a plain string;
+            # if it is a string, then it should match exactly. If it's other
+            # than a string, we check whether it contains the block ID; this
+            # is so a list or other iterable can be passed with multiple
+            # valid qualifiers.
+            if isinstance(block_name, six.string_types):
+                candidates = structure_index.blocks_named([block_name])
+            elif isinstance(block_name, (list, tuple, set, frozenset)):
+                candidates = structure_index.blocks_named(block_name)
+            else:
+                candidates = [block_id for block_id in blocks if block_id.id in block_name]
 
+            block_ids = [block_id for block_id in candidates if _block_matches_all(blocks[block_id])]
             return self._load_items(course, block_ids, **kwargs)
 
         if 'category' in qualifiers:
@@ -1225,21 +1242,19 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         if 'children' in qualifiers:
             settings['children'] = qualifiers.pop('children')
 
-        # No need of these caches unless include_orphans is set to False
-        path_cache = None
-        parents_cache = None
+        # only the blocks of the requested type need to be checked
+        if isinstance(qualifiers.get('block_type'), six.string_types):
+            candidates = structure_index.blocks_of_type(qualifiers['block_type'])
+        else:
+            candidates = blocks
 
         if not include_orphans:
-            path_cache = {}
-            parents_cache = self.build_block_key_to_parents_mapping(course.structure)
+            reachable = structure_index.reachable
 
-        for block_id, value in course.structure['blocks'].iteritems():
-            if _block_matches_all(value):
+        for block_id in candidates:
+            if _block_matches_all(blocks[block_id]):
                 if not include_orphans:
-                    if (  # pylint: disable=bad-continuation
-                        block_id.type in DETACHED_XBLOCK_TYPES or
-                        self.has_path_to_root(block_id, course, path_cache, parents_cache)
-                    ):
+                    if block_id.type in DETACHED_XBLOCK_TYPES or block_id in reachable:
                         items.append(block_id)
                 else:
                     items.append(block_id)
@@ -1249,6 +1264,18 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         else:
             return []
 
+    def _get_structure_index(self, course):
+        """
+        Return the :class:`.StructureIndex` of the structure of the given CourseEnvelope.
+
+        Indexes of persisted structures are cached, since those structures never change. The
+        structures which are being edited by an active bulk operation may still be modified in
+        place, so their indexes are built afresh on every call.
+        """
+        if not self.is_persisted_structure(course.course_key, course.structure):
+            return StructureIndex(course.structure)
+        return self._structure_indexes.get(course.structure)
+
     def build_block_key_to_parents_mapping(self, structure):
         """
         Given a structure, builds block_key to parents mapping for all block keys in structure
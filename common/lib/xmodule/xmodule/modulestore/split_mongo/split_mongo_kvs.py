@@ -22,16 +22,22 @@ class SplitMongoKVS(InheritanceKeyValueStore):
     VALID_SCOPES = (Scope.parent, Scope.children, Scope.settings, Scope.content)
 
     @contract(parent="BlockUsageLocator | None")
-    def __init__(self, definition, initial_values, default_values, parent, aside_fields=None, field_decorator=None):
+    def __init__(
+        self, definition, initial_values, default_values, parent, aside_fields=None, field_decorator=None,
+        inherited_value_resolver=None
+    ):
         """
 
         :param definition: either a lazyloader or definition id for the definition
         :param initial_values: a dictionary of the locally set values
         :param default_values: any Scope.settings field defaults that are set locally
             (copied from a template block with copy_from_template)
+        :param inherited_value_resolver: see InheritanceKeyValueStore
         """
         # deepcopy so that manipulations of fields does not pollute the source
-        super(SplitMongoKVS, self).__init__(copy.deepcopy(initial_values))
+        super(SplitMongoKVS, self).__init__(
+            copy.deepcopy(initial_values), inherited_value_resolver=inherited_value_resolver
+        )
         self._definition = definition  # either a DefinitionLazyLoader or the db id of the definition.
         # if the db id, then the definition is presumed to be loaded into _fields
 
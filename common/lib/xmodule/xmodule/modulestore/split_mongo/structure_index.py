@@ -0,0 +1,150 @@
+"""
+Secondary indexes over the blocks of a split course structure, so that
+lookups by block type, by block id and of the blocks in the course tree
+don't need to scan the entire structure.
+"""
+import threading
+from collections import OrderedDict, defaultdict
+
+
+# Block types which are the roots of course trees.
+ROOT_BLOCK_TYPES = ('course', 'library')
+
+
+class StructureIndex(object):
+    """
+    Indexes of the blocks of a single structure version. Each index is
+    built the first time it is used.
+
+    The indexes are only valid as long as the structure isn't modified,
+    so they should only be cached for structures which are persisted (and
+    therefore immutable).
+    """
+    def __init__(self, structure):
+        """
+        Arguments:
+            structure (dict): The db json of the course structure.
+        """
+        self.structure = structure
+        self._blocks_by_type = None
+        self._blocks_by_name = None
+        self._parents = None
+        self._reachable = None
+
+    @property
+    def blocks_by_type(self):
+        """
+        dict {block_type: [BlockKey]} of the blocks of each type.
+        """
+        if self._blocks_by_type is None:
+            blocks_by_type = defaultdict(list)
+            for block_key in self.structure['blocks']:
+                blocks_by_type[block_key.type].append(block_key)
+            self._blocks_by_type = dict(blocks_by_type)
+        return self._blocks_by_type
+
+    @property
+    def blocks_by_name(self):
+        """
+        dict {block_id: [BlockKey]} of the blocks with each block id
+        (blocks of different types may share a block id).
+        """
+        if self._blocks_by_name is None:
+            blocks_by_name = defaultdict(list)
+            for block_key in self.structure['blocks']:
+                blocks_by_name[block_key.id].append(block_key)
+            self._blocks_by_name = dict(blocks_by_name)
+        return self._blocks_by_name
+
+    @property
+    def parents(self):
+        """
+        defaultdict {BlockKey: [BlockKey]} of the parents of each block,
+        as built by SplitMongoModuleStore.build_block_key_to_parents_mapping.
+        """
+        if self._parents is None:
+            parents = defaultdict(list)
+            for parent_key, block_data in self.structure['blocks'].iteritems():
+                for child_key in block_data.fields.get('children', []):
+                    parents[child_key].append(parent_key)
+            self._parents = parents
+        return self._parents
+
+    @property
+    def reachable(self):
+        """
+        frozenset of the BlockKeys of the blocks which have a path to the
+        root of the course (see SplitMongoModuleStore.has_path_to_root).
+        """
+        if self._reachable is None:
+            blocks = self.structure['blocks']
+            parents = self.parents
+            stack = [
+                block_key for block_key in blocks
+                if block_key.type in ROOT_BLOCK_TYPES and not parents.get(block_key)
+            ]
+            reachable = set(stack)
+            while stack:
+                block_data = blocks.get(stack.pop())
+                if block_data is None:
+                    continue
+                for child_key in block_data.fields.get('children', []):
+                    if child_key not in reachable:
+                        reachable.add(child_key)
+                        stack.append(child_key)
+            self._reachable = frozenset(reachable)
+        return self._reachable
+
+    def blocks_of_type(self, block_type):
+        """
+        Returns the list of BlockKeys of the blocks of the given type.
+        """
+        return self.blocks_by_type.get(block_type, [])
+
+    def blocks_named(self, block_names):
+        """
+        Returns the list of BlockKeys of the blocks whose block id is in
+        the given iterable of block ids.
+        """
+        blocks_by_name = self.blocks_by_name
+        block_keys = []
+        for block_name in set(block_names):
+            block_keys.extend(blocks_by_name.get(block_name, []))
+        return block_keys
+
+
+class StructureIndexCache(object):
+    """
+    A bounded, process-local cache of StructureIndexes, keyed by structure
+    id. Entries are evicted least-recently-used first once there are more
+    than ``max_entries`` of them.
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, structure):
+        """
+        Returns the index of the given (persisted) structure, creating
+        and caching it if it isn't cached yet.
+        """
+        key = structure['_id']
+        with self._lock:
+            index = self._entries.pop(key, None)
+            if index is None:
+                index = StructureIndex(structure)
+            self._entries[key] = index
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def clear(self):
+        """
+        Remove all indexes from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
@@ -340,6 +340,44 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
             self.assertIn(course_key, self.store.mappings)
             self.assertEqual(self.store.default_modulestore, self.store._get_modulestore_for_courselike(course_key))  # pylint: disable=protected-access
 
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    def test_get_modulestore_unknown_course_cache(self, default_ms):
+        """
+        Make sure we cache unknown course keys for the request, until the course is created
+        """
+        self.initdb(default_ms)
+        course_key = self.store.make_course_key('org_x', 'course_y', 'run_z')
+        self.store.request_cache = Mock(data={})
+        for _ in range(2):
+            self.assertEqual(self.store.default_modulestore, self.store._get_modulestore_for_courselike(course_key))  # pylint: disable=protected-access
+        self.assertEqual(
+            self.store.get_routing_stats(),
+            {'probed': 1, 'store_probes': len(self.store.modulestores), 'unknown': 1},
+        )
+
+        # Creating the course makes it be looked up again.
+        self.store.create_course('org_x', 'course_y', 'run_z', self.user_id)
+        self.store.mappings = {}
+        routing_stats = self.store.get_routing_stats()
+        with check_exact_number_of_calls(self.store.default_modulestore, 'has_course', 1):
+            self.assertEqual(self.store.default_modulestore, self.store._get_modulestore_for_courselike(course_key))  # pylint: disable=protected-access
+            self.assertEqual(self.store.default_modulestore, self.store._get_modulestore_for_courselike(course_key))  # pylint: disable=protected-access
+        self.assertEqual(self.store.get_routing_stats()['probed'], routing_stats['probed'] + 1)
+        self.assertEqual(self.store.get_routing_stats()['mapped'], routing_stats.get('mapped', 0) + 1)
+
+    @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
+    def test_get_modulestore_unknown_course_no_cache(self, default_ms):
+        """
+        Make sure unknown course keys are probed every time when there's no request cache
+        """
+        self.initdb(default_ms)
+        course_key = self.store.make_course_key('org_x', 'course_y', 'run_z')
+        self.store.request_cache = None
+        with check_exact_number_of_calls(self.store.default_modulestore, 'has_course', 2):
+            for _ in range(2):
+                self.assertEqual(self.store.default_modulestore, self.store._get_modulestore_for_courselike(course_key))  # pylint: disable=protected-access
+        self.assertEqual(self.store.get_routing_stats(), {})
+
     @ddt.data(*itertools.product(
         (ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split),
         (True, False)
@@ -918,8 +956,8 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
     #   Sends: delete item, update parent
     # Split
     #   Find: active_versions, 2 structures (published & draft), definition (unnecessary)
-    #   Sends: updated draft and published structures and active_versions
-    @ddt.data((ModuleStoreEnum.Type.mongo, 7, 2), (ModuleStoreEnum.Type.split, 3, 3))
+    #   Sends: updated draft and published structures (in one batch) and active_versions
+    @ddt.data((ModuleStoreEnum.Type.mongo, 7, 2), (ModuleStoreEnum.Type.split, 3, 2))
     @ddt.unpack
     def test_delete_item(self, default_ms, max_find, max_send):
         """
@@ -946,8 +984,8 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
     #    sends: delete draft vertical and update parent
     # Split:
     #    queries: active_versions, draft and published structures, definition (unnecessary)
-    #    sends: update published (why?), draft, and active_versions
-    @ddt.data((ModuleStoreEnum.Type.mongo, 9, 2), (ModuleStoreEnum.Type.split, 4, 3))
+    #    sends: update published (why?) and draft (in one batch), and active_versions
+    @ddt.data((ModuleStoreEnum.Type.mongo, 9, 2), (ModuleStoreEnum.Type.split, 4, 2))
     @ddt.unpack
     def test_delete_private_vertical(self, default_ms, max_find, max_send):
         """
@@ -1265,10 +1303,11 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
     #    1. Get problem
     #    2-6. get parent and rest of ancestors up to course
     #    7-8. get sequential, compute inheritance
-    #    8-9. get vertical, compute inheritance
-    #    10-11. get other vertical_x1b (why?) and compute inheritance
+    #    9. get vertical
+    #    10. get other vertical_x1b (why?)
+    #   The inheritance tree is only computed once, as it's cached for the bulk operation.
     # Split: active_versions & structure
-    @ddt.data((ModuleStoreEnum.Type.mongo, [12, 3], 0), (ModuleStoreEnum.Type.split, [2, 2], 0))
+    @ddt.data((ModuleStoreEnum.Type.mongo, [10, 3], 0), (ModuleStoreEnum.Type.split, [2, 2], 0))
     @ddt.unpack
     def test_path_to_location(self, default_ms, num_finds, num_sends):
         """
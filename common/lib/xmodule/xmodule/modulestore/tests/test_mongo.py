@@ -41,6 +41,7 @@ from xmodule.exceptions import NotFoundError
 from git.test.lib.asserts import assert_not_none
 from xmodule.x_module import XModuleMixin
 from xmodule.modulestore.mongo.base import as_draft
+from xmodule.modulestore.tests.factories import check_mongo_calls
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 from xmodule.modulestore.tests.utils import LocationMixin, mock_tab_from_json
 from xmodule.modulestore.edit_info import EditInfoMixin
@@ -362,6 +363,33 @@ class TestMongoModuleStore(TestMongoModuleStoreBase):
             self.draft_store._find_one(Location('edX', 'toy', '2012_Fall', 'video', 'Welcome')),
         )
 
+    def test_find_one_in_bulk_operation(self):
+        """
+        Test that items (and missing items) are only found once per bulk operation, until the course is written.
+        """
+        course_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+        location = course_key.make_usage_key('video', 'Welcome')
+        missing_location = course_key.make_usage_key('video', 'NoSuchVideo')
+        with self.draft_store.bulk_operations(course_key):
+            with check_mongo_calls(1):
+                item = self.draft_store._find_one(location)
+            with check_mongo_calls(0):
+                # the cached document isn't affected by changes to the returned one
+                item['metadata'] = None
+                self.assertIsNotNone(self.draft_store._find_one(location)['metadata'])
+            for expected_finds in (1, 0):
+                with check_mongo_calls(expected_finds):
+                    with self.assertRaises(ItemNotFoundError):
+                        self.draft_store._find_one(missing_location)
+
+            # writing to the course discards the cached documents
+            self.draft_store._get_bulk_ops_record(course_key).dirty = True
+            with check_mongo_calls(1):
+                self.draft_store._find_one(location)
+
+        with check_mongo_calls(1):
+            self.draft_store._find_one(location)
+
     def test_xlinter(self):
         '''
         Run through the xlinter, we know the 'toy' course has violations, but the
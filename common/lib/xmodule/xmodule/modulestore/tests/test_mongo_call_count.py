@@ -136,22 +136,27 @@ class CountMongoCallsCourseTraversal(TestCase):
         # These two lines show the way this traversal *should* be done
         # (if you'll eventually access all the fields and load all the definitions anyway).
         # 'lazy' does not matter in old Mongo.
-        (MIXED_OLD_MONGO_MODULESTORE_BUILDER, None, False, True, 175),
-        (MIXED_OLD_MONGO_MODULESTORE_BUILDER, None, True, True, 175),
+        # For depth=None, each level of children is found with a single query for both the
+        # published and draft versions, and the items and inheritance tree found during the
+        # bulk operation are reused rather than queried again. depth=0 still loads each item
+        # on its own as it is traversed.
+        (MIXED_OLD_MONGO_MODULESTORE_BUILDER, None, False, True, 155),
+        (MIXED_OLD_MONGO_MODULESTORE_BUILDER, None, True, True, 155),
         (MIXED_OLD_MONGO_MODULESTORE_BUILDER, 0, False, True, 359),
         (MIXED_OLD_MONGO_MODULESTORE_BUILDER, 0, True, True, 359),
         # As shown in these two lines: whether or not the XBlock fields are accessed,
         # the same number of mongo calls are made in old Mongo for depth=None.
-        (MIXED_OLD_MONGO_MODULESTORE_BUILDER, None, False, False, 175),
-        (MIXED_OLD_MONGO_MODULESTORE_BUILDER, None, True, False, 175),
+        (MIXED_OLD_MONGO_MODULESTORE_BUILDER, None, False, False, 155),
+        (MIXED_OLD_MONGO_MODULESTORE_BUILDER, None, True, False, 155),
         (MIXED_OLD_MONGO_MODULESTORE_BUILDER, 0, False, False, 359),
         (MIXED_OLD_MONGO_MODULESTORE_BUILDER, 0, True, False, 359),
         # The line below shows the way this traversal *should* be done
         # (if you'll eventually access all the fields and load all the definitions anyway).
         (MIXED_SPLIT_MODULESTORE_BUILDER, None, False, True, 4),
-        (MIXED_SPLIT_MODULESTORE_BUILDER, None, True, True, 38),
-        (MIXED_SPLIT_MODULESTORE_BUILDER, 0, False, True, 38),
-        (MIXED_SPLIT_MODULESTORE_BUILDER, 0, True, True, 38),
+        # Definitions loaded lazily are fetched together with those of their siblings.
+        (MIXED_SPLIT_MODULESTORE_BUILDER, None, True, True, 37),
+        (MIXED_SPLIT_MODULESTORE_BUILDER, 0, False, True, 37),
+        (MIXED_SPLIT_MODULESTORE_BUILDER, 0, True, True, 37),
         (MIXED_SPLIT_MODULESTORE_BUILDER, None, False, False, 4),
         (MIXED_SPLIT_MODULESTORE_BUILDER, None, True, False, 4),
         (MIXED_SPLIT_MODULESTORE_BUILDER, 0, False, False, 4),
@@ -173,7 +178,7 @@ class CountMongoCallsCourseTraversal(TestCase):
                     self._traverse_blocks_in_course(start_block, access_all_block_fields)
 
     @ddt.data(
-        (MIXED_OLD_MONGO_MODULESTORE_BUILDER, 176),
+        (MIXED_OLD_MONGO_MODULESTORE_BUILDER, 155),
         (MIXED_SPLIT_MODULESTORE_BUILDER, 5),
     )
     @ddt.unpack
@@ -0,0 +1,77 @@
+"""
+Tests for query_profile.py
+"""
+from unittest import TestCase
+
+from mock import patch
+
+from xmodule.modulestore.query_profile import (
+    QueryProfile, is_profiling, profile_queries, profile_query, record_query
+)
+from xmodule.modulestore.split_mongo.mongo_connection import QueryTimer
+
+
+class TestQueryProfile(TestCase):
+    """
+    Tests of recording Mongo operations in QueryProfiles.
+    """
+    def test_not_profiling(self):
+        self.assertFalse(is_profiling())
+        record_query('find', 'structures', keys=1)
+        with profile_query('find', 'structures', keys=1) as query:
+            query.measure({'_id': 1})
+        self.assertIsNone(query.size)
+
+    def test_nested_profiles(self):
+        with profile_queries() as outer:
+            record_query('get_structure', 'structures', keys=1, size=100, duration=0.002)
+            with profile_queries() as inner:
+                self.assertTrue(is_profiling())
+                with profile_query('get_definitions', 'definitions', keys=3) as query:
+                    query.measure({'_id': 1}, {'_id': 2}, None)
+            record_query('get_course_index', 'active_versions', keys=1)
+        self.assertFalse(is_profiling())
+
+        self.assertEqual(len(outer), 3)
+        self.assertEqual(len(inner), 1)
+        self.assertEqual(inner.records[0].operation, 'get_definitions')
+        self.assertEqual(inner.records[0].keys, 3)
+        self.assertGreater(inner.records[0].size, 0)
+        self.assertEqual(
+            outer.counts_by_collection(),
+            {'structures': 1, 'definitions': 1, 'active_versions': 1},
+        )
+        self.assertTrue(outer.summary().startswith('3 ops '))
+        self.assertTrue(outer.summary().endswith(' active_versions=1 definitions=1 structures=1'))
+
+    def test_budget(self):
+        profile = QueryProfile()
+        for _ in range(3):
+            profile.record('get_structure', 'structures')
+        profile.record('get_definitions', 'definitions')
+
+        self.assertEqual(profile.exceeded_budget(4), [])
+        self.assertEqual(profile.exceeded_budget(3), [(None, 4, 3)])
+        self.assertEqual(
+            profile.exceeded_budget({'structures': 2, 'definitions': 1, 'active_versions': 0}),
+            [('structures', 3, 2)],
+        )
+        with patch('xmodule.modulestore.query_profile.log') as mock_log:
+            self.assertTrue(profile.check_budget({'structures': 2}, 'courseware'))
+            self.assertEqual(mock_log.warning.call_count, 1)
+            self.assertFalse(profile.check_budget(10, 'courseware'))
+            self.assertEqual(mock_log.warning.call_count, 1)
+
+    def test_query_timer(self):
+        timer = QueryTimer('test', 1)
+        with profile_queries() as profile:
+            with timer.timer('get_structure', 'course-v1:org+course+run'):
+                pass
+            with timer.timer('get_definition', 'course-v1:org+course+run', 'definitions') as tagger:
+                tagger.keys = 1
+                tagger.measure_documents({'_id': 1, 'fields': {}})
+        self.assertEqual(len(profile), 1)
+        self.assertEqual(profile.records[0].operation, 'get_definition')
+        self.assertEqual(profile.records[0].collection, 'definitions')
+        self.assertEqual(profile.records[0].keys, 1)
+        self.assertGreater(profile.records[0].size, 0)
@@ -29,6 +29,7 @@ from ccx_keys.locator import CCXBlockUsageLocator
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.x_module import XModuleMixin
 from xmodule.fields import Date, Timedelta
+from xmodule.modulestore.split_mongo.mongo_connection import StructureLRUCache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
@@ -999,6 +1000,25 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    def test_structure_lru_cache(self):
+        db_connection = modulestore().db_connection
+        lru_cache = StructureLRUCache(max_size=10 * 1024 * 1024)
+        self.addCleanup(setattr, db_connection, 'structure_lru_cache', db_connection.structure_lru_cache)
+        db_connection.structure_lru_cache = lru_cache
+
+        with check_mongo_calls(1):
+            not_cached_structure = self._get_structure(self.new_course)
+
+        # Even though the django cache is a dummy cache, the structure
+        # is now served from the process-local cache
+        with check_mongo_calls(0):
+            cached_structure = self._get_structure(self.new_course)
+
+        # Each read gets its own copy of the structure
+        self.assertEqual(cached_structure, not_cached_structure)
+        self.assertIsNot(cached_structure, not_cached_structure)
+        self.assertEqual(len(lru_cache), 1)
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
@@ -1221,6 +1241,39 @@ class SplitModuleItemTests(SplitModuleTest):
         matches = modulestore().get_items(locator, settings={'group_access': {'$exists': False}})
         self.assertEqual(len(matches), 7)
 
+    def test_get_items_structure_index(self):
+        """
+        get_items uses (and caches) the indexes of persisted structures, but not of the
+        structures being edited by a bulk operation
+        """
+        store = modulestore()
+        locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        structure = store._lookup_course(locator).structure  # pylint: disable=protected-access
+        store._structure_indexes.clear()  # pylint: disable=protected-access
+
+        matches = store.get_items(locator, qualifiers={'category': 'chapter'}, include_orphans=False)
+        self.assertEqual(len(matches), 4)
+        structure_index = store._structure_indexes.get(structure)  # pylint: disable=protected-access
+        self.assertEqual(len(store._structure_indexes), 1)  # pylint: disable=protected-access
+        self.assertEqual(len(structure_index.blocks_of_type('chapter')), 4)
+        self.assertIn(BlockKey('chapter', 'chapter1'), structure_index.reachable)
+
+        with store.bulk_operations(locator):
+            orphan = store.create_item(self.user_id, locator, 'chapter', block_id='orphan_chapter')
+            child = store.create_child(self.user_id, orphan.location, 'vertical', block_id='orphan_vertical')
+            self.assertEqual(len(store.get_items(locator, qualifiers={'category': 'chapter'})), 5)
+            matches = store.get_items(locator, qualifiers={'name': ['orphan_chapter', 'orphan_vertical']})
+            self.assertEqual(len(matches), 2)
+            matches = store.get_items(locator, qualifiers={'category': 'chapter'}, include_orphans=False)
+            self.assertEqual(len(matches), 4)
+            self.assertEqual(len(store._structure_indexes), 1)  # pylint: disable=protected-access
+
+        matches = store.get_items(locator, qualifiers={'name': 'orphan_vertical'}, include_orphans=False)
+        self.assertEqual([match.location.version_agnostic() for match in matches], [child.location.version_agnostic()])
+        matches = store.get_items(locator, qualifiers={'category': 'vertical'}, include_orphans=False)
+        self.assertNotIn(child.location.version_agnostic(), [match.location.version_agnostic() for match in matches])
+        self.assertEqual(len(store._structure_indexes), 2)  # pylint: disable=protected-access
+
     def test_get_parents(self):
         '''
         get_parent_location(locator): BlockUsageLocator
@@ -1261,6 +1314,71 @@ class SplitModuleItemTests(SplitModuleTest):
             expected_ids.remove(child.location.block_id)
         self.assertEqual(len(expected_ids), 0)
 
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_definition_prefetch(self, _from_json):
+        """
+        The definitions of the blocks cached together are fetched together when the first one is needed
+        """
+        store = modulestore()
+        locator = BlockUsageLocator(
+            CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT), 'course', 'head12345'
+        )
+        with patch.object(store, 'get_definition', wraps=store.get_definition) as mock_get_definition:
+            with patch.object(store, 'get_definitions', wraps=store.get_definitions) as mock_get_definitions:
+                block = store.get_item(locator, depth=1)
+                definition_ids = set(child.definition_locator.definition_id for child in block.get_children())
+                definitions = [
+                    block.runtime.get_definition(locator.course_key, definition_id)
+                    for definition_id in definition_ids
+                ]
+
+        self.assertEqual(set(definition['_id'] for definition in definitions), definition_ids)
+        # the course's own definition may be fetched separately, but its children's are fetched together
+        children_calls = [
+            call for call in mock_get_definitions.call_args_list if definition_ids.intersection(call[0][1])
+        ]
+        self.assertEqual(len(children_calls), 1)
+        self.assertTrue(definition_ids.issubset(children_calls[0][0][1]))
+        self.assertEqual(mock_get_definition.call_count, 0)
+
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_definition_prefetch_siblings_only(self, _from_json):
+        """
+        The definition of a block is only fetched together with those of its siblings
+        """
+        store = modulestore()
+        locator = BlockUsageLocator(
+            CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT), 'course', 'head12345'
+        )
+        with patch.object(store, 'get_definitions', wraps=store.get_definitions) as mock_get_definitions:
+            block = store.get_item(locator, depth=None)
+            course_definition_id = block.definition_locator.definition_id
+            for child in block.get_children():
+                block.runtime.get_definition(locator.course_key, child.definition_locator.definition_id)
+
+        for call in mock_get_definitions.call_args_list:
+            definition_ids = set(call[0][1])
+            if course_definition_id in definition_ids:
+                self.assertEqual(definition_ids, {course_definition_id})
+
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    @patch('xmodule.modulestore.split_mongo.caching_descriptor_system.DEFINITION_PREFETCH_CHUNK_SIZE', 1)
+    def test_definition_prefetch_chunks(self, _from_json):
+        """
+        Definitions are fetched in chunks of at most DEFINITION_PREFETCH_CHUNK_SIZE
+        """
+        store = modulestore()
+        locator = BlockUsageLocator(
+            CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT), 'course', 'head12345'
+        )
+        with patch.object(store, 'get_definitions', wraps=store.get_definitions) as mock_get_definitions:
+            block = store.get_item(locator, depth=1)
+            for child in block.get_children():
+                block.runtime.get_definition(locator.course_key, child.definition_locator.definition_id)
+
+        for call in mock_get_definitions.call_args_list:
+            self.assertLessEqual(len(call[0][1]), 1)
+
 
 def version_agnostic(children):
     """
@@ -1984,6 +2102,24 @@ class TestInheritance(SplitModuleTest):
         # overridden
         self.assertEqual(node.graceperiod, datetime.timedelta(hours=4))
 
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_lazy_inheritance(self, _from_json):
+        """
+        Inherited values are resolved from the structure without loading the ancestors
+        """
+        locator = BlockUsageLocator(
+            CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT), 'problem', 'problem3_2'
+        )
+        node = modulestore().get_item(locator)
+        self.assertEqual(node.graceperiod, datetime.timedelta(hours=2))
+        self.assertFalse(node.has_cached_parent)
+        self.assertEqual(
+            Timedelta().from_json(node.runtime.get_inherited_value(BlockKey('problem', 'problem3_2'), 'graceperiod')),
+            datetime.timedelta(hours=2)
+        )
+        with self.assertRaises(KeyError):
+            node.runtime.get_inherited_value(BlockKey('problem', 'problem3_2'), 'due')
+
     def test_inheritance_not_saved(self):
         """
         Was saving inherited settings with updated blocks causing inheritance to be sticky
@@ -6,7 +6,7 @@ import copy
 import ddt
 import unittest
 from bson.objectid import ObjectId
-from mock import MagicMock, Mock, call
+from mock import ANY, MagicMock, Mock, call
 from xmodule.modulestore.split_mongo.split import SplitBulkWriteMixin
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
 
@@ -143,7 +143,7 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_structure(self.course_key, self.structure)
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertConnCalls(call.insert_structure(self.structure, self.course_key))
+        self.assertConnCalls(call.insert_structures([self.structure], self.course_key))
 
     def test_write_multiple_structures_on_close(self):
         self.conn.get_course_index.return_value = None
@@ -154,13 +154,9 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_structure(self.course_key.replace(branch='b'), other_structure)
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertItemsEqual(
-            [
-                call.insert_structure(self.structure, self.course_key),
-                call.insert_structure(other_structure, self.course_key)
-            ],
-            self.conn.mock_calls
-        )
+        self.assertEqual(len(self.conn.mock_calls), 1)
+        self.conn.insert_structures.assert_called_once_with(ANY, self.course_key)
+        self.assertItemsEqual([self.structure, other_structure], self.conn.insert_structures.call_args[0][0])
 
     def test_write_index_and_definition_on_close(self):
         original_index = {'versions': {}}
@@ -172,7 +168,7 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
         self.assertConnCalls(
-            call.insert_definition(self.definition, self.course_key),
+            call.insert_definitions([self.definition], self.course_key),
             call.update_course_index(
                 {'versions': {self.course_key.branch: self.definition['_id']}},
                 from_index=original_index,
@@ -190,17 +186,13 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_definition(self.course_key.replace(branch='b'), other_definition)
         self.bulk.insert_course_index(self.course_key, {'versions': {'a': self.definition['_id'], 'b': other_definition['_id']}})
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertItemsEqual(
-            [
-                call.insert_definition(self.definition, self.course_key),
-                call.insert_definition(other_definition, self.course_key),
-                call.update_course_index(
-                    {'versions': {'a': self.definition['_id'], 'b': other_definition['_id']}},
-                    from_index=original_index,
-                    course_context=self.course_key,
-                )
-            ],
-            self.conn.mock_calls
+        self.assertEqual(len(self.conn.mock_calls), 2)
+        self.conn.insert_definitions.assert_called_once_with(ANY, self.course_key)
+        self.assertItemsEqual([self.definition, other_definition], self.conn.insert_definitions.call_args[0][0])
+        self.conn.update_course_index.assert_called_once_with(
+            {'versions': {'a': self.definition['_id'], 'b': other_definition['_id']}},
+            from_index=original_index,
+            course_context=self.course_key,
         )
 
     def test_write_definition_on_close(self):
@@ -210,7 +202,7 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_definition(self.course_key, self.definition)
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertConnCalls(call.insert_definition(self.definition, self.course_key))
+        self.assertConnCalls(call.insert_definitions([self.definition], self.course_key))
 
     def test_write_multiple_definitions_on_close(self):
         self.conn.get_course_index.return_value = None
@@ -221,13 +213,9 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_definition(self.course_key.replace(branch='b'), other_definition)
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertItemsEqual(
-            [
-                call.insert_definition(self.definition, self.course_key),
-                call.insert_definition(other_definition, self.course_key)
-            ],
-            self.conn.mock_calls
-        )
+        self.assertEqual(len(self.conn.mock_calls), 1)
+        self.conn.insert_definitions.assert_called_once_with(ANY, self.course_key)
+        self.assertItemsEqual([self.definition, other_definition], self.conn.insert_definitions.call_args[0][0])
 
     def test_write_index_and_structure_on_close(self):
         original_index = {'versions': {}}
@@ -239,7 +227,7 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.assertConnCalls()
         self.bulk._end_bulk_operation(self.course_key)
         self.assertConnCalls(
-            call.insert_structure(self.structure, self.course_key),
+            call.insert_structures([self.structure], self.course_key),
             call.update_course_index(
                 {'versions': {self.course_key.branch: self.structure['_id']}},
                 from_index=original_index,
@@ -257,17 +245,13 @@ class TestBulkWriteMixinClosed(TestBulkWriteMixin):
         self.bulk.update_structure(self.course_key.replace(branch='b'), other_structure)
         self.bulk.insert_course_index(self.course_key, {'versions': {'a': self.structure['_id'], 'b': other_structure['_id']}})
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertItemsEqual(
-            [
-                call.insert_structure(self.structure, self.course_key),
-                call.insert_structure(other_structure, self.course_key),
-                call.update_course_index(
-                    {'versions': {'a': self.structure['_id'], 'b': other_structure['_id']}},
-                    from_index=original_index,
-                    course_context=self.course_key,
-                )
-            ],
-            self.conn.mock_calls
+        self.assertEqual(len(self.conn.mock_calls), 2)
+        self.conn.insert_structures.assert_called_once_with(ANY, self.course_key)
+        self.assertItemsEqual([self.structure, other_structure], self.conn.insert_structures.call_args[0][0])
+        self.conn.update_course_index.assert_called_once_with(
+            {'versions': {'a': self.structure['_id'], 'b': other_structure['_id']}},
+            from_index=original_index,
+            course_context=self.course_key,
         )
 
     def test_version_structure_creates_new_version(self):
@@ -457,7 +441,7 @@ class TestBulkWriteMixinFindMethods(TestBulkWriteMixin):
         self.bulk._begin_bulk_operation(self.course_key)
         self.bulk.get_definitions(self.course_key, test_ids)
         self.bulk._end_bulk_operation(self.course_key)
-        self.assertFalse(self.conn.insert_definition.called)
+        self.assertFalse(self.conn.insert_definitions.called)
 
     def test_no_bulk_find_structures_derived_from(self):
         ids = [Mock(name='id')]
@@ -713,7 +697,7 @@ class TestBulkWriteMixinOpen(TestBulkWriteMixin):
         index_copy['versions']['draft'] = index['versions']['published']
         self.bulk.update_course_index(self.course_key, index_copy)
         self.bulk._end_bulk_operation(self.course_key)
-        self.conn.insert_structure.assert_called_once_with(published_structure, self.course_key)
+        self.conn.insert_structures.assert_called_once_with([published_structure], self.course_key)
         self.conn.update_course_index.assert_called_once_with(
             index_copy,
             from_index=self.conn.get_course_index.return_value,
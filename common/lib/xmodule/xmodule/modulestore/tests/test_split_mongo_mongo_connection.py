@@ -1,7 +1,15 @@
 """ Test the behavior of split_mongo/MongoConnection """
+import cPickle as pickle
+import os
+import shutil
+import tempfile
+import time
 import unittest
-from mock import patch
-from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
+from mock import Mock, patch
+from pymongo.errors import BulkWriteError
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    CourseStructureCache, MmapStructureStore, MongoConnection, StructureLRUCache, _insert_many_skipping_duplicates
+)
 from xmodule.exceptions import HeartbeatFailure
 
 
@@ -17,3 +25,162 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
             with self.assertRaises(HeartbeatFailure):
                 useless_conn.heartbeat()
+
+
+class TestInsertManySkippingDuplicates(unittest.TestCase):
+    """ Test the batched inserts of structures and definitions """
+    def setUp(self):
+        super(TestInsertManySkippingDuplicates, self).setUp()
+        self.collection = Mock(name='collection')
+        self.documents = [{'_id': 1}, {'_id': 2}]
+
+    def test_insert(self):
+        _insert_many_skipping_duplicates(self.collection, self.documents)
+        self.collection.insert_many.assert_called_once_with(self.documents, ordered=False)
+
+    def test_duplicates_skipped(self):
+        self.collection.insert_many.side_effect = BulkWriteError({'writeErrors': [{'code': 11000, 'index': 0}]})
+        _insert_many_skipping_duplicates(self.collection, self.documents)
+
+    def test_other_errors_raised(self):
+        self.collection.insert_many.side_effect = BulkWriteError(
+            {'writeErrors': [{'code': 11000, 'index': 0}, {'code': 2, 'index': 1}]}
+        )
+        with self.assertRaises(BulkWriteError):
+            _insert_many_skipping_duplicates(self.collection, self.documents)
+
+
+class TestStructureLRUCache(unittest.TestCase):
+    """ Test the size-bounded eviction of the process-local structure cache """
+    def setUp(self):
+        super(TestStructureLRUCache, self).setUp()
+        self.size = len(self._pickle('a'))
+        # Room for two structures, but not three
+        self.cache = StructureLRUCache(max_size=self.size * 5 / 2)
+
+    def _pickle(self, key):
+        """ Returns a pickled structure """
+        return pickle.dumps({'_id': key, 'blocks': {}}, pickle.HIGHEST_PROTOCOL)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get('missing'))
+
+    def test_set_and_get(self):
+        self.cache.set('a', self._pickle('a'))
+        self.assertEqual(self.cache.get('a'), {'_id': 'a', 'blocks': {}})
+        self.assertEqual(self.cache.current_size, self.size)
+
+    def test_get_returns_copies(self):
+        self.cache.set('a', self._pickle('a'))
+        structure = self.cache.get('a')
+        structure['blocks']['block'] = 'changed'
+        self.assertIsNot(self.cache.get('a'), structure)
+        self.assertEqual(self.cache.get('a'), {'_id': 'a', 'blocks': {}})
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set('a', self._pickle('a'))
+        self.cache.set('b', self._pickle('b'))
+        # Touch 'a', so that 'b' is the least recently used
+        self.cache.get('a')
+        self.cache.set('c', self._pickle('c'))
+
+        self.assertIn('a', self.cache)
+        self.assertNotIn('b', self.cache)
+        self.assertIn('c', self.cache)
+        self.assertEqual(self.cache.current_size, self.size * 2)
+
+    def test_replace_entry(self):
+        self.cache.set('a', self._pickle('a'))
+        self.cache.set('a', self._pickle('a'))
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.current_size, self.size)
+
+    def test_oversized_structure_not_cached(self):
+        self.cache.set('a', self._pickle('a'))
+        self.cache.set('huge', pickle.dumps({'_id': 'huge', 'blocks': {'block': 'x' * self.size * 3}}))
+        self.assertNotIn('huge', self.cache)
+        self.assertIn('a', self.cache)
+
+    def test_clear(self):
+        self.cache.set('a', self._pickle('a'))
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.current_size, 0)
+
+
+class TestMmapStructureStore(unittest.TestCase):
+    """ Test the host-wide store of memory-mapped structures """
+    def setUp(self):
+        super(TestMmapStructureStore, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.store = MmapStructureStore(os.path.join(self.directory, 'structures'))
+
+    def test_get_missing(self):
+        self.assertEqual(self.store.get('missing'), (None, 0))
+
+    def test_set_and_get(self):
+        structure = {'_id': 'a', 'blocks': {'block': [1, 2, 3]}}
+        pickled_data = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
+        self.store.set('a', pickled_data)
+        self.assertIn('a', self.store)
+        self.assertEqual(self.store.get('a'), (structure, len(pickled_data)))
+        # Another store on the same directory sees the same structures
+        self.assertEqual(MmapStructureStore(self.store.directory).get('a')[0], structure)
+
+    def test_not_overwritten(self):
+        self.store.set('a', pickle.dumps({'_id': 'a'}))
+        self.store.set('a', pickle.dumps({'_id': 'b'}))
+        self.assertEqual(self.store.get('a')[0], {'_id': 'a'})
+        self.assertEqual(os.listdir(self.store.directory), ['a.pickle'])
+
+    def test_failed_write_removes_temp_file(self):
+        with patch('os.rename', side_effect=OSError):
+            self.store.set('a', pickle.dumps({'_id': 'a'}))
+        self.assertNotIn('a', self.store)
+        self.assertEqual(os.listdir(self.store.directory), [])
+
+    def test_corrupt_file(self):
+        pickled_data = pickle.dumps({'_id': 'a', 'blocks': {'block': [1, 2, 3]}}, pickle.HIGHEST_PROTOCOL)
+        self.store.set('a', pickled_data[:len(pickled_data) / 2])
+        self.assertEqual(self.store.get('a'), (None, 0))
+        # The corrupt file is deleted, so that the structure can be stored again
+        self.assertNotIn('a', self.store)
+
+    def test_prune(self):
+        pickled_data = pickle.dumps({'_id': 'a'})
+        self.store.max_size = len(pickled_data) * 2
+        for age, key in enumerate(['c', 'b', 'a']):
+            self.store.set(key, pickled_data)
+            mtime = time.time() - (3 - age) * 10
+            os.utime(self.store._path(key), (mtime, mtime))  # pylint: disable=protected-access
+        self.assertEqual(sorted(os.listdir(self.store.directory)), ['a.pickle', 'b.pickle'])
+
+    def test_prune_stale_temp_files(self):
+        stale_path = os.path.join(self.store.directory, 'stale.tmp')
+        fresh_path = os.path.join(self.store.directory, 'fresh.tmp')
+        for path in (stale_path, fresh_path):
+            open(path, 'wb').close()
+        mtime = time.time() - MmapStructureStore.TEMP_FILE_MAX_AGE - 1
+        os.utime(stale_path, (mtime, mtime))
+        self.store.prune()
+        self.assertEqual(os.listdir(self.store.directory), ['fresh.tmp'])
+
+    def test_get_refreshes_mtime(self):
+        self.store.set('a', pickle.dumps({'_id': 'a'}))
+        path = self.store._path('a')  # pylint: disable=protected-access
+        mtime = time.time() - MmapStructureStore.TOUCH_INTERVAL - 1
+        os.utime(path, (mtime, mtime))
+        self.store.get('a')
+        self.assertGreater(os.stat(path).st_mtime, mtime)
+
+    def test_course_structure_cache(self):
+        lru_cache = StructureLRUCache(max_size=1024 * 1024)
+        cache = CourseStructureCache(lru_cache=lru_cache, mmap_store=self.store)
+        cache.set('a', {'_id': 'a'})
+        self.assertIn('a', self.store)
+
+        lru_cache.clear()
+        self.assertEqual(cache.get('a'), {'_id': 'a'})
+        # Structures read from the shared files aren't copied into the process-local cache
+        self.assertNotIn('a', lru_cache)
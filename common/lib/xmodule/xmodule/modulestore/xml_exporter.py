@@ -3,7 +3,10 @@ Methods for exporting course data to XML
 """
 
 import logging
+import tarfile
+import time
 from abc import abstractmethod
+from cStringIO import StringIO
 import lxml.etree
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
 from xmodule.contentstore.content import StaticContent
@@ -13,9 +16,9 @@ from xmodule.modulestore import EdxJSONEncoder, ModuleStoreEnum
 from xmodule.modulestore.inheritance import own_metadata
 from xmodule.modulestore.store_utilities import draft_node_constructor, get_draft_subtree_roots
 from xmodule.modulestore import LIBRARY_ROOT
+from fs.memoryfs import MemoryFS
 from fs.osfs import OSFS
 from json import dumps
-import os
 
 from xmodule.modulestore.draft_and_published import DIRECT_ONLY_CATEGORIES
 from opaque_keys.edx.locator import CourseLocator, LibraryLocator
@@ -104,7 +107,7 @@ class ExportManager(object):
     """
     Manages XML exporting for courselike objects.
     """
-    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir):
+    def __init__(self, modulestore, contentstore, courselike_key, root_dir, target_dir, tar_file=None):
         """
         Export all modules from `modulestore` and content from `contentstore` as xml to `root_dir`.
 
@@ -113,12 +116,16 @@ class ExportManager(object):
         `courselike_key`: The Locator of the Descriptor to export
         `root_dir`: The directory to write the exported xml to
         `target_dir`: The name of the directory inside `root_dir` to write the content to
+        `tar_file`: If given, a `tarfile.TarFile` to write the export to (under `target_dir`) instead
+            of `root_dir`. The xml is built in memory, and the static assets are streamed from
+            `contentstore` straight into the tar file.
         """
         self.modulestore = modulestore
         self.contentstore = contentstore
         self.courselike_key = courselike_key
         self.root_dir = root_dir
         self.target_dir = target_dir
+        self.tar_file = tar_file
 
     @abstractmethod
     def get_key(self):
@@ -148,13 +155,37 @@ class ExportManager(object):
         Get the target courselike object for this export.
         """
 
+    def export_static_assets(self, export_fs):
+        """
+        Export the static assets in the contentstore to the static directory, and their
+        attributes to policies/assets.json.
+        """
+        if self.tar_file is None:
+            root_courselike_dir = self.root_dir + '/' + self.target_dir
+            self.contentstore.export_all_for_course(
+                self.courselike_key,
+                root_courselike_dir + '/static/',
+                root_courselike_dir + '/policies/assets.json',
+            )
+        else:
+            policy = self.contentstore.export_all_for_course_to_tar(
+                self.courselike_key,
+                self.tar_file,
+                self.target_dir + '/static',
+            )
+            with export_fs.open('policies/assets.json', 'w') as assets_policy:
+                assets_policy.write(dumps(policy, sort_keys=True, indent=4))
+
     def export(self):
         """
         Perform the export given the parameters handed to this class at init.
         """
         with self.modulestore.bulk_operations(self.courselike_key):
 
-            fsm = OSFS(self.root_dir)
+            if self.tar_file is None:
+                fsm = OSFS(self.root_dir)
+            else:
+                fsm = MemoryFS()
             root = lxml.etree.Element('unknown')
 
             # export only the published content
@@ -171,12 +202,18 @@ class ExportManager(object):
             self.process_root(root, export_fs)
 
             # Process extra items-- drafts, assets, etc
-            root_courselike_dir = self.root_dir + '/' + self.target_dir
+            if self.tar_file is None:
+                root_courselike_dir = self.root_dir + '/' + self.target_dir
+            else:
+                root_courselike_dir = None
             self.process_extra(root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs)
 
             # Any last pass adjustments
             self.post_process(root, export_fs)
 
+            if self.tar_file is not None:
+                _add_fs_to_tar(fsm, self.tar_file)
+
 
 class CourseExportManager(ExportManager):
     """
@@ -201,26 +238,20 @@ class CourseExportManager(ExportManager):
 
     def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
         # Export the modulestore's asset metadata.
-        asset_dir = root_courselike_dir + '/' + AssetMetadata.EXPORTED_ASSET_DIR + '/'
-        if not os.path.isdir(asset_dir):
-            os.makedirs(asset_dir)
+        asset_dir = export_fs.makeopendir(AssetMetadata.EXPORTED_ASSET_DIR)
         asset_root = lxml.etree.Element(AssetMetadata.ALL_ASSETS_XML_TAG)
         course_assets = self.modulestore.get_all_asset_metadata(self.courselike_key, None)
         for asset_md in course_assets:
             # All asset types are exported using the "asset" tag - but their asset type is specified in each asset key.
             asset = lxml.etree.SubElement(asset_root, AssetMetadata.ASSET_XML_TAG)
             asset_md.to_xml(asset)
-        with OSFS(asset_dir).open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'w') as asset_xml_file:
+        with asset_dir.open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'w') as asset_xml_file:
             lxml.etree.ElementTree(asset_root).write(asset_xml_file)
 
         # export the static assets
         policies_dir = export_fs.makeopendir('policies')
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                root_courselike_dir + '/static/',
-                root_courselike_dir + '/policies/assets.json',
-            )
+            self.export_static_assets(export_fs)
 
             # If we are using the default course image, export it to the
             # legacy location to support backwards compatibility.
@@ -235,10 +266,8 @@ class CourseExportManager(ExportManager):
                 except NotFoundError:
                     pass
                 else:
-                    output_dir = root_courselike_dir + '/static/images/'
-                    if not os.path.isdir(output_dir):
-                        os.makedirs(output_dir)
-                    with OSFS(output_dir).open('course_image.jpg', 'wb') as course_image_file:
+                    output_dir = export_fs.makeopendir('static/images', recursive=True)
+                    with output_dir.open('course_image.jpg', 'wb') as course_image_file:
                         course_image_file.write(course_image.data)
 
         # export the static tabs
@@ -318,11 +347,7 @@ class LibraryExportManager(ExportManager):
         export_fs.makeopendir('policies')
 
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                self.root_dir + '/' + self.target_dir + '/static/',
-                self.root_dir + '/' + self.target_dir + '/policies/assets.json',
-            )
+            self.export_static_assets(export_fs)
 
     def post_process(self, root, export_fs):
         """
@@ -351,6 +376,43 @@ def export_library_to_xml(modulestore, contentstore, library_key, root_dir, libr
     LibraryExportManager(modulestore, contentstore, library_key, root_dir, library_dir).export()
 
 
+def export_course_to_tar(modulestore, contentstore, course_key, course_dir, tar_file):
+    """
+    Thin wrapper for the Course Export Manager, which exports the course into the course_dir
+    directory of tar_file. See ExportManager for details.
+    """
+    CourseExportManager(modulestore, contentstore, course_key, None, course_dir, tar_file=tar_file).export()
+
+
+def export_library_to_tar(modulestore, contentstore, library_key, library_dir, tar_file):
+    """
+    Thin wrapper for the Library Export Manager, which exports the library into the library_dir
+    directory of tar_file. See ExportManager for details.
+    """
+    LibraryExportManager(modulestore, contentstore, library_key, None, library_dir, tar_file=tar_file).export()
+
+
+def _add_fs_to_tar(export_fs, tar_file):
+    """
+    Write the directories and files of export_fs to tar_file.
+    """
+    mtime = time.time()
+    for dir_path, file_names in export_fs.walk():
+        if dir_path != '/':
+            dir_info = tarfile.TarInfo(dir_path.lstrip('/'))
+            dir_info.type = tarfile.DIRTYPE
+            dir_info.mode = 0755
+            dir_info.mtime = mtime
+            tar_file.addfile(dir_info)
+        for file_name in file_names:
+            file_path = dir_path.rstrip('/') + '/' + file_name
+            data = export_fs.getcontents(file_path)
+            file_info = tarfile.TarInfo(file_path.lstrip('/'))
+            file_info.size = len(data)
+            file_info.mtime = mtime
+            tar_file.addfile(file_info, StringIO(data))
+
+
 def adapt_references(subtree, destination_course_key, export_fs):
     """
     Map every reference in the subtree into destination_course_key and set it back into the xblock fields
@@ -20,8 +20,11 @@ Modulestore virtual   |          XML physical (draft, published)
              (a, a)   |  (a, a) | (x, a) | (x, x) | (x, y) | (a, x)
              (a, b)   |  (a, b) | (x, b) | (x, x) | (x, y) | (a, x)
 """
+import itertools
 import logging
+import sys
 from abc import abstractmethod
+from multiprocessing.pool import ThreadPool
 from opaque_keys.edx.locator import LibraryLocator
 import os
 import mimetypes
@@ -57,8 +60,16 @@ log = logging.getLogger(__name__)
 
 def import_static_content(
         course_data_path, static_content_store,
-        target_id, subpath='static', verbose=False):
+        target_id, subpath='static', verbose=False, pool=None):
+    """
+    Import the static files in the given subpath of course_data_path into
+    static_content_store, and return a dict mapping their paths within the
+    subpath to their asset keys.
 
+    If a multiprocessing ThreadPool is given, the files are read and saved by
+    its threads. Their results and errors are still handled in the order in
+    which the files are found, so that the import is reported the same way.
+    """
     remap_dict = {}
 
     # now import all static assets
@@ -66,7 +77,7 @@ def import_static_content(
     try:
         with open(course_data_path / 'policies/assets.json') as f:
             policy = json.load(f)
-    except (IOError, ValueError) as err:
+    except (IOError, ValueError):
         # xml backed courses won't have this file, only exported courses;
         # so, its absence is not really an exception.
         policy = {}
@@ -77,71 +88,100 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
-    for dirname, _, filenames in os.walk(static_dir):
-        for filename in filenames:
+    def static_files():
+        """
+        Yields the path and name of each static file to import.
+        """
+        for dirname, _, filenames in os.walk(static_dir):
+            for filename in filenames:
 
-            content_path = os.path.join(dirname, filename)
+                content_path = os.path.join(dirname, filename)
+
+                if re.match(ASSET_IGNORE_REGEX, filename):
+                    if verbose:
+                        log.debug('skipping static content %s...', content_path)
+                    continue
 
-            if re.match(ASSET_IGNORE_REGEX, filename):
                 if verbose:
-                    log.debug('skipping static content %s...', content_path)
-                continue
+                    log.debug('importing static content %s...', content_path)
 
-            if verbose:
-                log.debug('importing static content %s...', content_path)
+                yield content_path, filename
 
-            try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
-                if filename.startswith('._'):
-                    # OS X "companion files". See
-                    # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
-                    continue
-                # Not a 'hidden file', then re-raise exception
-                raise
+    def import_file(static_file):
+        """
+        Saves the given static file to the content store.
 
-            # strip away leading path from the name
-            fullname_with_subpath = content_path.replace(static_dir, '')
-            if fullname_with_subpath.startswith('/'):
-                fullname_with_subpath = fullname_with_subpath[1:]
-            asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+        Returns None if the file is skipped, otherwise a tuple of its path within the subpath,
+        its asset key and the exc_info of the error saving it (or None).
+        """
+        content_path, filename = static_file
+        try:
+            with open(content_path, 'rb') as f:
+                data = f.read()
+        except IOError:
+            if filename.startswith('._'):
+                # OS X "companion files". See
+                # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
+                return None
+            # Not a 'hidden file', then re-raise exception
+            raise
+
+        # strip away leading path from the name
+        fullname_with_subpath = content_path.replace(static_dir, '')
+        if fullname_with_subpath.startswith('/'):
+            fullname_with_subpath = fullname_with_subpath[1:]
+        asset_key = StaticContent.compute_location(target_id, fullname_with_subpath)
+
+        policy_ele = policy.get(asset_key.path, {})
+
+        # During export display name is used to create files, strip away slashes from name
+        displayname = escape_invalid_characters(
+            name=policy_ele.get('displayname', filename),
+            invalid_char_list=['/', '\\']
+        )
+        locked = policy_ele.get('locked', False)
+        mime_type = policy_ele.get('contentType')
+
+        # Check extracted contentType in list of all valid mimetypes
+        if not mime_type or mime_type not in mimetypes_list:
+            mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
+        content = StaticContent(
+            asset_key, displayname, mime_type, data,
+            import_path=fullname_with_subpath, locked=locked
+        )
 
-            policy_ele = policy.get(asset_key.path, {})
+        # first let's save a thumbnail so we can get back a thumbnail location
+        thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
 
-            # During export display name is used to create files, strip away slashes from name
-            displayname = escape_invalid_characters(
-                name=policy_ele.get('displayname', filename),
-                invalid_char_list=['/', '\\']
-            )
-            locked = policy_ele.get('locked', False)
-            mime_type = policy_ele.get('contentType')
-
-            # Check extracted contentType in list of all valid mimetypes
-            if not mime_type or mime_type not in mimetypes_list:
-                mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
+        if thumbnail_content is not None:
+            content.thumbnail_location = thumbnail_location
 
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+        # then commit the content
+        try:
+            static_content_store.save(content)
+        except Exception:  # pylint: disable=broad-except
+            return fullname_with_subpath, asset_key, sys.exc_info()
 
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
+        return fullname_with_subpath, asset_key, None
 
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
+    if pool is None:
+        results = itertools.imap(import_file, static_files())
+    else:
+        results = pool.imap(import_file, static_files())
+
+    for result in results:
+        if result is None:
+            continue
+        fullname_with_subpath, asset_key, save_error = result
+        if save_error is not None:
+            log.error(
+                u'Error importing {0}, error={1}'.format(fullname_with_subpath, save_error[1]),
+                exc_info=save_error
+            )
 
-            # store the remapping information which will be needed
-            # to subsitute in the module data
-            remap_dict[fullname_with_subpath] = asset_key
+        # store the remapping information which will be needed
+        # to subsitute in the module data
+        remap_dict[fullname_with_subpath] = asset_key
 
     return remap_dict
 
@@ -177,6 +217,10 @@ class ImportManager(object):
         create_if_not_present: If True, then a new courselike is created if it doesn't already exist.
             Otherwise, it throws an InvalidLocationError if the courselike does not exist.
 
+        static_import_threads: If greater than 0, the static files are imported into static_content_store
+            by this many threads while the courselike's blocks are imported into the store by the
+            importing thread. Otherwise, the static files are imported before the blocks.
+
         default_class, load_error_modules: are arguments for constructing the XMLModuleStore (see its doc)
     """
     store_class = XMLModuleStore
@@ -187,7 +231,7 @@ class ImportManager(object):
             load_error_modules=True, static_content_store=None,
             target_id=None, verbose=False,
             do_import_static=True, create_if_not_present=False,
-            raise_on_failure=False
+            raise_on_failure=False, static_import_threads=0
     ):
         self.store = store
         self.user_id = user_id
@@ -200,6 +244,7 @@ class ImportManager(object):
         self.do_import_static = do_import_static
         self.create_if_not_present = create_if_not_present
         self.raise_on_failure = raise_on_failure
+        self.static_import_threads = static_import_threads
         self.xml_module_store = self.store_class(
             data_dir,
             default_class=default_class,
@@ -220,15 +265,16 @@ class ImportManager(object):
         if self.target_id:
             assert len(self.xml_module_store.modules) == 1
 
-    def import_static(self, data_path, dest_id):
+    def import_static(self, data_path, dest_id, pool=None):
         """
-        Import all static items into the content store.
+        Import all static items into the content store, using the threads of
+        the given ThreadPool if there is one.
         """
         if self.static_content_store is not None and self.do_import_static:
             # first pass to find everything in /static/
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath='static', verbose=self.verbose
+                dest_id, subpath='static', verbose=self.verbose, pool=pool
             )
 
         elif self.verbose and not self.do_import_static:
@@ -251,7 +297,7 @@ class ImportManager(object):
         if os.path.exists(data_path / simport):
             import_static_content(
                 data_path, self.static_content_store,
-                dest_id, subpath=simport, verbose=self.verbose
+                dest_id, subpath=simport, verbose=self.verbose, pool=pool
             )
 
     def import_asset_metadata(self, data_dir, course_id):
@@ -428,36 +474,58 @@ class ImportManager(object):
         Iterate over the given directories and yield courses.
         """
         self.preflight()
-        for courselike_key in self.xml_module_store.modules.keys():
-            try:
-                dest_id, runtime = self.get_dest_id(courselike_key)
-            except DuplicateCourseError:
-                continue
-
-            # This bulk operation wraps all the operations to populate the published branch.
-            with self.store.bulk_operations(dest_id):
-                # Retrieve the course itself.
-                source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
-
-                # Import all static pieces.
-                self.import_static(data_path, dest_id)
-
-                # Import asset metadata stored in XML.
-                self.import_asset_metadata(data_path, dest_id)
-
-                # Import all children
-                self.import_children(source_courselike, courselike, courselike_key, dest_id)
+        if self.static_import_threads > 0:
+            # One more thread than static_import_threads, which walks the static files and
+            # waits for the others to import them.
+            pool = ThreadPool(self.static_import_threads + 1)
+        else:
+            pool = None
+        try:
+            for courselike_key in self.xml_module_store.modules.keys():
+                try:
+                    dest_id, runtime = self.get_dest_id(courselike_key)
+                except DuplicateCourseError:
+                    continue
 
-            # This bulk operation wraps all the operations to populate the draft branch with any items
-            # from the /drafts subdirectory.
-            # Drafts must be imported in a separate bulk operation from published items to import properly,
-            # due to the recursive_build() above creating a draft item for each course block
-            # and then publishing it.
-            with self.store.bulk_operations(dest_id):
-                # Import all draft items into the courselike.
-                courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
+                # This bulk operation wraps all the operations to populate the published branch.
+                with self.store.bulk_operations(dest_id):
+                    # Retrieve the course itself.
+                    source_courselike, courselike, data_path = self.get_courselike(courselike_key, runtime, dest_id)
 
-            yield courselike
+                    # Import all static pieces, in the background while the children are
+                    # imported if there are threads for it.
+                    if pool is None:
+                        self.import_static(data_path, dest_id)
+                        static_import = None
+                    else:
+                        static_import = pool.apply_async(self.import_static, (data_path, dest_id), {'pool': pool})
+
+                    # Import asset metadata stored in XML.
+                    self.import_asset_metadata(data_path, dest_id)
+
+                    # Import all children
+                    self.import_children(source_courselike, courselike, courselike_key, dest_id)
+
+                    if static_import is not None:
+                        # Re-raises any error importing the static pieces.
+                        static_import.get()
+
+                # This bulk operation wraps all the operations to populate the draft branch with any items
+                # from the /drafts subdirectory.
+                # Drafts must be imported in a separate bulk operation from published items to import properly,
+                # due to the recursive_build() above creating a draft item for each course block
+                # and then publishing it.
+                with self.store.bulk_operations(dest_id):
+                    # Import all draft items into the courselike.
+                    courselike = self.import_drafts(courselike, courselike_key, data_path, dest_id)
+
+                yield courselike
+        finally:
+            if pool is not None:
+                # Let any static import which is still running finish (e.g. if importing
+                # the children failed) before stopping the threads.
+                pool.close()
+                pool.join()
 
 
 class CourseImportManager(ImportManager):
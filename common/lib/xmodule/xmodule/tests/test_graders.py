@@ -237,6 +237,54 @@ class GraderTest(unittest.TestCase):
         self.assertEqual(len(graded['section_breakdown']), 0)
         self.assertEqual(len(graded['grade_breakdown']), 0)
 
+    def _grade_sheet_matrix(self, *grade_sheets):
+        """
+        Returns a GradeSheetMatrix of the given grade sheets, whose
+        subsections are those of test_gradesheet.
+        """
+        sections = [
+            (section_format, name)
+            for section_format, subsection_grades in sorted(self.test_gradesheet.iteritems())
+            for name in sorted(subsection_grades)
+        ]
+        earned = []
+        possible = []
+        for grade_sheet in grade_sheets:
+            totals = [
+                grade_sheet.get(section_format, {}).get(name, self.MockGrade(AggregatedScore(0, 0, True, False), name))
+                for section_format, name in sections
+            ]
+            earned.append([total.graded_total.earned for total in totals])
+            possible.append([total.graded_total.possible for total in totals])
+        return graders.GradeSheetMatrix([section_format for section_format, _ in sections], earned, possible)
+
+    def test_grade_batch(self):
+        weighted_grader = graders.WeightedSubsectionsGrader([
+            (graders.AssignmentFormatGrader("Homework", 12, 2), "Homework", 0.25),
+            (graders.AssignmentFormatGrader("Lab", 7, 3), "Lab", 0.25),
+            (graders.AssignmentFormatGrader("Midterm", 1, 0), "Midterm", 0.5),
+        ])
+        grade_sheets = [self.test_gradesheet, self.empty_gradesheet, self.incomplete_gradesheet]
+
+        graded = weighted_grader.grade_batch(self._grade_sheet_matrix(*grade_sheets))
+        self.assertEqual(
+            list(graded['percent']),
+            [weighted_grader.grade(grade_sheet)['percent'] for grade_sheet in grade_sheets],
+        )
+        self.assertAlmostEqual(graded['percent'][0], 0.5106547619047619)
+        self.assertEqual(graded['grade_breakdown'].keys(), ["Homework", "Lab", "Midterm"])
+        self.assertAlmostEqual(graded['grade_breakdown']["Midterm"][0], 0.2525)
+
+    def test_aggregate_score_matrix(self):
+        earned, possible = graders.aggregate_score_matrix(
+            [[1, 2, 3, 4], [0, 1, 0, 1]],
+            [[2, 2, 4, 4], [2, 2, 4, 4]],
+            [0, None, 1, 0],
+            2,
+        )
+        self.assertEqual([list(row) for row in earned], [[5, 3], [1, 0]])
+        self.assertEqual([list(row) for row in possible], [[6, 4], [6, 4]])
+
     def test_grader_from_conf(self):
 
         # Confs always produce a graders.WeightedSubsectionsGrader, so we test this by repeating the test
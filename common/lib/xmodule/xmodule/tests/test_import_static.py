@@ -2,6 +2,8 @@
 Tests that check that we ignore the appropriate files when importing courses.
 """
 import unittest
+from multiprocessing.pool import ThreadPool
+
 from mock import Mock
 from xmodule.modulestore.xml_importer import import_static_content
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
@@ -39,3 +41,36 @@ class IgnoredFilesTestCase(unittest.TestCase):
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+    def test_import_with_thread_pool(self):
+        """
+        Test that importing static files with a thread pool saves and remaps the same files
+        """
+        course_dir = DATA_DIR / "dot-underscore"
+        course_id = SlashSeparatedCourseKey("edX", "dot-underscore", "2014_Fall")
+        results = []
+        for pool in (None, ThreadPool(4)):
+            content_store = Mock()
+            content_store.generate_thumbnail.return_value = ("content", "location")
+            remap_dict = import_static_content(course_dir, content_store, course_id, pool=pool)
+            saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
+            results.append((remap_dict, sorted((sc.name, sc.data) for sc in saved_static_content)))
+        pool.close()
+        pool.join()
+        self.assertEqual(results[0], results[1])
+        self.assertIn("example.txt", results[1][0])
+
+    def test_save_errors_with_thread_pool(self):
+        """
+        Test that errors saving static files are logged rather than raised
+        """
+        course_dir = DATA_DIR / "tilde"
+        course_id = SlashSeparatedCourseKey("edX", "tilde", "Fall_2012")
+        content_store = Mock()
+        content_store.generate_thumbnail.return_value = ("content", "location")
+        content_store.save.side_effect = Exception("save failed")
+        pool = ThreadPool(2)
+        remap_dict = import_static_content(course_dir, content_store, course_id, pool=pool)
+        pool.close()
+        pool.join()
+        self.assertIn("example.txt", remap_dict)
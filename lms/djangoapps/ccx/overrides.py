@@ -49,6 +49,15 @@ class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
             return get_override_for_ccx(ccx, block, name, default)
         return default
 
+    def get_overrides(self, course_key):
+        """
+        Returns the overrides of the ccx, if the course is one.
+        """
+        ccx = get_current_ccx(course_key)
+        if ccx:
+            return _get_overrides_for_ccx(ccx)
+        return {}
+
     @classmethod
     def enabled_for(cls, block):
         """
@@ -126,7 +135,9 @@ def _get_overrides_for_ccx(ccx):
     overrides_cache = request_cache.get_cache('ccx-overrides')
 
     if ccx not in overrides_cache:
-        overrides = {}
+        # The course_edit_method of every block is hardcoded to None (see
+        # get_override_for_ccx), which the None key holds for get_overrides.
+        overrides = {None: {'course_edit_method': None}}
         query = CcxFieldOverride.objects.filter(
             ccx=ccx,
         )
@@ -24,6 +24,7 @@ class BlocksAPITransformer(BlockStructureTransformer):
 
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUBTREE_LOCAL_COLLECT = True
     STUDENT_VIEW_DATA = 'student_view_data'
     STUDENT_VIEW_MULTI_DEVICE = 'student_view_multi_device'
 
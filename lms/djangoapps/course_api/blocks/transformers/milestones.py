@@ -18,6 +18,7 @@ class MilestonesTransformer(FilteringTransformerMixin, BlockStructureTransformer
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUBTREE_LOCAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -5,6 +5,7 @@ get_course_blocks function.
 from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 
+from . import transformed_cache
 from .transformers import (
     library_content,
     start_date,
@@ -59,13 +60,30 @@ def get_course_blocks(
             transformers, the transformed block structure will be
             exactly equivalent to the blocks that the given user has
             access.
+
+    If the transformed_cache is enabled, block structures transformed
+    by the default transformers are cached per user.
     """
-    if not transformers:
+    def _transform():
+        """
+        Returns the block structure transformed by the transformers.
+        """
+        return get_block_structure_manager(starting_block_usage_key.course_key).get_transformed(
+            transformers,
+            starting_block_usage_key,
+            collected_block_structure,
+        )
+
+    use_default_transformers = not transformers
+    if use_default_transformers:
         transformers = BlockStructureTransformers(COURSE_BLOCK_ACCESS_TRANSFORMERS)
     transformers.usage_info = CourseUsageInfo(starting_block_usage_key.course_key, user)
 
-    return get_block_structure_manager(starting_block_usage_key.course_key).get_transformed(
-        transformers,
-        starting_block_usage_key,
-        collected_block_structure,
-    )
+    if use_default_transformers and transformed_cache.is_enabled():
+        return transformed_cache.get_transformed(
+            user,
+            starting_block_usage_key,
+            COURSE_BLOCK_ACCESS_TRANSFORMERS,
+            _transform,
+        )
+    return _transform()
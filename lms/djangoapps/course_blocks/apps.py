@@ -0,0 +1,22 @@
+"""
+Course Blocks Application Configuration
+
+Signal handlers are connected here.
+"""
+
+from django.apps import AppConfig
+
+
+class CourseBlocksConfig(AppConfig):
+    """
+    Application Configuration for Course Blocks.
+    """
+    name = u'lms.djangoapps.course_blocks'
+
+    def ready(self):
+        """
+        Connect handlers to invalidate cached transformed block structures.
+        """
+        # Can't import models at module level in AppConfigs, and models get
+        # included from the signal handlers
+        from . import signals  # pylint: disable=unused-variable
@@ -0,0 +1,33 @@
+"""
+Signal handlers for invalidating the cache of transformed block
+structures when a user's access to course content changes.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from openedx.core.djangoapps.course_groups.models import CohortMembership
+from student.models import CourseAccessRole, ENROLL_STATUS_CHANGE
+
+from . import transformed_cache
+
+
+@receiver(post_save, sender=CourseAccessRole)
+@receiver(post_delete, sender=CourseAccessRole)
+@receiver(post_save, sender=CohortMembership)
+@receiver(post_delete, sender=CohortMembership)
+def _invalidate_on_membership_change(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the user's transformed block structures when their
+    course roles or cohorts change.
+    """
+    transformed_cache.invalidate_user(instance.user_id)
+
+
+@receiver(ENROLL_STATUS_CHANGE)
+def _invalidate_on_enrollment_change(sender, user=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidates the user's transformed block structures when their
+    enrollment changes.
+    """
+    if user is not None:
+        transformed_cache.invalidate_user(user.id)
@@ -0,0 +1,88 @@
+"""
+Tests for transformed_cache.py
+"""
+import ddt
+from mock import patch
+from nose.plugins.attrib import attr
+
+from courseware.masquerade import CourseMasquerade
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
+from openedx.core.djangolib.testing.waffle_utils import override_switch
+from student.roles import CourseStaffRole
+from student.tests.factories import UserFactory
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+from ..api import get_course_blocks
+from ..transformed_cache import CACHE_TRANSFORMED_BLOCKS
+
+
+@attr(shard=2)
+@ddt.ddt
+class TestTransformedCache(ModuleStoreTestCase):
+    """
+    Tests for the cache of transformed block structures.
+    """
+    def setUp(self):
+        super(TestTransformedCache, self).setUp()
+        self.user = UserFactory.create()
+        self.course = CourseFactory.create(default_store=ModuleStoreEnum.Type.split)
+        self.chapter = ItemFactory.create(parent=self.course, category='chapter')
+        self.staff_only_chapter = ItemFactory.create(
+            parent=self.course,
+            category='chapter',
+            visible_to_staff_only=True,
+        )
+
+    def _get_course_blocks(self, user=None, **kwargs):
+        """
+        Returns the user's course blocks and the number of times the
+        blocks were transformed.
+        """
+        with patch(
+            'lms.djangoapps.course_blocks.api.get_block_structure_manager',
+            wraps=get_block_structure_manager,
+        ) as mock_get_manager:
+            block_structure = get_course_blocks(user or self.user, self.course.location, **kwargs)
+        return block_structure, mock_get_manager.call_count
+
+    @ddt.data(True, False)
+    def test_cache(self, enabled):
+        with override_switch(CACHE_TRANSFORMED_BLOCKS, active=enabled):
+            block_structure, _ = self._get_course_blocks()
+            cached_block_structure, num_transforms = self._get_course_blocks()
+
+        self.assertEquals(num_transforms, 0 if enabled else 1)
+        self.assertEquals(set(cached_block_structure), set(block_structure))
+        self.assertIn(self.chapter.location, cached_block_structure)
+        self.assertNotIn(self.staff_only_chapter.location, cached_block_structure)
+
+    def test_cached_per_user(self):
+        with override_switch(CACHE_TRANSFORMED_BLOCKS, active=True):
+            self._get_course_blocks()
+            _, num_transforms = self._get_course_blocks(user=UserFactory.create())
+        self.assertEquals(num_transforms, 1)
+
+    def test_invalidated_on_role_change(self):
+        with override_switch(CACHE_TRANSFORMED_BLOCKS, active=True):
+            self._get_course_blocks()
+            CourseStaffRole(self.course.id).add_users(self.user)
+            block_structure, num_transforms = self._get_course_blocks()
+
+        self.assertEquals(num_transforms, 1)
+        self.assertIn(self.staff_only_chapter.location, block_structure)
+
+    def test_not_cached_when_masquerading(self):
+        self.user.masquerade_settings = {self.course.id: CourseMasquerade(self.course.id, role='student')}
+        with override_switch(CACHE_TRANSFORMED_BLOCKS, active=True):
+            self._get_course_blocks()
+            _, num_transforms = self._get_course_blocks()
+        self.assertEquals(num_transforms, 1)
+
+    def test_not_cached_for_old_mongo(self):
+        self.course = CourseFactory.create(default_store=ModuleStoreEnum.Type.mongo)
+        with override_switch(CACHE_TRANSFORMED_BLOCKS, active=True):
+            self._get_course_blocks()
+            _, num_transforms = self._get_course_blocks()
+        self.assertEquals(num_transforms, 1)
@@ -0,0 +1,175 @@
+"""
+Cache of the block structures transformed for individual users by
+get_course_blocks.
+
+Cached structures are keyed by:
+
+    * the user and the version of the course, so that a new publish of
+      the course is never served from the cache.
+    * the starting block and the names of the transformers applied.
+    * a digest of the user's groups in the course's user partitions
+      (cohorts, enrollment tracks, experiments, etc), so that a change
+      of group is never served from the cache.
+    * a per-user generation, which is reset by signal handlers whenever
+      the user's course roles, enrollments or cohorts change, so that
+      all of the user's cached structures are invalidated at once.
+
+Entries are stored with a short timeout to bound the staleness of any
+state that is not covered by the above, such as the passing of start
+dates.
+"""
+# pylint: disable=protected-access
+from hashlib import sha1
+from logging import getLogger
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
+from openedx.core.djangolib.waffle_utils import is_switch_enabled
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+from xmodule.modulestore.django import modulestore
+
+
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+# Waffle switch for enabling the cache of transformed block structures.
+CACHE_TRANSFORMED_BLOCKS = u'course_blocks.cache_transformed_blocks'
+
+# Version of the cached data, to be incremented whenever its format or
+# the composition of its cache key changes.
+CACHE_VERSION = 1
+
+
+def is_enabled():
+    """
+    Returns whether the cache of transformed block structures is enabled.
+    """
+    return is_switch_enabled(CACHE_TRANSFORMED_BLOCKS)
+
+
+def get_transformed(user, starting_block_usage_key, transformers, transform):
+    """
+    Returns the block structure transformed by the given transformers
+    for the given user, starting at starting_block_usage_key, from the
+    cache if available.  Otherwise, calls transform to compute the
+    block structure and adds it to the cache.
+
+    Arguments:
+        user (django.contrib.auth.models.User)
+        starting_block_usage_key (UsageKey)
+        transformers (list[BlockStructureTransformer]) - The
+            transformers applied by transform.
+        transform (function) - Returns the transformed block structure.
+
+    Caching is skipped for anonymous users, for users who are
+    masquerading in the course and for courses without a version (in
+    Old Mongo).
+    """
+    cache_key = _get_cache_key(user, starting_block_usage_key, transformers)
+    if cache_key is None:
+        return transform()
+
+    serialized_data = cache.get(cache_key)
+    if serialized_data is not None:
+        return _deserialize(serialized_data, starting_block_usage_key)
+
+    block_structure = transform()
+    cache.set(cache_key, _serialize(block_structure), settings.COURSE_BLOCKS_TRANSFORMED_CACHE_TIMEOUT)
+    return block_structure
+
+
+def invalidate_user(user_id):
+    """
+    Invalidates all cached block structures of the user with the given id.
+    """
+    cache.delete(_get_generation_cache_key(user_id))
+
+
+def _get_cache_key(user, starting_block_usage_key, transformers):
+    """
+    Returns the cache key of the given user's transformed block
+    structure, or None if it must not be cached.
+    """
+    course_key = starting_block_usage_key.course_key
+    if user.id is None or course_key in getattr(user, 'masquerade_settings', {}):
+        return None
+
+    course = modulestore().get_course(course_key, depth=0)
+    course_version = getattr(course, 'course_version', None)
+    if course_version is None:
+        return None
+
+    digest = sha1()
+    digest.update(unicode(starting_block_usage_key).encode('utf-8'))
+    for transformer in transformers:
+        digest.update(u'|{}'.format(transformer.name()).encode('utf-8'))
+    for partition_id, group_id in _get_user_partition_groups(course, user):
+        digest.update(u'|{}:{}'.format(partition_id, group_id).encode('utf-8'))
+
+    return u'course_blocks.transformed.v{version}.{user_id}.{generation}.{course_version}.{digest}'.format(
+        version=CACHE_VERSION,
+        user_id=user.id,
+        generation=_get_generation(user.id),
+        course_version=course_version,
+        digest=digest.hexdigest(),
+    )
+
+
+def _get_user_partition_groups(course, user):
+    """
+    Returns a sorted list of (partition id, group id) pairs of the
+    user's groups in the course's active user partitions.
+    """
+    partition_groups = []
+    for partition in course.user_partitions:
+        if not partition.active:
+            continue
+        group = partition.scheme.get_group_for_user(course.id, user, partition)
+        partition_groups.append((partition.id, group.id if group is not None else None))
+    return sorted(partition_groups)
+
+
+def _get_generation(user_id):
+    """
+    Returns the current generation of the given user's cached block
+    structures, starting a new generation if there is none.
+    """
+    generation_cache_key = _get_generation_cache_key(user_id)
+    generation = cache.get(generation_cache_key)
+    if generation is None:
+        generation = uuid4().hex
+        cache.set(generation_cache_key, generation, None)
+    return generation
+
+
+def _get_generation_cache_key(user_id):
+    """
+    Returns the cache key of the given user's generation.
+    """
+    return u'course_blocks.transformed.generation.{}'.format(user_id)
+
+
+def _serialize(block_structure):
+    """
+    Serializes the given transformed block_structure.
+    """
+    return zpickle((
+        block_structure._block_relations,
+        block_structure.transformer_data,
+        block_structure._block_data_map,
+    ))
+
+
+def _deserialize(serialized_data, root_block_usage_key):
+    """
+    Deserializes the given data into a new transformed block structure.
+    """
+    block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+    return BlockStructureFactory.create_new(
+        root_block_usage_key,
+        block_relations,
+        transformer_data,
+        block_data_map,
+    )
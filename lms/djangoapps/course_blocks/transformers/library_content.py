@@ -23,6 +23,7 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUBTREE_LOCAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -120,20 +121,14 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
                 )
                 all_selected_children.update(usage_info.course_key.make_usage_key(s[0], s[1]) for s in selected)
 
-        def check_child_removal(block_key):
-            """
-            Return True if selected block should be removed.
-
-            Block is removed if it is part of library_content, but has
-            not been selected for current user.
-            """
-            if block_key not in all_library_children:
-                return False
-            if block_key in all_selected_children:
-                return False
-            return True
-
-        return [block_structure.create_removal_filter(check_child_removal)]
+        # Blocks are removed if they are part of library_content, but
+        # have not been selected for the current user.
+        unselected_children = all_library_children - all_selected_children
+        return [
+            block_structure.create_removal_mask_filter(
+                lambda block_keys: [block_key in unselected_children for block_key in block_keys]
+            )
+        ]
 
     @classmethod
     def _get_student_module(cls, user, course_key, block_key):
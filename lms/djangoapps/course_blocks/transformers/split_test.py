@@ -24,6 +24,7 @@ class SplitTestTransformer(FilteringTransformerMixin, BlockStructureTransformer)
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUBTREE_LOCAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -80,8 +81,8 @@ class SplitTestTransformer(FilteringTransformerMixin, BlockStructureTransformer)
         # The UserPartitionTransformer will enforce group access, so
         # go ahead and remove all extraneous split_test modules.
         return [
-            block_structure.create_removal_filter(
-                lambda block_key: block_key.block_type == 'split_test',
+            block_structure.create_removal_mask_filter(
+                lambda block_keys: [block_key.block_type == 'split_test' for block_key in block_keys],
                 keep_descendants=True,
             )
         ]
@@ -29,6 +29,7 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUBTREE_LOCAL_COLLECT = True
     MERGED_START_DATE = 'merged_start_date'
 
     @classmethod
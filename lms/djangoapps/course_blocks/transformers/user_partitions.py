@@ -21,6 +21,7 @@ class UserPartitionTransformer(FilteringTransformerMixin, BlockStructureTransfor
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUBTREE_LOCAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -23,6 +23,7 @@ class VisibilityTransformer(FilteringTransformerMixin, BlockStructureTransformer
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUBTREE_LOCAL_COLLECT = True
 
     MERGED_VISIBLE_TO_STAFF_ONLY = 'merged_visible_to_staff_only'
 
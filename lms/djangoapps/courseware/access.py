@@ -33,6 +33,7 @@ from xmodule.x_module import XModule
 from xmodule.split_test_module import get_split_user_partitions
 from xmodule.partitions.partitions import NoSuchUserPartitionError, NoSuchUserPartitionGroupError
 
+from courseware.access_context import cached_check
 from courseware.access_response import (
     MilestoneError,
     MobileAvailabilityError,
@@ -523,10 +524,11 @@ def _has_group_access(descriptor, user, course_key):
     # look up the user's group for each partition
     user_groups = {}
     for partition, groups in partition_groups:
-        user_groups[partition.id] = partition.scheme.get_group_for_user(
-            course_key,
+        user_groups[partition.id] = cached_check(
             user,
-            partition,
+            course_key,
+            ('group', partition.id),
+            lambda partition=partition: partition.scheme.get_group_for_user(course_key, user, partition),
         )
 
     # finally: check that the user has a satisfactory group assignment
@@ -736,6 +738,20 @@ def _has_access_to_course(user, access_level, course_key):
 
     access_level = string, either "staff" or "instructor"
     """
+    return cached_check(
+        user,
+        course_key,
+        ('course', access_level),
+        lambda: _check_access_to_course(user, access_level, course_key),
+    )
+
+
+def _check_access_to_course(user, access_level, course_key):
+    """
+    Checks, without memoizing, if the given user has access_level (= staff
+    or instructor) access to the course with the given course_key.  See
+    _has_access_to_course.
+    """
     if user is None or (not user.is_authenticated()):
         debug("Deny: no user or anon user")
         return ACCESS_DENIED
@@ -0,0 +1,117 @@
+"""
+A context in which the results of the access checks that depend only on the
+user and the course, rather than on the block being accessed, are computed
+once and reused.
+
+Rendering the courseware checks access to every block the user sees, and most
+of those checks look up the same course roles and partition groups of the user
+over and over.  Within an `access_context`, those lookups are memoized, so that
+they're only computed once.  (The milestones of the user are already cached for
+the request by `milestones_helpers`.)
+
+A context should only be used for the duration of a single request, after its
+masquerade has been set up, and while the user's roles and groups aren't being
+changed.
+"""
+import threading
+from contextlib import contextmanager
+
+
+class AccessContext(object):
+    """
+    The memoized access checks of a user in a course.
+
+    Attributes:
+        hits (int): The number of checks which were answered from the context.
+        misses (int): The number of checks which were computed, and which may
+            therefore have queried the database.
+    """
+    def __init__(self, user, course_key):
+        self.user_id = user.id
+        self.course_key = _context_course_key(course_key)
+        self.hits = 0
+        self.misses = 0
+        self._results = {}
+
+    def matches(self, user, course_key):
+        """
+        Returns whether the context is for the given user in the given course.
+        """
+        return (
+            user is not None and user.id is not None and user.id == self.user_id and
+            course_key is not None and _context_course_key(course_key) == self.course_key
+        )
+
+    def lookup(self, key, check):
+        """
+        Returns the memoized result of the check identified by key, calling
+        check() to compute it the first time.
+        """
+        try:
+            result = self._results[key]
+        except KeyError:
+            self.misses += 1
+            result = self._results[key] = check()
+        else:
+            self.hits += 1
+        return result
+
+
+def _context_course_key(course_key):
+    """
+    Returns the given course key without version or branch, so that the
+    keys of the blocks of a course match the key of the course.
+    """
+    return course_key.version_agnostic().for_branch(None)
+
+
+class _ActiveContexts(threading.local):
+    """
+    The access contexts which are active in each thread.
+    """
+    def __init__(self):
+        super(_ActiveContexts, self).__init__()
+        self.contexts = []
+
+
+_ACTIVE_CONTEXTS = _ActiveContexts()
+
+
+@contextmanager
+def access_context(user, course_key):
+    """
+    Context manager which memoizes the access checks of the given user in the
+    given course, and yields the AccessContext.  Nothing is memoized for
+    anonymous users.
+    """
+    context = AccessContext(user, course_key)
+    _ACTIVE_CONTEXTS.contexts.append(context)
+    try:
+        yield context
+    finally:
+        _ACTIVE_CONTEXTS.contexts.remove(context)
+
+
+def get_access_context(user, course_key):
+    """
+    Returns the active AccessContext of the given user in the given course,
+    or None if there isn't one.
+    """
+    for context in reversed(_ACTIVE_CONTEXTS.contexts):
+        if context.matches(user, course_key):
+            return context
+    return None
+
+
+def cached_check(user, course_key, key, check):
+    """
+    Returns the result of check(), memoized in the active AccessContext of
+    the given user in the given course, if there is one.  The key identifies
+    the check within the context.
+    """
+    if not _ACTIVE_CONTEXTS.contexts:
+        return check()
+    context = get_access_context(user, course_key)
+    if context is None:
+        return check()
+    return context.lookup(key, check)
@@ -8,6 +8,7 @@ from django.conf import settings
 from django.utils.timezone import UTC
 from logging import getLogger
 from student.roles import CourseBetaTesterRole
+from courseware.access_context import cached_check
 from courseware.masquerade import is_masquerading_as_student
 from courseware.access_response import AccessResponse, StartDateError
 from xmodule.util.django import get_current_request_hostname
@@ -41,7 +42,13 @@ def adjust_start_date(user, days_early_for_beta, start, course_key):
         # bail early if no beta testing is set up
         return start
 
-    if CourseBetaTesterRole(course_key).has_user(user):
+    is_beta_tester = cached_check(
+        user,
+        course_key,
+        ('beta_tester',),
+        lambda: CourseBetaTesterRole(course_key).has_user(user),
+    )
+    if is_beta_tester:
         debug("Adjust start time: user in beta role for %s", course_key)
         delta = timedelta(days_early_for_beta)
         effective = start - delta
@@ -60,6 +60,19 @@ def _lineage(block):
         parent = parent.get_parent()
 
 
+def override_usage_key(usage_key):
+    """
+    Returns the key of the block with the given usage key in the dicts of
+    overrides returned by `FieldOverrideProvider.get_overrides`: the usage
+    key of the block in its course (for blocks of a CCX, in the course of
+    the CCX), without version or branch.
+    """
+    to_block_locator = getattr(usage_key, 'to_block_locator', None)
+    if to_block_locator is not None:
+        usage_key = to_block_locator()
+    return usage_key.version_agnostic().for_branch(None)
+
+
 class _OverridesDisabled(threading.local):
     """
     A thread local used to manage state of overrides being disabled or not.
@@ -114,6 +127,19 @@ class FieldOverrideProvider(object):
         """
         raise NotImplementedError
 
+    def get_overrides(self, course_key):
+        """
+        Returns all of the overrides of the user in the given course, as a
+        dict of {usage key: {field name: JSON value}} keyed by
+        `override_usage_key`, in which the key None holds the fields which
+        are overridden for every block.  This lets `OverrideFieldData`
+        answer each field lookup with dict lookups.
+
+        Providers which can't list their overrides return None, in which
+        case `get` is called for each field lookup instead.
+        """
+        return None
+
     @abstractmethod
     def enabled_for(self, course):  # pragma no cover
         """
@@ -156,21 +182,24 @@ class OverrideFieldData(FieldData):
         any performance impact of this feature if no override providers are
         configured.
         """
-        if cls.provider_classes is None:
-            cls.provider_classes = tuple(
-                (resolve_dotted(name) for name in
-                 settings.FIELD_OVERRIDE_PROVIDERS))
-
         enabled_providers = cls._providers_for_course(course)
         if enabled_providers:
             # TODO: we might not actually want to return here.  Might be better
             # to check for instance.providers after the instance is built. This
             # would allow for the case where we have registered providers but
             # none are enabled for the provided course
-            return cls(user, wrapped, enabled_providers)
+            return cls(user, wrapped, enabled_providers, course.id if course is not None else None)
 
         return wrapped
 
+    @classmethod
+    def is_enabled_for(cls, course):
+        """
+        Returns whether any override providers are enabled for the given
+        course, i.e. whether `wrap` would override its fields for users.
+        """
+        return bool(cls._providers_for_course(course))
+
     @classmethod
     def _providers_for_course(cls, course):
         """
@@ -188,6 +217,10 @@ class OverrideFieldData(FieldData):
             cache_key = ENABLED_OVERRIDE_PROVIDERS_KEY.format(course_id=unicode(course.id))
         enabled_providers = request_cache.data.get(cache_key, NOTSET)
         if enabled_providers == NOTSET:
+            if cls.provider_classes is None:
+                cls.provider_classes = tuple(
+                    (resolve_dotted(name) for name in
+                     settings.FIELD_OVERRIDE_PROVIDERS))
             enabled_providers = tuple(
                 (provider_class for provider_class in cls.provider_classes if provider_class.enabled_for(course))
             )
@@ -195,9 +228,24 @@ class OverrideFieldData(FieldData):
 
         return enabled_providers
 
-    def __init__(self, user, fallback, providers):
+    def __init__(self, user, fallback, providers, course_key=None):
         self.fallback = fallback
         self.providers = tuple(provider(user) for provider in providers)
+        self.course_key = course_key
+        self._provider_overrides = None
+
+    def _get_provider_overrides(self):
+        """
+        Returns a list of (provider, overrides) of the providers, in which
+        overrides is the dict returned by the provider's `get_overrides` for
+        the course, or None if it can't list its overrides.
+        """
+        if self._provider_overrides is None:
+            self._provider_overrides = [
+                (provider, provider.get_overrides(self.course_key) if self.course_key is not None else None)
+                for provider in self.providers
+            ]
+        return self._provider_overrides
 
     def get_override(self, block, name):
         """
@@ -205,8 +253,22 @@ class OverrideFieldData(FieldData):
         Returns the overridden value or `NOTSET` if no override is found.
         """
         if not overrides_disabled():
-            for provider in self.providers:
-                value = provider.get(block, name, NOTSET)
+            block_key = NOTSET
+            for provider, overrides in self._get_provider_overrides():
+                if overrides is not None and block_key is NOTSET:
+                    location = getattr(block, 'location', None)
+                    block_key = override_usage_key(location) if location is not None else None
+                if overrides is None or block_key is None:
+                    value = provider.get(block, name, NOTSET)
+                else:
+                    value = overrides.get(block_key, {}).get(name, NOTSET)
+                    if value is NOTSET:
+                        value = overrides.get(None, {}).get(name, NOTSET)
+                    if value is not NOTSET:
+                        try:
+                            value = block.fields[name].from_json(value)
+                        except KeyError:
+                            pass
                 if value is not NOTSET:
                     return value
         return NOTSET
@@ -44,6 +44,7 @@ from xblock.fields import Scope, UserScope
 from xmodule.modulestore.django import modulestore
 from xblock.core import XBlockAside
 from courseware.user_state_client import DjangoXBlockUserStateClient
+from courseware.user_state_write_behind import defer_writes, discard_pending_writes, get_pending_writes
 
 
 log = logging.getLogger(__name__)
@@ -366,13 +367,18 @@ class UserStateCache(object):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
+        usage_keys = _all_usage_keys(xblocks, aside_types)
         block_field_state = self._client.get_many(
             self.user.username,
-            _all_usage_keys(xblocks, aside_types),
+            usage_keys,
         )
         for user_state in block_field_state:
             self._cache[user_state.block_key] = user_state.state
 
+        # Overlay the writes which haven't been flushed to the database yet.
+        for usage_key, state in get_pending_writes(self.user, usage_keys).iteritems():
+            self._cache[usage_key] = dict(self._cache.get(usage_key, {}), **state)
+
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def set(self, kvs_key, value):
         """
@@ -419,10 +425,12 @@ class UserStateCache(object):
             pending_updates[cache_key][kvs_key.field_name] = value
 
         try:
-            self._client.set_many(
-                self.user.username,
-                pending_updates
-            )
+            immediate_updates = defer_writes(self.user, self._client, pending_updates)
+            if immediate_updates:
+                self._client.set_many(
+                    self.user.username,
+                    immediate_updates
+                )
         except DatabaseError:
             log.exception("Saving user state failed for %s", self.user.username)
             raise KeyValueMultiSaveError([])
@@ -465,6 +473,7 @@ class UserStateCache(object):
         if kvs_key.field_name not in field_state:
             raise KeyError(kvs_key.field_name)
 
+        discard_pending_writes(self.user, cache_key, [kvs_key.field_name])
         self._client.delete(self.user.username, cache_key, fields=[kvs_key.field_name])
         del field_state[kvs_key.field_name]
 
@@ -993,6 +1002,29 @@ class ScoresClient(object):
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def bulk_create_for_locations(cls, course_id, user_ids, scorable_locations):
+        """
+        Create a ScoresClient with pre-fetched data for the given locations
+        for each of the given users, with a single query.
+
+        Returns a dict of the ScoresClients keyed by user id.
+        """
+        clients = {user_id: cls(course_id, user_id) for user_id in user_ids}
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=clients.keys(),
+            course_id=course_id,
+            module_state_key__in=set(scorable_locations),
+        )
+        for user_id, location, correct, total in scores_qset.values_list(
+                'student_id', 'module_state_key', 'grade', 'max_grade'
+        ):
+            location = UsageKey.from_string(location).map_into_course(course_id)
+            clients[user_id]._locations_to_scores[location] = cls.Score(correct, total)  # pylint: disable=protected-access
+        for client in clients.itervalues():
+            client._has_fetched = True  # pylint: disable=protected-access
+        return clients
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
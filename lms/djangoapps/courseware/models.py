@@ -14,6 +14,8 @@ ASSUMPTIONS: modules have unique IDs, even across different module_types
 """
 import logging
 import itertools
+import threading
+from contextlib import contextmanager
 
 from django.contrib.auth.models import User
 from django.conf import settings
@@ -61,12 +63,20 @@ class ChunkingManager(models.Manager):
                 :meth:`~Manager.filter`. This implies that ``chunk_field`` should be an
                 ``__in`` key.
             chunk_size (int): The size of chunks to pass. Defaults to 500.
+            iterator (bool): Whether to read the results of each chunk's query with
+                :meth:`~QuerySet.iterator`, so that they are not cached by the query set.
+                Defaults to False.
         """
         chunk_size = kwargs.pop('chunk_size', 500)
-        res = itertools.chain.from_iterable(
+        iterator = kwargs.pop('iterator', False)
+        querysets = (
             self.filter(**dict([(chunk_field, chunk)] + kwargs.items()))
             for chunk in chunks(items, chunk_size)
         )
+        res = itertools.chain.from_iterable(
+            queryset.iterator() if iterator else queryset
+            for queryset in querysets
+        )
         return res
 
 
@@ -148,6 +158,49 @@ class StudentModule(models.Model):
         return unicode(repr(self))
 
 
+class _HistoryBatch(threading.local):
+    """
+    The StudentModule history entries whose writes are being batched in each thread.
+    """
+    def __init__(self):
+        super(_HistoryBatch, self).__init__()
+        self.entries = None
+
+
+_HISTORY_BATCH = _HistoryBatch()
+
+
+@contextmanager
+def batch_history_writes():
+    """
+    Context manager which defers the writes of the StudentModule history entries
+    saved in the current thread to the end of the block, and then writes them
+    with a single bulk insert into each history table.  Blocks may be nested.
+    """
+    if _HISTORY_BATCH.entries is not None:
+        yield
+        return
+
+    _HISTORY_BATCH.entries = []
+    try:
+        yield
+    finally:
+        entries, _HISTORY_BATCH.entries = _HISTORY_BATCH.entries, None
+        for model, model_entries in itertools.groupby(entries, type):
+            model.objects.bulk_create(list(model_entries))
+
+
+def save_history_entry(history_entry):
+    """
+    Saves the StudentModule history entry, or adds it to the current thread's
+    batch if its writes are being batched (see batch_history_writes).
+    """
+    if _HISTORY_BATCH.entries is not None:
+        _HISTORY_BATCH.entries.append(history_entry)
+    else:
+        history_entry.save()
+
+
 class BaseStudentModuleHistory(models.Model):
     """Abstract class containing most fields used by any class
     storing Student Module History"""
@@ -175,18 +228,25 @@ class BaseStudentModuleHistory(models.Model):
         return StudentModule.objects.get(pk=self.student_module_id)
 
     @staticmethod
-    def get_history(student_modules):
+    def get_history(student_modules, start=None, end=None):
         """
-        Find history objects across multiple backend stores for a given StudentModule
+        Find history objects across multiple backend stores for a given StudentModule,
+        optionally limited to the ones created at or after start, and before end.
         """
 
         history_entries = []
+        created_filters = {}
+        if start is not None:
+            created_filters['created__gte'] = start
+        if end is not None:
+            created_filters['created__lt'] = end
 
         if settings.FEATURES.get('ENABLE_CSMH_EXTENDED'):
             history_entries += coursewarehistoryextended.models.StudentModuleHistoryExtended.objects.filter(
                 # Django will sometimes try to join to courseware_studentmodule
                 # so just do an in query
-                student_module__in=[module.id for module in student_modules]
+                student_module__in=[module.id for module in student_modules],
+                **created_filters
             ).order_by('-id')
 
         # If we turn off reading from multiple history tables, then we don't want to read from
@@ -194,7 +254,8 @@ class BaseStudentModuleHistory(models.Model):
         if settings.FEATURES.get('ENABLE_READING_FROM_MULTIPLE_HISTORY_TABLES'):
             # we want to save later SQL queries on the model which allows us to prefetch
             history_entries += StudentModuleHistory.objects.prefetch_related('student_module').filter(
-                student_module__in=student_modules
+                student_module__in=student_modules,
+                **created_filters
             ).order_by('-id')
 
         return history_entries
@@ -227,7 +288,7 @@ class StudentModuleHistory(BaseStudentModuleHistory):
                                                  state=instance.state,
                                                  grade=instance.grade,
                                                  max_grade=instance.max_grade)
-            history_entry.save()
+            save_history_entry(history_entry)
 
     # When the extended studentmodulehistory table exists, don't save
     # duplicate history into courseware_studentmodulehistory, just retain
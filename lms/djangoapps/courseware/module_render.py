@@ -44,6 +44,7 @@ from courseware.masquerade import (
 )
 from courseware.model_data import DjangoKeyValueStore, FieldDataCache
 from edxmako.shortcuts import render_to_string
+from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.grades.signals.signals import SCORE_PUBLISHED
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
 from lms.djangoapps.lms_xblock.models import XBlockAsidesConfig
@@ -53,6 +54,7 @@ from openedx.core.djangoapps.bookmarks.services import BookmarksService
 from openedx.core.djangoapps.crawlers.models import CrawlersConfig
 from openedx.core.djangoapps.credit.services import CreditService
 from openedx.core.djangoapps.util.user_utils import SystemUser
+from openedx.core.djangolib.waffle_utils import is_switch_enabled
 from openedx.core.lib.xblock_utils import (
     replace_course_urls,
     replace_jump_to_id_urls,
@@ -70,6 +72,7 @@ from util.model_utils import slugify
 from util.sandboxing import can_execute_unsafe_code, get_python_lib_zip
 from xblock.runtime import KvsFieldData
 from xblock_django.user_service import DjangoXBlockUserService
+from xmodule import block_metadata_utils
 from xmodule.contentstore.django import contentstore
 from xmodule.error_module import ErrorDescriptor, NonStaffErrorDescriptor
 from xmodule.exceptions import NotFoundError, ProcessingError
@@ -82,6 +85,10 @@ from .field_overrides import OverrideFieldData
 
 log = logging.getLogger(__name__)
 
+# Waffle switch for building the courseware's table of contents from the
+# user's course blocks, rather than from XModules.
+BLOCK_STRUCTURE_TOC = u'courseware.block_structure_toc'
+
 
 if settings.XQUEUE_INTERFACE.get('basic_auth') is not None:
     REQUESTS_AUTH = HTTPBasicAuth(*settings.XQUEUE_INTERFACE['basic_auth'])
@@ -118,6 +125,76 @@ def make_track_function(request):
     return function
 
 
+def _is_block_structure_toc_enabled(course):
+    """
+    Returns whether the table of contents of the course is built from the
+    user's course blocks.  Field overrides (e.g. individual due dates and
+    CCX) aren't applied to course blocks, so it isn't for courses which
+    have any enabled.
+    """
+    return is_switch_enabled(BLOCK_STRUCTURE_TOC) and not OverrideFieldData.is_enabled_for(course)
+
+
+class _TocBlock(object):
+    """
+    A chapter or section of the table of contents, read from the user's
+    transformed course block structure, with the attributes of its XModule
+    which toc_for_course uses.
+    """
+    # pylint: disable=missing-docstring
+
+    def __init__(self, block_structure, usage_key):
+        self.block_structure = block_structure
+        self.location = usage_key
+
+    def _get_field(self, field_name, default=None):
+        """
+        Returns the collected value of the given xblock field of the block.
+        """
+        return self.block_structure.get_xblock_field(self.location, field_name, default)
+
+    @property
+    def url_name(self):
+        return block_metadata_utils.url_name_for_block(self)
+
+    @property
+    def display_name(self):
+        return self._get_field('display_name')
+
+    @property
+    def display_name_with_default_escaped(self):
+        return block_metadata_utils.display_name_with_default_escaped(self)
+
+    @property
+    def hide_from_toc(self):
+        return self._get_field('hide_from_toc', False)
+
+    @property
+    def format(self):
+        return self._get_field('format')
+
+    @property
+    def due(self):
+        return self._get_field('due')
+
+    @property
+    def graded(self):
+        return self._get_field('graded', False)
+
+    @property
+    def is_time_limited(self):
+        return self._get_field('is_time_limited', False)
+
+    def get_display_items(self):
+        """
+        Returns the children of the block which the user can access.
+        """
+        return [
+            _TocBlock(self.block_structure, child_key)
+            for child_key in self.block_structure.get_children(self.location)
+        ]
+
+
 def toc_for_course(user, request, course, active_chapter, active_section, field_data_cache):
     '''
     Create a table of contents from the module store
@@ -146,15 +223,20 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
     NOTE: assumes that if we got this far, user has access to course.  Returns
     None if this is not the case.
 
-    field_data_cache must include data from the course module and 2 levels of its descendants
+    field_data_cache must include data from the course module and 2 levels of its descendants,
+    unless the table of contents is built from the user's course blocks (see
+    _is_block_structure_toc_enabled), in which case no XModules are instantiated.
     '''
 
     with modulestore().bulk_operations(course.id):
-        course_module = get_module_for_descriptor(
-            user, request, course, field_data_cache, course.id, course=course
-        )
-        if course_module is None:
-            return None, None, None
+        if _is_block_structure_toc_enabled(course):
+            course_module = _TocBlock(get_course_blocks(user, course.location), course.location)
+        else:
+            course_module = get_module_for_descriptor(
+                user, request, course, field_data_cache, course.id, course=course
+            )
+            if course_module is None:
+                return None, None, None
 
         toc_chapters = list()
         chapters = course_module.get_display_items()
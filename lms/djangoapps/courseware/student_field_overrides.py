@@ -4,9 +4,14 @@ by the individual due dates feature.
 """
 import json
 
-from .field_overrides import FieldOverrideProvider
+import request_cache
+
+from .field_overrides import FieldOverrideProvider, override_usage_key
 from .models import StudentFieldOverride
 
+# Name of the request cache of the overrides of each user in each course.
+OVERRIDES_CACHE_NAME = 'student-field-overrides'
+
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
     """
@@ -17,6 +22,9 @@ class IndividualStudentOverrideProvider(FieldOverrideProvider):
     def get(self, block, name, default):
         return get_override_for_user(self.user, block, name, default)
 
+    def get_overrides(self, course_key):
+        return _get_overrides_for_user_in_course(self.user, course_key)
+
     @classmethod
     def enabled_for(cls, course):
         """This simple override provider is always enabled"""
@@ -56,6 +64,34 @@ def _get_overrides_for_user(user, block):
     return overrides
 
 
+def _get_overrides_for_user_in_course(user, course_key):
+    """
+    Gets all of the individual student overrides for the given user in the
+    given course, in the format of FieldOverrideProvider.get_overrides.
+    They're cached for the rest of the request.
+    """
+    overrides_cache = request_cache.get_cache(OVERRIDES_CACHE_NAME)
+    cache_key = (user.id, course_key)
+    if cache_key not in overrides_cache:
+        overrides = {}
+        query = StudentFieldOverride.objects.filter(
+            course_id=course_key,
+            student_id=user.id,
+        )
+        for override in query:
+            block_key = override_usage_key(override.location.map_into_course(course_key))
+            overrides.setdefault(block_key, {})[override.field] = json.loads(override.value)
+        overrides_cache[cache_key] = overrides
+    return overrides_cache[cache_key]
+
+
+def _clear_cached_overrides_for_user(user, block):
+    """
+    Removes the cached overrides of the user in the course of the block.
+    """
+    request_cache.get_cache(OVERRIDES_CACHE_NAME).pop((user.id, block.runtime.course_id), None)
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -70,6 +106,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    _clear_cached_overrides_for_user(user, block)
 
 
 def clear_override_for_user(user, block, name):
@@ -87,3 +124,4 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    _clear_cached_overrides_for_user(user, block)
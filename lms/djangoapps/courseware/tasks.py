@@ -0,0 +1,33 @@
+"""
+Asynchronous tasks for the courseware app.
+"""
+from logging import getLogger
+
+from celery import task
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.utils import DatabaseError
+
+from courseware.user_state_client import DjangoXBlockUserStateClient
+from courseware.user_state_write_behind import flush_pending_writes
+
+log = getLogger(__name__)
+
+
+@task(bind=True, default_retry_delay=30, max_retries=5, routing_key=settings.STUDENT_MODULE_WRITE_BEHIND_ROUTING_KEY)
+def flush_user_state_writes(self, user_id):
+    """
+    Writes the user's pending XBlock user state writes to StudentModule.
+    See courseware.user_state_write_behind.
+    """
+    try:
+        user = User.objects.get(id=user_id)
+    except User.DoesNotExist:
+        log.warning(u'Discarding the pending user state writes of missing user %s', user_id)
+        return
+
+    try:
+        num_blocks = flush_pending_writes(user, DjangoXBlockUserStateClient(user))
+    except DatabaseError as exc:
+        raise self.retry(exc=exc)
+    log.debug(u'Flushed the pending user state writes of %d blocks for user %s', num_blocks, user_id)
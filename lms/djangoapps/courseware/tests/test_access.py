@@ -19,6 +19,7 @@ from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from ccx.tests.factories import CcxFactory
 import courseware.access as access
 import courseware.access_response as access_response
+from courseware.access_context import access_context, get_access_context
 from courseware.masquerade import CourseMasquerade
 from courseware.tests.factories import (
     BetaTesterFactory,
@@ -735,6 +736,40 @@ class UserRoleTestCase(TestCase):
         )
 
 
+@attr(shard=1)
+class AccessContextTestCase(TestCase):
+    """
+    Tests for memoizing access checks in an access context.
+    """
+
+    def setUp(self):
+        super(AccessContextTestCase, self).setUp()
+        self.course_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+        self.student = UserFactory()
+        self.other_student = UserFactory()
+
+    def test_memoized_in_context(self):
+        with access_context(self.student, self.course_key) as context:
+            self.assertIs(get_access_context(self.student, self.course_key), context)
+            self.assertIsNone(get_access_context(self.other_student, self.course_key))
+
+            self.assertFalse(access.has_access(self.student, 'staff', self.course_key))
+            self.assertEqual((context.hits, context.misses), (0, 1))
+
+            # the role is only seen outside the context, which is computed once
+            CourseStaffRole(self.course_key).add_users(self.student)
+            with self.assertNumQueries(0):
+                self.assertFalse(access.has_access(self.student, 'staff', self.course_key))
+            self.assertEqual((context.hits, context.misses), (1, 1))
+
+            # other users' checks aren't memoized
+            self.assertFalse(access.has_access(self.other_student, 'staff', self.course_key))
+            self.assertEqual((context.hits, context.misses), (1, 1))
+
+        self.assertIsNone(get_access_context(self.student, self.course_key))
+        self.assertTrue(access.has_access(self.student, 'staff', self.course_key))
+
+
 @attr(shard=3)
 @ddt.ddt
 class CourseOverviewAccessTestCase(ModuleStoreTestCase):
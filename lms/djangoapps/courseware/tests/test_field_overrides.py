@@ -16,6 +16,7 @@ from ..field_overrides import (
     FieldOverrideProvider,
     OverrideFieldData,
     OverrideModulestoreFieldData,
+    override_usage_key,
 )
 from ..testutils import FieldOverrideTestMixin
 
@@ -45,6 +46,23 @@ class TestOverrideProvider(FieldOverrideProvider):
         return True
 
 
+class TestListedOverrideProvider(FieldOverrideProvider):
+    """
+    A `FieldOverrideProvider` for testing which lists its overrides.
+    """
+    overrides = {}
+
+    def get(self, block, name, default):
+        raise AssertionError("get shouldn't be called for a provider which lists its overrides")
+
+    def get_overrides(self, course_key):
+        return self.overrides
+
+    @classmethod
+    def enabled_for(cls, course):
+        return True
+
+
 @attr(shard=1)
 @override_settings(FIELD_OVERRIDE_PROVIDERS=(
     'courseware.tests.test_field_overrides.TestOverrideProvider',))
@@ -125,6 +143,45 @@ class OverrideFieldDataTests(SharedModuleStoreTestCase):
         self.assertIsInstance(data, DictFieldData)
 
 
+@attr(shard=1)
+@override_settings(FIELD_OVERRIDE_PROVIDERS=(
+    'courseware.tests.test_field_overrides.TestListedOverrideProvider',))
+class ListedOverridesTests(SharedModuleStoreTestCase):
+    """
+    Tests for `OverrideFieldData` with providers which list their overrides.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super(ListedOverridesTests, cls).setUpClass()
+        cls.course = CourseFactory.create()
+
+    def setUp(self):
+        super(ListedOverridesTests, self).setUp()
+        OverrideFieldData.provider_classes = None
+        TestListedOverrideProvider.overrides = {
+            override_usage_key(self.course.location): {'display_name': 'Overridden', 'foo': 'fu'},
+            None: {'oh': 'man'},
+        }
+
+    def tearDown(self):
+        super(ListedOverridesTests, self).tearDown()
+        OverrideFieldData.provider_classes = None
+        TestListedOverrideProvider.overrides = {}
+
+    def test_get(self):
+        data = OverrideFieldData.wrap(TESTUSER, self.course, DictFieldData({
+            'foo': 'bar',
+            'bees': 'knees',
+        }))
+        self.assertEqual(data.get(self.course, 'display_name'), 'Overridden')
+        self.assertEqual(data.get(self.course, 'foo'), 'fu')
+        self.assertEqual(data.get(self.course, 'oh'), 'man')
+        self.assertEqual(data.get(self.course, 'bees'), 'knees')
+        with disable_overrides():
+            self.assertEqual(data.get(self.course, 'foo'), 'bar')
+
+
 @attr(shard=1)
 @override_settings(
     MODULESTORE_FIELD_OVERRIDE_PROVIDERS=['courseware.tests.test_field_overrides.TestOverrideProvider']
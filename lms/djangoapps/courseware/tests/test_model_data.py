@@ -19,7 +19,13 @@ from xblock.fields import Scope, BlockScope, ScopeIds
 from xblock.exceptions import KeyValueMultiSaveError
 from xblock.core import XBlock
 from django.test import TestCase
+from django.test.utils import override_settings
+from django.core.cache import cache
 from django.db import DatabaseError
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from courseware.tasks import flush_user_state_writes
+from courseware.user_state_client import DjangoXBlockUserStateClient
+from courseware.user_state_write_behind import flush_pending_writes, get_pending_writes
 
 
 def mock_field(scope, name):
@@ -227,6 +233,167 @@ class TestStudentModuleStorage(OtherUserFailureTestMixin, TestCase):
         self.assertEquals(exception_context.exception.saved_field_names, [])
 
 
+# The fields of scored blocks, such as problems, are never deferred, so write-behind is tested with a sequence.
+sequence_location = partial(course_id.make_usage_key, u'sequential')
+sequence_state_key = partial(DjangoKeyValueStore.Key, Scope.user_state, 1, sequence_location('usage_id'))
+
+
+@attr(shard=1)
+@override_settings(STUDENT_MODULE_WRITE_BEHIND={
+    'ENABLED': True, 'FIELDS': {'sequential': ['b_field'], 'problem': ['b_field']}, 'DELAY': 5
+})
+class TestStudentModuleWriteBehind(CacheIsolationTestCase):
+    """Tests for deferring writes of user_state fields"""
+    ENABLED_CACHES = ['default']
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestStudentModuleWriteBehind, self).setUp()
+        student_module = StudentModuleFactory(
+            module_state_key=sequence_location('usage_id'),
+            state=json.dumps({'a_field': 'a_value', 'b_field': 'b_value'}),
+        )
+        self.user = student_module.student
+        self.assertEqual(self.user.id, 1)   # check our assumption hard-coded in the key functions above.
+        self.kvs = self._make_kvs()
+
+    def _make_kvs(self, usage_key=sequence_location('usage_id')):
+        """Returns a DjangoKeyValueStore which loads the a_field and b_field user_state fields of the block"""
+        fields = [mock_field(Scope.user_state, 'a_field'), mock_field(Scope.user_state, 'b_field')]
+        descriptor = mock_descriptor(fields)
+        descriptor.scope_ids = ScopeIds('user1', usage_key.block_type, usage_key, usage_key)
+        return DjangoKeyValueStore(FieldDataCache([descriptor], course_id, self.user))
+
+    def _stored_state(self, usage_key=sequence_location('usage_id')):
+        """Returns the state stored in the StudentModule of the block"""
+        return json.loads(StudentModule.objects.get(module_state_key=usage_key).state)
+
+    @patch('courseware.tasks.flush_user_state_writes.apply_async')
+    def test_deferred_writes_are_coalesced(self, mock_apply_async):
+        with self.assertNumQueries(0):
+            self.kvs.set(sequence_state_key('b_field'), 'new_value')
+            self.kvs.set(sequence_state_key('b_field'), 'newer_value')
+        mock_apply_async.assert_called_once_with((self.user.id,), countdown=5)
+        self.assertEquals({'a_field': 'a_value', 'b_field': 'b_value'}, self._stored_state())
+
+        # the pending write is read back, over the stored state
+        self.assertEquals('newer_value', self._make_kvs().get(sequence_state_key('b_field')))
+
+        flush_user_state_writes(self.user.id)
+        self.assertEquals({'a_field': 'a_value', 'b_field': 'newer_value'}, self._stored_state())
+
+    @patch('courseware.tasks.flush_user_state_writes.apply_async')
+    def test_other_fields_are_written(self, mock_apply_async):
+        self.kvs.set_many({sequence_state_key('a_field'): 'new_value', sequence_state_key('b_field'): 'newer_value'})
+        self.assertEquals({'a_field': 'new_value', 'b_field': 'b_value'}, self._stored_state())
+        self.assertTrue(mock_apply_async.called)
+
+    @patch('courseware.tasks.flush_user_state_writes.apply_async')
+    def test_scored_blocks_are_written(self, mock_apply_async):
+        StudentModuleFactory(student=self.user, state=json.dumps({'b_field': 'b_value'}))
+        self._make_kvs(location('usage_id')).set(user_state_key('b_field'), 'new_value')
+        self.assertEquals({'b_field': 'new_value'}, self._stored_state(location('usage_id')))
+        self.assertFalse(mock_apply_async.called)
+
+    @patch('courseware.tasks.flush_user_state_writes.apply_async', side_effect=IOError)
+    def test_written_if_flush_is_not_queued(self, __):
+        self.kvs.set(sequence_state_key('b_field'), 'new_value')
+        self.assertEquals({'a_field': 'a_value', 'b_field': 'new_value'}, self._stored_state())
+
+    @patch('courseware.tasks.flush_user_state_writes.apply_async')
+    def test_delete_discards_deferred_write(self, __):
+        self.kvs.set(sequence_state_key('b_field'), 'new_value')
+        self.kvs.delete(sequence_state_key('b_field'))
+        flush_user_state_writes(self.user.id)
+        self.assertEquals({'a_field': 'a_value'}, self._stored_state())
+
+    @patch('courseware.tasks.flush_user_state_writes.apply_async')
+    def test_writes_during_flush_are_kept(self, __):
+        self.kvs.set(sequence_state_key('b_field'), 'new_value')
+
+        def write_during_flush(*args):
+            """Writes the field again while the pending writes are being flushed"""
+            self._make_kvs().set(sequence_state_key('b_field'), 'newer_value')
+        client = Mock(set_many=Mock(side_effect=write_during_flush))
+        self.assertEquals(1, flush_pending_writes(self.user, client))
+        self.assertEquals({'b_field': 'new_value'}, client.set_many.call_args[0][1].values()[0])
+        self.assertEquals([{'b_field': 'newer_value'}], get_pending_writes(self.user).values())
+
+        flush_user_state_writes(self.user.id)
+        self.assertEquals({'a_field': 'a_value', 'b_field': 'newer_value'}, self._stored_state())
+        self.assertEquals({}, get_pending_writes(self.user))
+
+    @patch('courseware.tasks.flush_user_state_writes.apply_async')
+    def test_write_read_by_concurrent_flush(self, mock_apply_async):
+        real_set = cache.set
+
+        def set_during_flush(key, *args, **kwargs):
+            """Flushes the first write as soon as it's stored, and then writes the field again"""
+            real_set(key, *args, **kwargs)
+            if '.write.' in key and not mock_set.flushed:
+                mock_set.flushed = True
+                flush_user_state_writes(self.user.id)
+                self._make_kvs().set(sequence_state_key('b_field'), 'newer_value')
+
+        with patch('courseware.user_state_write_behind.cache.set', side_effect=set_during_flush) as mock_set:
+            mock_set.flushed = False
+            self.kvs.set(sequence_state_key('b_field'), 'new_value')
+
+        # the write which was flushed isn't written again over the later one
+        self.assertEquals({'a_field': 'a_value', 'b_field': 'new_value'}, self._stored_state())
+        self.assertEquals([{'b_field': 'newer_value'}], get_pending_writes(self.user).values())
+        self.assertEquals(1, mock_apply_async.call_count)
+
+        flush_user_state_writes(self.user.id)
+        self.assertEquals({'a_field': 'a_value', 'b_field': 'newer_value'}, self._stored_state())
+
+    @patch('courseware.tasks.flush_user_state_writes.apply_async')
+    def test_write_to_sealed_generation(self, mock_apply_async):
+        self.kvs.set(sequence_state_key('b_field'), 'new_value')
+        self.assertEquals(1, mock_apply_async.call_count)
+        real_incr = cache.incr
+
+        def flush_before_incr(key, *args, **kwargs):
+            """Flushes the pending writes before the first write is counted"""
+            if '.length.' in key and not mock_incr.flushed:
+                mock_incr.flushed = True
+                flush_user_state_writes(self.user.id)
+            return real_incr(key, *args, **kwargs)
+
+        with patch('courseware.user_state_write_behind.cache.incr', side_effect=flush_before_incr) as mock_incr:
+            mock_incr.flushed = False
+            self.kvs.set(sequence_state_key('b_field'), 'newer_value')
+
+        # the write is appended to the next generation, and another flush is scheduled for it
+        self.assertEquals({'a_field': 'a_value', 'b_field': 'new_value'}, self._stored_state())
+        self.assertEquals([{'b_field': 'newer_value'}], get_pending_writes(self.user).values())
+        self.assertEquals(2, mock_apply_async.call_count)
+
+        flush_user_state_writes(self.user.id)
+        self.assertEquals({'a_field': 'a_value', 'b_field': 'newer_value'}, self._stored_state())
+
+    @patch('courseware.tasks.flush_user_state_writes.apply_async')
+    def test_failed_flush_keeps_writes(self, __):
+        self.kvs.set(sequence_state_key('b_field'), 'new_value')
+        with self.assertRaises(DatabaseError):
+            flush_pending_writes(self.user, Mock(set_many=Mock(side_effect=DatabaseError)))
+        self.assertEquals([{'b_field': 'new_value'}], get_pending_writes(self.user).values())
+
+        flush_user_state_writes(self.user.id)
+        self.assertEquals({'a_field': 'a_value', 'b_field': 'new_value'}, self._stored_state())
+
+    @patch('courseware.tasks.flush_user_state_writes.apply_async', side_effect=IOError)
+    def test_kept_if_not_queued_or_written(self, __):
+        with patch.object(DjangoXBlockUserStateClient, 'set_many', side_effect=DatabaseError):
+            with self.assertRaises(KeyValueMultiSaveError):
+                self.kvs.set(sequence_state_key('b_field'), 'new_value')
+        self.assertEquals([{'b_field': 'new_value'}], get_pending_writes(self.user).values())
+
+        flush_user_state_writes(self.user.id)
+        self.assertEquals({'a_field': 'a_value', 'b_field': 'new_value'}, self._stored_state())
+
+
 @attr(shard=1)
 class TestMissingStudentModule(TestCase):
     # Tell Django to clean out all databases, not just default
@@ -40,6 +40,7 @@ from courseware.tests.factories import StudentModuleFactory, UserFactory, Global
 from courseware.tests.tests import LoginEnrollmentTestCase
 from courseware.tests.test_submitting_problems import TestSubmittingProblems
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
+from openedx.core.djangolib.testing.waffle_utils import override_switch
 from openedx.core.lib.courses import course_image_url
 from openedx.core.lib.gating import api as gating_api
 from openedx.core.lib.url_utils import quote_slashes
@@ -636,14 +637,16 @@ class TestTOC(ModuleStoreTestCase):
     #     - 1 for the course
     #     - 1 for its children
     #     - 1 for its grandchildren
-    # Split makes 6 queries to load the course to depth 2:
+    # Split makes 4 queries to load the course to depth 2:
     #     - load the structure
-    #     - load 5 definitions
+    #     - load the course definition
+    #     - load 2 batches of definitions, one per chapter, since sibling
+    #       definitions are fetched together
     # Split makes 5 queries to render the toc:
     #     - it loads the active version at the start of the bulk operation
     #     - it loads 4 definitions, because it instantiates 4 VideoModules
     #       each of which access a Scope.content field in __init__
-    @ddt.data((ModuleStoreEnum.Type.mongo, 3, 0, 0), (ModuleStoreEnum.Type.split, 6, 0, 5))
+    @ddt.data((ModuleStoreEnum.Type.mongo, 3, 0, 0), (ModuleStoreEnum.Type.split, 4, 0, 5))
     @ddt.unpack
     def test_toc_toy_from_chapter(self, default_ms, setup_finds, setup_sends, toc_finds):
         with self.store.default_store(default_ms):
@@ -678,14 +681,16 @@ class TestTOC(ModuleStoreTestCase):
     #     - 1 for the course
     #     - 1 for its children
     #     - 1 for its grandchildren
-    # Split makes 6 queries to load the course to depth 2:
+    # Split makes 4 queries to load the course to depth 2:
     #     - load the structure
-    #     - load 5 definitions
+    #     - load the course definition
+    #     - load 2 batches of definitions, one per chapter, since sibling
+    #       definitions are fetched together
     # Split makes 5 queries to render the toc:
     #     - it loads the active version at the start of the bulk operation
     #     - it loads 4 definitions, because it instantiates 4 VideoModules
     #       each of which access a Scope.content field in __init__
-    @ddt.data((ModuleStoreEnum.Type.mongo, 3, 0, 0), (ModuleStoreEnum.Type.split, 6, 0, 5))
+    @ddt.data((ModuleStoreEnum.Type.mongo, 3, 0, 0), (ModuleStoreEnum.Type.split, 4, 0, 5))
     @ddt.unpack
     def test_toc_toy_from_section(self, default_ms, setup_finds, setup_sends, toc_finds):
         with self.store.default_store(default_ms):
@@ -715,6 +720,23 @@ class TestTOC(ModuleStoreTestCase):
             self.assertEquals(actual['previous_of_active_section']['url_name'], 'Toy_Videos')
             self.assertEquals(actual['next_of_active_section']['url_name'], 'video_123456789012')
 
+    @ddt.data((ModuleStoreEnum.Type.mongo, 3, 0), (ModuleStoreEnum.Type.split, 4, 0))
+    @ddt.unpack
+    def test_toc_from_block_structure(self, default_ms, setup_finds, setup_sends):
+        with self.store.default_store(default_ms):
+            self.setup_request_and_course(setup_finds, setup_sends)
+            section = 'Welcome'
+            expected = render.toc_for_course(
+                self.request.user, self.request, self.toy_course, self.chapter, section, self.field_data_cache
+            )
+            with override_switch(render.BLOCK_STRUCTURE_TOC, active=True):
+                with patch('courseware.module_render.get_module_for_descriptor') as mock_get_module:
+                    actual = render.toc_for_course(
+                        self.request.user, self.request, self.toy_course, self.chapter, section, None
+                    )
+        self.assertFalse(mock_get_module.called)
+        self.assertEqual(actual, expected)
+
 
 @attr(shard=1)
 @ddt.ddt
@@ -7,6 +7,8 @@ from collections import defaultdict
 from unittest import skip
 
 from django.test import TestCase
+from mock import patch
+from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
 
 from edx_user_state_client.tests import UserStateClientTestBase
 from courseware.user_state_client import DjangoXBlockUserStateClient
@@ -67,3 +69,26 @@ class TestDjangoUserStateClient(UserStateClientTestBase, TestCase):
     @skip("Not supported by DjangoXBlockUserStateClient")
     def test_iter_course_many_users(self):
         pass
+
+    @patch.object(DjangoXBlockUserStateClient, 'USERS_CHUNK_SIZE', 2)
+    def test_get_many_for_users(self):
+        course_key = CourseLocator('org', 'course', 'run')
+        block_keys = [BlockUsageLocator(course_key, 'problem', 'block{}'.format(index)) for index in range(2)]
+        usernames = [self._user(index) for index in range(3)]
+        for username in usernames:
+            self.client.set_many(username, {block_key: {'owner': username} for block_key in block_keys})
+        self.client.delete(usernames[0], block_keys[1])
+
+        with self.assertNumQueries(2 + 2):
+            user_states = {
+                (user_state.username, user_state.block_key): user_state.state
+                for user_state in self.client.get_many_for_users(usernames, block_keys, stream=False)
+            }
+
+        expected_user_states = {
+            (username, block_key): {'owner': username}
+            for username in usernames
+            for block_key in block_keys
+        }
+        del expected_user_states[(usernames[0], block_keys[1])]
+        self.assertEqual(user_states, expected_user_states)
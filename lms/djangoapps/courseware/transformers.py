@@ -0,0 +1,41 @@
+"""
+Courseware Transformers
+"""
+from openedx.core.djangoapps.content.block_structure.transformer import BlockStructureTransformer
+
+
+class TableOfContentsTransformer(BlockStructureTransformer):
+    """
+    The TableOfContentsTransformer collects the fields which the
+    courseware's table of contents shows for chapters and sections, so
+    that it can be built from the user's course blocks without
+    instantiating their XModules (see module_render.toc_for_course).
+
+    No runtime transformations are performed.
+    """
+    WRITE_VERSION = 1
+    READ_VERSION = 1
+    SUBTREE_LOCAL_COLLECT = True
+    FIELDS_TO_COLLECT = [u'display_name', u'due', u'format', u'graded', u'hide_from_toc', u'is_time_limited']
+
+    @classmethod
+    def name(cls):
+        """
+        Unique identifier for the transformer's class;
+        same identifier used in setup.py.
+        """
+        return u'courseware_toc'
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects any information that's necessary to build the table of
+        contents.
+        """
+        block_structure.request_xblock_fields(*cls.FIELDS_TO_COLLECT)
+
+    def transform(self, usage_info, block_structure):
+        """
+        No runtime transformations are performed.
+        """
+        pass
@@ -18,7 +18,7 @@ from django.contrib.auth.models import User
 from django.db import transaction
 from django.db.utils import IntegrityError
 from xblock.fields import Scope
-from courseware.models import StudentModule, BaseStudentModuleHistory
+from courseware.models import StudentModule, BaseStudentModuleHistory, batch_history_writes, chunks
 from edx_user_state_client.interface import XBlockUserStateClient, XBlockUserState
 
 log = logging.getLogger(__name__)
@@ -47,6 +47,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
     # Use this sample rate for DataDog events.
     API_DATADOG_SAMPLE_RATE = 0.1
 
+    # Maximum number of users whose state is loaded with each query by get_many_for_users.
+    USERS_CHUNK_SIZE = 100
+
     class ServiceUnavailable(XBlockUserStateClient.ServiceUnavailable):
         """
         This error is raised if the service backing this client is currently unavailable.
@@ -100,6 +103,47 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                 usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
                 yield (student_module, usage_key)
 
+    def _get_student_modules_for_users(self, usernames, block_keys, stream):
+        """
+        Retrieve the :class:`~StudentModule`s for the supplied ``usernames`` and ``block_keys``,
+        loading the modules of up to USERS_CHUNK_SIZE users with each query.
+
+        Arguments:
+            usernames (list of str): The names of the users to load `StudentModule`s for.
+            block_keys (list of :class:`~UsageKey`): The set of XBlocks to load data for.
+            stream (bool): Whether to stream the results of each query, rather than caching them.
+
+        Yields:
+            (username, student_module, usage_key) tuples.
+        """
+        usernames_by_id = dict(
+            itertools.chain.from_iterable(
+                User.objects.filter(username__in=usernames_chunk).values_list('id', 'username')
+                for usernames_chunk in chunks(set(usernames), self.USERS_CHUNK_SIZE)
+            )
+        )
+
+        course_key_func = attrgetter('course_key')
+        by_course = itertools.groupby(
+            sorted(block_keys, key=course_key_func),
+            course_key_func,
+        )
+
+        for course_key, usage_keys in by_course:
+            usage_keys = list(usage_keys)
+            for user_ids in chunks(usernames_by_id, self.USERS_CHUNK_SIZE):
+                query = StudentModule.objects.chunked_filter(
+                    'module_state_key__in',
+                    usage_keys,
+                    student_id__in=user_ids,
+                    course_id=course_key,
+                    iterator=stream,
+                )
+
+                for student_module in query:
+                    usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
+                    yield (usernames_by_id[student_module.student_id], student_module, usage_key)
+
     def _ddog_increment(self, evt_time, evt_name):
         """
         DataDog increment method.
@@ -183,20 +227,57 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported, not {}".format(scope))
 
+        modules = (
+            (username, module, usage_key)
+            for module, usage_key in self._get_student_modules(username, block_keys)
+        )
+        for user_state in self._get_user_states('get_many', modules, len(block_keys), scope, fields):
+            yield user_state
+
+    def get_many_for_users(self, usernames, block_keys, scope=Scope.user_state, fields=None, stream=True):
+        """
+        Retrieve the stored XBlock state of each of the specified users for the specified XBlock usages,
+        with a query per chunk of users and blocks, rather than separate queries for each user.
+
+        Arguments:
+            usernames: The names of the users whose state should be retrieved
+            block_keys ([UsageKey]): A list of UsageKeys identifying which xblock states to load.
+            scope (Scope): The scope to load data from
+            fields: A list of field values to retrieve. If None, retrieve all stored fields.
+            stream (bool): Whether to read the results of each query with a database cursor,
+                rather than caching all of them in memory.
+
+        Yields:
+            XBlockUserState tuples for each specified user and UsageKey in block_keys, in no
+            particular order.  Each is identified by its (username, block_key) pair.
+            field_state is a dict mapping field names to values.
+        """
+        if scope != Scope.user_state:
+            raise ValueError("Only Scope.user_state is supported, not {}".format(scope))
+
+        modules = self._get_student_modules_for_users(usernames, block_keys, stream)
+        num_blocks_requested = len(block_keys) * len(usernames)
+        for user_state in self._get_user_states('get_many_for_users', modules, num_blocks_requested, scope, fields):
+            yield user_state
+
+    def _get_user_states(self, function_name, modules, num_blocks_requested, scope, fields):
+        """
+        Yields the XBlockUserState of each of the given (username, StudentModule, UsageKey) modules,
+        while recording the metrics of the calling function_name.
+        """
         total_block_count = 0
         evt_time = time()
 
         # count how many times this function gets called
-        self._nr_stat_increment('get_many', 'calls')
+        self._nr_stat_increment(function_name, 'calls')
 
         # keep track of blocks requested
-        self._ddog_histogram(evt_time, 'get_many.blks_requested', len(block_keys))
-        self._nr_stat_accumulate('get_many', 'blocks_requested', len(block_keys))
+        self._ddog_histogram(evt_time, '{}.blks_requested'.format(function_name), num_blocks_requested)
+        self._nr_stat_accumulate(function_name, 'blocks_requested', num_blocks_requested)
 
-        modules = self._get_student_modules(username, block_keys)
-        for module, usage_key in modules:
+        for username, module, usage_key in modules:
             if module.state is None:
-                self._ddog_increment(evt_time, 'get_many.empty_state')
+                self._ddog_increment(evt_time, '{}.empty_state'.format(function_name))
                 continue
 
             state = json.loads(module.state)
@@ -204,7 +285,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
             # record this metric before the check for empty state, so that we
             # have some visibility into empty blocks.
-            self._ddog_histogram(evt_time, 'get_many.block_size', state_length)
+            self._ddog_histogram(evt_time, '{}.block_size'.format(function_name), state_length)
 
             # If the state is the empty dict, then it has been deleted, and so
             # conformant UserStateClients should treat it as if it doesn't exist.
@@ -212,8 +293,8 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                 continue
 
             # collect statistics for metric reporting
-            self._nr_block_stat_increment('get_many', usage_key.block_type, 'blocks_out')
-            self._nr_block_stat_accumulate('get_many', usage_key.block_type, 'size', state_length)
+            self._nr_block_stat_increment(function_name, usage_key.block_type, 'blocks_out')
+            self._nr_block_stat_accumulate(function_name, usage_key.block_type, 'size', state_length)
             total_block_count += 1
 
             # filter state on fields
@@ -229,9 +310,9 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         finish_time = time()
         duration = (finish_time - evt_time) * 1000  # milliseconds
 
-        self._ddog_histogram(evt_time, 'get_many.blks_out', total_block_count)
-        self._ddog_histogram(evt_time, 'get_many.response_time', duration)
-        self._nr_stat_accumulate('get_many', 'duration', duration)
+        self._ddog_histogram(evt_time, '{}.blks_out'.format(function_name), total_block_count)
+        self._ddog_histogram(evt_time, '{}.response_time'.format(function_name), duration)
+        self._nr_stat_accumulate(function_name, 'duration', duration)
 
     def set_many(self, username, block_keys_to_state, scope=Scope.user_state):
         """
@@ -267,65 +348,67 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         evt_time = time()
 
-        for usage_key, state in block_keys_to_state.items():
-            student_module, created = StudentModule.objects.get_or_create(
-                student=user,
-                course_id=usage_key.course_key,
-                module_state_key=usage_key,
-                defaults={
-                    'state': json.dumps(state),
-                    'module_type': usage_key.block_type,
-                },
-            )
-
-            num_fields_before = num_fields_after = num_new_fields_set = len(state)
-            num_fields_updated = 0
-            if not created:
-                if student_module.state is None:
-                    current_state = {}
+        # The history entries of all of the blocks are written with one insert.
+        with batch_history_writes():
+            for usage_key, state in block_keys_to_state.items():
+                student_module, created = StudentModule.objects.get_or_create(
+                    student=user,
+                    course_id=usage_key.course_key,
+                    module_state_key=usage_key,
+                    defaults={
+                        'state': json.dumps(state),
+                        'module_type': usage_key.block_type,
+                    },
+                )
+
+                num_fields_before = num_fields_after = num_new_fields_set = len(state)
+                num_fields_updated = 0
+                if not created:
+                    if student_module.state is None:
+                        current_state = {}
+                    else:
+                        current_state = json.loads(student_module.state)
+                    num_fields_before = len(current_state)
+                    current_state.update(state)
+                    num_fields_after = len(current_state)
+                    student_module.state = json.dumps(current_state)
+                    try:
+                        with transaction.atomic():
+                            # Updating the object - force_update guarantees no INSERT will occur.
+                            student_module.save(force_update=True)
+                    except IntegrityError:
+                        # The UPDATE above failed. Log information - but ignore the error.
+                        # See https://openedx.atlassian.net/browse/TNL-5365
+                        log.warning("set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
+                            user, repr(unicode(usage_key.course_key)), usage_key
+                        ))
+                        log.warning("set_many: All {} block keys: {}".format(
+                            len(block_keys_to_state), block_keys_to_state.keys()
+                        ))
+
+                # DataDog and New Relic reporting
+
+                # record the size of state modifications
+                self._nr_block_stat_accumulate('set_many', usage_key.block_type, 'size', len(student_module.state))
+
+                # Record whether a state row has been created or updated.
+                if created:
+                    self._ddog_increment(evt_time, 'set_many.state_created')
+                    self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_created')
                 else:
-                    current_state = json.loads(student_module.state)
-                num_fields_before = len(current_state)
-                current_state.update(state)
-                num_fields_after = len(current_state)
-                student_module.state = json.dumps(current_state)
-                try:
-                    with transaction.atomic():
-                        # Updating the object - force_update guarantees no INSERT will occur.
-                        student_module.save(force_update=True)
-                except IntegrityError:
-                    # The UPDATE above failed. Log information - but ignore the error.
-                    # See https://openedx.atlassian.net/browse/TNL-5365
-                    log.warning("set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
-                        user, repr(unicode(usage_key.course_key)), usage_key
-                    ))
-                    log.warning("set_many: All {} block keys: {}".format(
-                        len(block_keys_to_state), block_keys_to_state.keys()
-                    ))
-
-            # DataDog and New Relic reporting
-
-            # record the size of state modifications
-            self._nr_block_stat_accumulate('set_many', usage_key.block_type, 'size', len(student_module.state))
-
-            # Record whether a state row has been created or updated.
-            if created:
-                self._ddog_increment(evt_time, 'set_many.state_created')
-                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_created')
-            else:
-                self._ddog_increment(evt_time, 'set_many.state_updated')
-                self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_updated')
+                    self._ddog_increment(evt_time, 'set_many.state_updated')
+                    self._nr_block_stat_increment('set_many', usage_key.block_type, 'blocks_updated')
 
-            # Event to record number of fields sent in to set/set_many.
-            self._ddog_histogram(evt_time, 'set_many.fields_in', len(state))
+                # Event to record number of fields sent in to set/set_many.
+                self._ddog_histogram(evt_time, 'set_many.fields_in', len(state))
 
-            # Event to record number of new fields set in set/set_many.
-            num_new_fields_set = num_fields_after - num_fields_before
-            self._ddog_histogram(evt_time, 'set_many.fields_set', num_new_fields_set)
+                # Event to record number of new fields set in set/set_many.
+                num_new_fields_set = num_fields_after - num_fields_before
+                self._ddog_histogram(evt_time, 'set_many.fields_set', num_new_fields_set)
 
-            # Event to record number of existing fields updated in set/set_many.
-            num_fields_updated = max(0, len(state) - num_new_fields_set)
-            self._ddog_histogram(evt_time, 'set_many.fields_updated', num_fields_updated)
+                # Event to record number of existing fields updated in set/set_many.
+                num_fields_updated = max(0, len(state) - num_new_fields_set)
+                self._ddog_histogram(evt_time, 'set_many.fields_updated', num_fields_updated)
 
         # Events for the entire set_many call.
         finish_time = time()
@@ -374,10 +457,12 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         finish_time = time()
         self._ddog_histogram(evt_time, 'delete_many.response_time', (finish_time - evt_time) * 1000)
 
-    def get_history(self, username, block_key, scope=Scope.user_state):
+    def get_history(self, username, block_key, scope=Scope.user_state, start=None, end=None):
         """
         Retrieve history of state changes for a given block for a given
         student.  We don't guarantee that history for many blocks will be fast.
+        The history may be limited to a range of time, which is read with the
+        index of each student module's history by time.
 
         If the specified block doesn't exist, raise :class:`~DoesNotExist`.
 
@@ -385,6 +470,8 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             username: The name of the user whose history should be retrieved.
             block_key: The key identifying which xblock history to retrieve.
             scope (Scope): The scope to load data from.
+            start (datetime): If given, only list the modifications made at or after this time.
+            end (datetime): If given, only list the modifications made before this time.
 
         Yields:
             XBlockUserState entries for each modification to the specified XBlock, from latest
@@ -401,7 +488,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if len(student_modules) == 0:
             raise self.DoesNotExist()
 
-        history_entries = BaseStudentModuleHistory.get_history(student_modules)
+        history_entries = BaseStudentModuleHistory.get_history(student_modules, start=start, end=end)
 
         # If no history records exist, raise an error
         if not history_entries:
@@ -0,0 +1,329 @@
+"""
+Deferred writes of XBlock user state fields which don't affect scores, such as
+the position in a sequence or the state of the video player.
+
+When the STUDENT_MODULE_WRITE_BEHIND setting is enabled, :class:`UserStateCache`
+doesn't write the configured fields to StudentModule while handling the request.
+Instead they are buffered, per user, in the Django cache, where they are also read
+from, and repeated writes of a block's fields are coalesced until a celery task
+flushes all of the user's pending writes to StudentModule at once.
+
+The setting is a dict of:
+
+    ENABLED: Whether to defer the writes.
+    FIELDS: A dict of the names of the fields whose writes are deferred, by block type.
+        The fields of block types which can have a score (whose class has_score) are
+        never deferred, even if they're listed.
+    DELAY: The number of seconds over which writes are coalesced before they're flushed.
+    TIMEOUT: The number of seconds for which pending writes are kept in the cache. Writes
+        which haven't been flushed by then, for instance because no worker ran the task,
+        are lost.
+
+Each write is appended, under its own cache key, to the user's log of pending
+writes, so that concurrent requests never overwrite each other's writes. The log
+is split into generations. A flush atomically moves the user on to the next
+generation (with ``cache.incr``), and then seals the previous ones by adding
+``SEALED`` to their lengths, so that a write which is still being appended to
+them is either counted before the seal, and read by the flush, or moves on to
+the next generation. The flushed generations are only deleted once they've been
+written, so writes made during a flush are left for the next one, and writes
+which fail to be flushed are flushed again.
+
+Writes are written synchronously if the flush task can't be queued, but pending
+writes are only as durable as the cache, so only fields whose loss is tolerable
+should be deferred.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from opaque_keys.edx.keys import CourseKey, UsageKey
+from openedx.core.lib.cache_utils import memoized
+from xblock.core import XBlock
+
+log = logging.getLogger(__name__)
+
+# The user's current generation of pending writes, which writes are appended to.
+GENERATION_KEY = u'courseware.user_state_write_behind.generation.{}'
+# The user's first generation of pending writes which hasn't been flushed.
+FLUSHED_KEY = u'courseware.user_state_write_behind.flushed.{}'
+# The number of writes appended to a generation of the user's pending writes.
+LENGTH_KEY = u'courseware.user_state_write_behind.length.{}.{}'
+# A write appended to a generation of the user's pending writes.
+WRITE_KEY = u'courseware.user_state_write_behind.write.{}.{}.{}'
+FLUSH_SCHEDULED_KEY = u'courseware.user_state_write_behind.scheduled.{}'
+
+# Added to the length of a generation when it's sealed.
+SEALED = 10 ** 9
+# The number of times a write which was counted in a sealed generation retries in the next one.
+APPEND_ATTEMPTS = 5
+# The number of times, and the number of seconds apart, that a flush reads the writes
+# which were counted but not yet stored in the generations it sealed.
+SETTLE_ATTEMPTS = 3
+SETTLE_DELAY = 0.1
+
+
+def _get_write_behind_settings():
+    """
+    Returns the STUDENT_MODULE_WRITE_BEHIND setting.
+    """
+    return getattr(settings, 'STUDENT_MODULE_WRITE_BEHIND', {})
+
+
+def is_write_behind_enabled():
+    """
+    Returns whether writes of the configured user state fields are deferred.
+    """
+    return _get_write_behind_settings().get('ENABLED', False)
+
+
+def defer_writes(user, client, block_keys_to_state):
+    """
+    Buffers the writes of the deferred fields of the given state, and schedules
+    them to be flushed. If the flush can't be scheduled, all of the user's
+    pending writes are written now with the given XBlockUserStateClient.
+
+    Arguments:
+        user (User): The user whose state is being written.
+        client (XBlockUserStateClient): The client to write with if the flush
+            can't be scheduled.
+        block_keys_to_state (dict): A dict mapping UsageKeys to state dicts.
+
+    Returns:
+        A dict mapping UsageKeys to the state dicts of the fields which must
+        still be written now.
+    """
+    if not is_write_behind_enabled() or user.is_anonymous():
+        return block_keys_to_state
+
+    scored_block_types = _scored_block_types()
+    deferred_fields = {
+        block_type: fields
+        for block_type, fields in _get_write_behind_settings().get('FIELDS', {}).iteritems()
+        if block_type not in scored_block_types
+    }
+    deferred = {}
+    remaining = {}
+    for usage_key, state in block_keys_to_state.iteritems():
+        fields = deferred_fields.get(usage_key.block_type, ())
+        for field_name, value in state.iteritems():
+            if field_name in fields:
+                deferred.setdefault(usage_key, {})[field_name] = value
+            else:
+                remaining.setdefault(usage_key, {})[field_name] = value
+
+    if deferred:
+        if not _append_write(user, {usage_key: (state, ()) for usage_key, state in deferred.iteritems()}):
+            for usage_key, state in deferred.iteritems():
+                remaining.setdefault(usage_key, {}).update(state)
+        elif not _schedule_flush(user):
+            # The pending writes stay in the cache until they've been written.
+            flush_pending_writes(user, client)
+    return remaining
+
+
+@memoized
+def _scored_block_types():
+    """
+    Returns the block types which can have a score, whose fields are never deferred.
+    """
+    return frozenset(
+        block_type for (block_type, xblock_class) in XBlock.load_classes()
+        if getattr(xblock_class, 'has_score', False)
+    )
+
+
+def get_pending_writes(user, block_keys=None):
+    """
+    Returns a dict mapping UsageKeys to the state dicts of the user's writes
+    which haven't been flushed yet, optionally limited to the given blocks.
+    """
+    if not is_write_behind_enabled() or user.is_anonymous():
+        return {}
+    first_generation, generation = _get_generations(user)
+    write_keys = _get_write_keys(user, first_generation, generation)
+    pending = _read_writes(write_keys, cache.get_many(write_keys))
+    if block_keys is not None:
+        block_keys = set(block_keys)
+        pending = {usage_key: state for usage_key, state in pending.iteritems() if usage_key in block_keys}
+    return pending
+
+
+def discard_pending_writes(user, usage_key, fields):
+    """
+    Discards the user's pending writes of the given fields of a block, so that
+    they don't overwrite a later deletion of those fields.
+    """
+    state = get_pending_writes(user, [usage_key]).get(usage_key)
+    if not state or not any(field_name in state for field_name in fields):
+        return
+    _append_write(user, {usage_key: ({}, list(fields))})
+
+
+def _get_generations(user):
+    """
+    Returns the first generation of the user's pending writes which hasn't been
+    flushed, and the current generation.
+    """
+    generation_key = GENERATION_KEY.format(user.id)
+    flushed_key = FLUSHED_KEY.format(user.id)
+    stored = cache.get_many([generation_key, flushed_key])
+    generation = stored.get(generation_key)
+    if generation is None:
+        cache.add(generation_key, 0, None)
+        generation = cache.get(generation_key, 0)
+    return min(stored.get(flushed_key, generation), generation), generation
+
+
+def _append_write(user, write):
+    """
+    Appends a write to the user's current generation of pending writes.
+    Returns False if the cache couldn't count the write, so it wasn't appended.
+
+    Arguments:
+        write (dict): A dict mapping UsageKeys to tuples of the state dict of the
+            fields written, and of the names of the fields deleted.
+    """
+    timeout = _get_write_behind_settings().get('TIMEOUT', 60 * 60)
+    stored = {
+        unicode(usage_key): (unicode(usage_key.course_key), state, deleted_fields)
+        for usage_key, (state, deleted_fields) in write.iteritems()
+    }
+    for __ in xrange(APPEND_ATTEMPTS):
+        __, generation = _get_generations(user)
+        length_key = LENGTH_KEY.format(user.id, generation)
+        cache.add(length_key, 0, timeout)
+        try:
+            index = cache.incr(length_key)
+        except ValueError:
+            log.warning(u'Failed to count the pending user state writes of user %s', user.id)
+            return False
+        if index < SEALED:
+            cache.set(WRITE_KEY.format(user.id, generation, index), stored, timeout)
+            return True
+        # The generation was sealed by a flush, which has moved on to the next one.
+
+    log.warning(u'Failed to append to the pending user state writes of user %s', user.id)
+    return False
+
+
+def _seal_generation(user, generation):
+    """
+    Seals a generation of the user's pending writes, so that no more writes are
+    appended to it, and returns the number of writes appended to it.
+    """
+    length_key = LENGTH_KEY.format(user.id, generation)
+    cache.add(length_key, 0, _get_write_behind_settings().get('TIMEOUT', 60 * 60))
+    try:
+        return cache.incr(length_key, SEALED) % SEALED
+    except ValueError:
+        # The length expired since it was added, and so did the writes.
+        return 0
+
+
+def _get_write_keys(user, first_generation, last_generation):
+    """
+    Returns the cache keys of the user's pending writes in the given
+    generations, in the order in which they were written.
+    """
+    length_keys = [
+        LENGTH_KEY.format(user.id, generation)
+        for generation in xrange(first_generation, last_generation + 1)
+    ]
+    lengths = cache.get_many(length_keys)
+    return [
+        WRITE_KEY.format(user.id, generation, index)
+        for generation, length_key in zip(xrange(first_generation, last_generation + 1), length_keys)
+        # Writes which were counted after the generation was sealed are never stored.
+        for index in xrange(1, lengths.get(length_key, 0) % SEALED + 1)
+    ]
+
+
+def _read_writes(write_keys, writes):
+    """
+    Returns the result of the pending writes with the given keys, found in the
+    given dict of writes by key, applied in order, as a dict mapping UsageKeys
+    to state dicts.
+    """
+    pending = {}
+    for write_key in write_keys:
+        # Writes can be missing if they're being appended, or have expired.
+        for usage_id, (course_id, state, deleted_fields) in writes.get(write_key, {}).iteritems():
+            block_state = pending.setdefault((usage_id, course_id), {})
+            block_state.update(state)
+            for field_name in deleted_fields:
+                block_state.pop(field_name, None)
+    return {
+        # Deprecated usage keys don't include the run of their course, so they're mapped back into it.
+        UsageKey.from_string(usage_id).map_into_course(CourseKey.from_string(course_id)): state
+        for (usage_id, course_id), state in pending.iteritems()
+        if state
+    }
+
+
+def _schedule_flush(user):
+    """
+    Schedules the flush of the user's pending writes, unless one has already been
+    scheduled in the current window. Returns False if the flush couldn't be queued.
+    """
+    # Imported here, since the task module imports this one.
+    from courseware.tasks import flush_user_state_writes
+
+    delay = _get_write_behind_settings().get('DELAY', 5)
+    if not cache.add(FLUSH_SCHEDULED_KEY.format(user.id), True, delay):
+        return True
+    try:
+        flush_user_state_writes.apply_async((user.id,), countdown=delay)
+    except Exception:  # pylint: disable=broad-except
+        log.exception(u'Failed to schedule the flush of the user state writes of user %s', user.id)
+        cache.delete(FLUSH_SCHEDULED_KEY.format(user.id))
+        return False
+    return True
+
+
+def flush_pending_writes(user, client):
+    """
+    Writes all of the user's pending writes with the given XBlockUserStateClient.
+    Returns the number of blocks written.
+
+    Writes made while flushing are left for the next flush. If the writes fail,
+    they're kept, to be flushed again, and the error is raised.
+    """
+    # Writes appended to the next generation schedule another flush.
+    cache.delete(FLUSH_SCHEDULED_KEY.format(user.id))
+
+    first_generation, generation = _get_generations(user)
+    generation_key = GENERATION_KEY.format(user.id)
+    try:
+        next_generation = cache.incr(generation_key)
+    except ValueError:
+        # The generation was evicted since it was read.
+        next_generation = generation + 1
+        cache.add(generation_key, next_generation, None)
+
+    write_keys = []
+    for flushed_generation in xrange(first_generation, next_generation):
+        write_keys.extend(
+            WRITE_KEY.format(user.id, flushed_generation, index)
+            for index in xrange(1, _seal_generation(user, flushed_generation) + 1)
+        )
+
+    writes = cache.get_many(write_keys)
+    for __ in xrange(SETTLE_ATTEMPTS):
+        # Writes which were counted before the seal may not have been stored yet.
+        missing_keys = [write_key for write_key in write_keys if write_key not in writes]
+        if not missing_keys:
+            break
+        time.sleep(SETTLE_DELAY)
+        writes.update(cache.get_many(missing_keys))
+
+    pending = _read_writes(write_keys, writes)
+    if pending:
+        client.set_many(user.username, pending)
+
+    # The lengths of the flushed generations are left to expire, so that writes
+    # which are still being appended to them find them sealed.
+    cache.set(FLUSHED_KEY.format(user.id), next_generation, None)
+    cache.delete_many(write_keys)
+    return len(pending)
@@ -38,6 +38,7 @@ from xmodule.x_module import STUDENT_VIEW
 from survey.utils import must_answer_survey
 
 from ..access import has_access, _adjust_start_date_for_beta_testers
+from ..access_context import access_context
 from ..access_utils import in_preview_mode
 from ..courses import get_studio_url, get_course_with_access
 from ..entrance_exams import (
@@ -103,7 +104,10 @@ class CoursewareIndex(View):
                 self.course = get_course_with_access(request.user, 'load', self.course_key, depth=CONTENT_DEPTH)
                 self.is_staff = has_access(request.user, 'staff', self.course)
                 self._setup_masquerade_for_effective_user()
-                return self._get(request)
+                with access_context(self.effective_user, self.course_key) as context:
+                    response = self._get(request)
+                self._record_access_context(context)
+                return response
         except Redirect as redirect_error:
             return redirect(redirect_error.url)
         except UnicodeEncodeError:
@@ -177,6 +181,14 @@ class CoursewareIndex(View):
         newrelic.agent.add_custom_parameter('course_id', unicode(self.course_key))
         newrelic.agent.add_custom_parameter('org', unicode(self.course_key.org))
 
+    def _record_access_context(self, context):
+        """
+        Record in New Relic how many access checks were answered in memory,
+        and how many had to be computed.
+        """
+        newrelic.agent.add_custom_parameter('access_checks_memoized', context.hits)
+        newrelic.agent.add_custom_parameter('access_checks_computed', context.misses)
+
     def _clean_position(self):
         """
         Verify that the given position is an integer. If it is not positive, set it to 1.
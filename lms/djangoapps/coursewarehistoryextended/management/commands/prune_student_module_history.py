@@ -0,0 +1,84 @@
+"""
+Delete the StudentModuleHistoryExtended records older than the retention period.
+
+The records are deleted oldest first, in chunks of consecutive ids, so that each
+delete only locks a small range of the table.
+"""
+from datetime import datetime, timedelta
+import logging
+from time import sleep
+from pytz import utc
+from textwrap import dedent
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from coursewarehistoryextended.models import StudentModuleHistoryExtended
+
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Delete the StudentModuleHistoryExtended records older than the retention period.
+    """
+    help = dedent(__doc__).strip()
+
+    def add_arguments(self, parser):
+        """
+        Add arguments to the command parser.
+        """
+        parser.add_argument(
+            '--days',
+            dest='days',
+            type=int,
+            default=settings.STUDENTMODULEHISTORYEXTENDED_RETENTION_DAYS,
+            help='Number of days of history to keep. Defaults to STUDENTMODULEHISTORYEXTENDED_RETENTION_DAYS.',
+        )
+        parser.add_argument(
+            '--chunk_size',
+            dest='chunk_size',
+            type=int,
+            default=1000,
+            help='Maximum number of records to delete at once.',
+        )
+        parser.add_argument(
+            '--sleep',
+            dest='sleep',
+            type=float,
+            default=0,
+            help='Number of seconds to wait between deletes.',
+        )
+        parser.add_argument(
+            '--dry_run',
+            action='store_true',
+            default=False,
+            dest='dry_run',
+            help="Output how many records would be deleted, but don't delete them.",
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] is None:
+            raise CommandError('No retention period: set STUDENTMODULEHISTORYEXTENDED_RETENTION_DAYS or use --days.')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk_size must be positive.')
+
+        cutoff = datetime.now(utc) - timedelta(days=options['days'])
+        expired = StudentModuleHistoryExtended.objects.filter(created__lt=cutoff)
+
+        if options['dry_run']:
+            log.info(u'prune_student_module_history: would delete %d records created before %s', expired.count(), cutoff)
+            return
+
+        num_deleted = 0
+        while True:
+            ids = list(expired.order_by('id').values_list('id', flat=True)[:options['chunk_size']])
+            if not ids:
+                break
+            StudentModuleHistoryExtended.objects.filter(id__in=ids).delete()
+            num_deleted += len(ids)
+            if options['sleep']:
+                sleep(options['sleep'])
+
+        log.info(u'prune_student_module_history: deleted %d records created before %s', num_deleted, cutoff)
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coursewarehistoryextended', '0002_force_studentmodule_index'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='studentmodulehistoryextended',
+            index_together=set([('student_module',), ('student_module', 'created')]),
+        ),
+    ]
@@ -17,7 +17,7 @@ from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 from coursewarehistoryextended.fields import UnsignedBigIntAutoField
-from courseware.models import StudentModule, BaseStudentModuleHistory
+from courseware.models import StudentModule, BaseStudentModuleHistory, save_history_entry
 
 
 class StudentModuleHistoryExtended(BaseStudentModuleHistory):
@@ -31,7 +31,8 @@ class StudentModuleHistoryExtended(BaseStudentModuleHistory):
     class Meta(object):
         app_label = 'coursewarehistoryextended'
         get_latest_by = "created"
-        index_together = ['student_module']
+        # The index on student_module and created serves the reads of a range of a module's history.
+        index_together = [['student_module'], ['student_module', 'created']]
 
     id = UnsignedBigIntAutoField(primary_key=True)  # pylint: disable=invalid-name
 
@@ -51,7 +52,7 @@ class StudentModuleHistoryExtended(BaseStudentModuleHistory):
                                                          state=instance.state,
                                                          grade=instance.grade,
                                                          max_grade=instance.max_grade)
-            history_entry.save()
+            save_history_entry(history_entry)
 
     @receiver(post_delete, sender=StudentModule)
     def delete_history(sender, instance, **kwargs):  # pylint: disable=no-self-argument, unused-argument
@@ -6,13 +6,17 @@ backend tables.
 """
 
 import json
+from datetime import datetime, timedelta
 from mock import patch
+from pytz import utc
+from django.core.management import call_command
 from django.test import TestCase
 from django.conf import settings
 from unittest import skipUnless
 from nose.plugins.attrib import attr
 
-from courseware.models import BaseStudentModuleHistory, StudentModuleHistory, StudentModule
+from courseware.models import BaseStudentModuleHistory, StudentModuleHistory, StudentModule, batch_history_writes
+from coursewarehistoryextended.models import StudentModuleHistoryExtended
 
 from courseware.tests.factories import StudentModuleFactory, location, course_id
 
@@ -79,3 +83,50 @@ class TestStudentModuleHistoryBackends(TestCase):
         student_module = StudentModule.objects.all()
         history = BaseStudentModuleHistory.get_history(student_module)
         self.assertEquals(len(history), 0)
+
+
+@attr(shard=1)
+@skipUnless(settings.FEATURES["ENABLE_CSMH_EXTENDED"], "CSMH Extended needs to be enabled")
+@patch.dict("django.conf.settings.FEATURES", {"ENABLE_CSMH_EXTENDED": True})
+@patch.dict("django.conf.settings.FEATURES", {"ENABLE_READING_FROM_MULTIPLE_HISTORY_TABLES": False})
+class TestStudentModuleHistoryStorage(TestCase):
+    """ Tests of batching, reading ranges of and pruning CSMHE """
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def _create_modules(self, num_modules):
+        """ Creates StudentModules, and so their history, with the given number of blocks """
+        for record in range(num_modules):
+            StudentModuleFactory.create(module_state_key=location('usage_id_{}'.format(record)),
+                                        course_id=course_id,
+                                        state=json.dumps({'order': record}))
+
+    def _age_history(self, days):
+        """ Makes all of the CSMHE records the given number of days older """
+        for entry in StudentModuleHistoryExtended.objects.all():
+            StudentModuleHistoryExtended.objects.filter(id=entry.id).update(created=entry.created - timedelta(days=days))
+
+    def test_batch_history_writes(self):
+        with self.assertNumQueries(1, using='student_module_history'):
+            with batch_history_writes():
+                with self.assertNumQueries(0, using='student_module_history'):
+                    self._create_modules(3)
+        self.assertEquals(StudentModuleHistoryExtended.objects.count(), 3)
+
+    def test_get_history_range(self):
+        self._create_modules(2)
+        self._age_history(10)
+        self._create_modules(1)
+        start = datetime.now(utc) - timedelta(days=1)
+        student_modules = StudentModule.objects.all()
+        self.assertEquals(len(BaseStudentModuleHistory.get_history(student_modules, start=start)), 1)
+        self.assertEquals(len(BaseStudentModuleHistory.get_history(student_modules, end=start)), 2)
+
+    def test_prune_history(self):
+        self._create_modules(3)
+        self._age_history(60)
+        self._create_modules(1)
+        call_command('prune_student_module_history', days=30, chunk_size=2)
+        history = StudentModuleHistoryExtended.objects.all()
+        self.assertEquals(len(history), 1)
+        self.assertEquals({'order': 0}, json.loads(history[0].state))
@@ -3,6 +3,7 @@ CourseGrade Class
 """
 
 from collections import defaultdict, namedtuple, OrderedDict
+from itertools import islice
 from logging import getLogger
 
 from django.conf import settings
@@ -17,6 +18,7 @@ from openedx.core.djangoapps.signals.signals import COURSE_GRADE_CHANGED
 from xmodule import block_metadata_utils
 
 from ..models import PersistentCourseGrade
+from .prefetch import prefetch_scores
 from .subsection_grade import SubsectionGradeFactory
 from ..transformer import GradesTransformer
 
@@ -28,7 +30,7 @@ class CourseGrade(object):
     """
     Course Grade class
     """
-    def __init__(self, student, course, course_structure):
+    def __init__(self, student, course, course_structure, prefetched_scores=None):
         self.student = student
         self.course = course
         self._percent = None
@@ -40,7 +42,9 @@ class CourseGrade(object):
             self.course_version = getattr(course_block, 'course_version', None)
             self.course_edited_timestamp = getattr(course_block, 'subtree_edited_on', None)
 
-        self._subsection_grade_factory = SubsectionGradeFactory(self.student, self.course, self.course_structure)
+        self._subsection_grade_factory = SubsectionGradeFactory(
+            self.student, self.course, self.course_structure, prefetched_scores,
+        )
 
     @lazy
     def graded_subsections_by_format(self):
@@ -220,19 +224,25 @@ class CourseGrade(object):
         )
 
     @classmethod
-    def load_persisted_grade(cls, user, course, course_structure):
+    def load_persisted_grade(cls, user, course, course_structure, prefetched_scores=None):
         """
-        Initializes a CourseGrade object, filling its members with persisted values from the database.
+        Initializes a CourseGrade object, filling its members with persisted values from the database,
+        or from the user's prefetched_scores if given.
 
         If the grading policy is out of date, recomputes the grade.
 
         If no persisted values are found, returns None.
         """
-        try:
-            persistent_grade = PersistentCourseGrade.read_course_grade(user.id, course.id)
-        except PersistentCourseGrade.DoesNotExist:
-            return None
-        course_grade = CourseGrade(user, course, course_structure)
+        if prefetched_scores:
+            persistent_grade = prefetched_scores.course_grade
+            if persistent_grade is None:
+                return None
+        else:
+            try:
+                persistent_grade = PersistentCourseGrade.read_course_grade(user.id, course.id)
+            except PersistentCourseGrade.DoesNotExist:
+                return None
+        course_grade = CourseGrade(user, course, course_structure, prefetched_scores)
 
         current_grading_policy_hash = course_grade.get_grading_policy_hash(course.location, course_structure)
         if current_grading_policy_hash != persistent_grade.grading_policy_hash:
@@ -328,6 +338,9 @@ class CourseGradeFactory(object):
     """
     Factory class to create Course Grade objects
     """
+    # Number of students whose scores are prefetched together by iter.
+    PREFETCH_CHUNK_SIZE = 100
+
     def create(self, student, course, collected_block_structure=None, read_only=True):
         """
         Returns the CourseGrade object for the given student and course.
@@ -335,6 +348,13 @@ class CourseGradeFactory(object):
         If read_only is True, doesn't save any updates to the grades.
         Raises a PermissionDenied if the user does not have course access.
         """
+        return self._create(student, course, collected_block_structure, read_only)
+
+    def _create(self, student, course, collected_block_structure=None, read_only=True, prefetched_scores=None):
+        """
+        Returns the CourseGrade object for the given student and course,
+        using the student's prefetched_scores if given.
+        """
         course_structure = get_course_blocks(
             student,
             course.location,
@@ -346,8 +366,8 @@ class CourseGradeFactory(object):
             raise PermissionDenied("User does not have access to this course")
 
         return (
-            self._get_saved_grade(student, course, course_structure) or
-            self._compute_and_update_grade(student, course, course_structure, read_only)
+            self._get_saved_grade(student, course, course_structure, prefetched_scores) or
+            self._compute_and_update_grade(student, course, course_structure, read_only, prefetched_scores)
         )
 
     GradeResult = namedtuple('GradeResult', ['student', 'course_grade', 'err_msg'])
@@ -369,10 +389,35 @@ class CourseGradeFactory(object):
         #    retrieved from the data store multiple times.
 
         collected_block_structure = get_block_structure_manager(course.id).get_collected()
+        students = iter(students)
+        while True:
+            students_chunk = list(islice(students, self.PREFETCH_CHUNK_SIZE))
+            if not students_chunk:
+                break
+            for result in self._iter_chunk(course, students_chunk, collected_block_structure):
+                yield result
+
+    def _iter_chunk(self, course, students, collected_block_structure):
+        """
+        Yields a GradeResult for each of the given students (list of User),
+        whose scores are prefetched together.
+        """
+        # Optimization: each student's scores are retrieved together with
+        # those of the other students in the chunk, rather than with
+        # separate queries for each student.
+        try:
+            all_prefetched_scores = prefetch_scores(course, students, collected_block_structure)
+        except Exception:  # pylint: disable=broad-except
+            # Fall back to retrieving the scores of each student separately.
+            log.exception(u'Cannot prefetch scores of students in course %s', course.id)
+            all_prefetched_scores = {}
+
         for student in students:
             with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=[u'action:{}'.format(course.id)]):
                 try:
-                    course_grade = CourseGradeFactory().create(student, course, collected_block_structure)
+                    course_grade = CourseGradeFactory()._create(  # pylint: disable=protected-access
+                        student, course, collected_block_structure, prefetched_scores=all_prefetched_scores.get(student.id),
+                    )
                     yield self.GradeResult(student, course_grade, "")
 
                 except Exception as exc:  # pylint: disable=broad-except
@@ -403,7 +448,7 @@ class CourseGradeFactory(object):
 
         return CourseGrade.get_persisted_grade(student, course)
 
-    def _get_saved_grade(self, student, course, course_structure):
+    def _get_saved_grade(self, student, course, course_structure, prefetched_scores=None):
         """
         Returns the saved grade for the given course and student.
         """
@@ -413,16 +458,17 @@ class CourseGradeFactory(object):
         return CourseGrade.load_persisted_grade(
             student,
             course,
-            course_structure
+            course_structure,
+            prefetched_scores,
         )
 
-    def _compute_and_update_grade(self, student, course, course_structure, read_only=False):
+    def _compute_and_update_grade(self, student, course, course_structure, read_only=False, prefetched_scores=None):
         """
         Freshly computes and updates the grade for the student and course.
 
         If read_only is True, doesn't save any updates to the grades.
         """
-        course_grade = CourseGrade(student, course, course_structure)
+        course_grade = CourseGrade(student, course, course_structure, prefetched_scores)
         course_grade.compute_and_update(read_only)
         return course_grade
 
@@ -0,0 +1,88 @@
+"""
+Bulk retrieval of the persisted grades and scores of many students, for
+computing their grades in a course with fewer queries.
+"""
+from collections import defaultdict, namedtuple
+
+from courseware.model_data import ScoresClient
+from lms.djangoapps.grades.config.models import PersistentGradesEnabledFlag
+from lms.djangoapps.grades.models import PersistentCourseGrade, PersistentSubsectionGrade
+from lms.djangoapps.grades.scores import possibly_scored
+from student.models import anonymous_id_for_user
+from submissions.models import ScoreSummary
+from submissions.serializers import UnannotatedScoreSerializer
+
+
+# The scores of a single student, as retrieved by prefetch_scores.
+#  course_grade: The student's PersistentCourseGrade, or None.
+#  subsection_grades: The student's PersistentSubsectionGrades, keyed by usage key.
+#  csm_scores: A ScoresClient with the student's scores in CSM.
+#  submissions_scores: The student's scores from the Submissions API, keyed by item id.
+PrefetchedScores = namedtuple(
+    'PrefetchedScores',
+    ['course_grade', 'subsection_grades', 'csm_scores', 'submissions_scores'],
+)
+
+
+def prefetch_scores(course, students, collected_block_structure):
+    """
+    Returns the PrefetchedScores of each of the given students (list of
+    User) in the given course, keyed by user id.
+
+    Each kind of score is retrieved for all of the students with a single
+    query.  CSM scores are retrieved for all of the possibly scored blocks
+    in the collected_block_structure of the course, so that they cover
+    every student's transformed course structure.
+    """
+    user_ids = [student.id for student in students]
+
+    if PersistentGradesEnabledFlag.feature_enabled(course.id):
+        course_grades = {
+            grade.user_id: grade
+            for grade in PersistentCourseGrade.bulk_read_course_grades(user_ids, course.id)
+        }
+        subsection_grades = defaultdict(dict)
+        for grade in PersistentSubsectionGrade.bulk_read_grades_for_users(user_ids, course.id):
+            subsection_grades[grade.user_id][grade.full_usage_key] = grade
+    else:
+        course_grades = {}
+        subsection_grades = None
+
+    scorable_locations = [block_key for block_key in collected_block_structure if possibly_scored(block_key)]
+    csm_scores = ScoresClient.bulk_create_for_locations(course.id, user_ids, scorable_locations)
+    submissions_scores = _get_submissions_scores(course, students)
+
+    return {
+        student.id: PrefetchedScores(
+            course_grade=course_grades.get(student.id),
+            subsection_grades=subsection_grades[student.id] if subsection_grades is not None else None,
+            csm_scores=csm_scores[student.id],
+            submissions_scores=submissions_scores[student.id],
+        )
+        for student in students
+    }
+
+
+def _get_submissions_scores(course, students):
+    """
+    Returns the scores stored by the Submissions API for each of the
+    given students in the given course, keyed by user id, in the format
+    returned by submissions.api.get_scores.
+
+    The Submissions API only retrieves the scores of one student at a
+    time, so its models are queried directly.
+    """
+    # The anonymous ids of students who have submitted anything are
+    # already saved, so they don't need to be saved again here.
+    anonymous_ids = {anonymous_id_for_user(student, course.id, save=False): student.id for student in students}
+
+    scores = {student.id: {} for student in students}
+    score_summaries = ScoreSummary.objects.filter(
+        student_item__course_id=unicode(course.id),
+        student_item__student_id__in=anonymous_ids.keys(),
+    ).select_related('latest', 'latest__submission', 'student_item')
+    for summary in score_summaries:
+        if not summary.latest.is_hidden():
+            user_id = anonymous_ids[summary.student_item.student_id]
+            scores[user_id][summary.student_item.item_id] = UnannotatedScoreSerializer(summary.latest).data
+    return scores
@@ -203,12 +203,17 @@ class SubsectionGradeFactory(object):
     """
     Factory for Subsection Grades.
     """
-    def __init__(self, student, course, course_structure):
+    def __init__(self, student, course, course_structure, prefetched_scores=None):
+        """
+        If given, the student's prefetched_scores (PrefetchedScores) are
+        used instead of querying the student's scores.
+        """
         self.student = student
         self.course = course
         self.course_structure = course_structure
+        self._prefetched_scores = prefetched_scores
 
-        self._cached_subsection_grades = None
+        self._cached_subsection_grades = prefetched_scores.subsection_grades if prefetched_scores else None
         self._unsaved_subsection_grades = []
 
     def create(self, subsection, read_only=False):
@@ -283,6 +288,8 @@ class SubsectionGradeFactory(object):
         Lazily queries and returns all the scores stored in the user
         state (in CSM) for the course, while caching the result.
         """
+        if self._prefetched_scores:
+            return self._prefetched_scores.csm_scores
         scorable_locations = [block_key for block_key in self.course_structure if possibly_scored(block_key)]
         return ScoresClient.create_for_locations(self.course.id, self.student.id, scorable_locations)
 
@@ -292,6 +299,8 @@ class SubsectionGradeFactory(object):
         Lazily queries and returns the scores stored by the
         Submissions API for the course, while caching the result.
         """
+        if self._prefetched_scores:
+            return self._prefetched_scores.submissions_scores
         anonymous_user_id = anonymous_id_for_user(self.student, self.course.id)
         return submissions_api.get_scores(unicode(self.course.id), anonymous_user_id)
 
@@ -27,6 +27,7 @@ from xmodule.modulestore.xml_importer import import_course_from_xml
 
 from ..models import PersistentSubsectionGrade
 from ..new.course_grade import CourseGradeFactory
+from ..new.prefetch import prefetch_scores
 from ..new.subsection_grade import SubsectionGrade, SubsectionGradeFactory
 from .utils import mock_get_score, mock_get_submissions_score
 
@@ -136,6 +137,26 @@ class TestCourseGradeFactory(GradeTestBase):
         self.assertIsNone(course_grade.letter_grade)
         self.assertEqual(course_grade.percent, 0.0)
 
+    @patch.object(CourseGradeFactory, 'PREFETCH_CHUNK_SIZE', 2)
+    def test_iter(self):
+        students = [self.request.user, UserFactory(), UserFactory()]
+        for student in students[1:]:
+            CourseEnrollment.enroll(student, self.course.id)
+
+        with mock_get_score(1, 2):
+            with patch(
+                'lms.djangoapps.grades.new.course_grade.prefetch_scores',
+                wraps=prefetch_scores,
+            ) as mock_prefetch_scores:
+                grade_results = list(CourseGradeFactory().iter(self.course, students))
+
+        self.assertEqual(mock_prefetch_scores.call_count, 2)
+        self.assertEqual([result.student for result in grade_results], students)
+        for result in grade_results:
+            self.assertEqual(result.err_msg, "")
+            self.assertEqual(result.course_grade.letter_grade, u'Pass')
+            self.assertEqual(result.course_grade.percent, 0.5)
+
     def test_get_persisted(self):
         grade_factory = CourseGradeFactory()
         # first, create a grade in the database
@@ -37,6 +37,7 @@ class GradesTransformer(BlockStructureTransformer):
     """
     WRITE_VERSION = 4
     READ_VERSION = 4
+    SUBTREE_LOCAL_COLLECT = True
     FIELDS_TO_COLLECT = [u'due', u'format', u'graded', u'has_score', u'weight', u'course_version', u'subtree_edited_on']
 
     EXPLICIT_GRADED_FIELD_NAME = 'explicit_graded'
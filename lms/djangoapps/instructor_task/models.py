@@ -17,10 +17,11 @@ import csv
 import json
 import hashlib
 import os.path
+from tempfile import SpooledTemporaryFile
 
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files.base import File
 from django.db import models, transaction
 
 from openedx.core.storage import get_storage
@@ -175,12 +176,17 @@ class InstructorTask(models.Model):
         return json.dumps({'message': 'Task revoked before running'})
 
 
+# Maximum size of a report that is buffered in memory before it is stored.
+# Larger reports are buffered in a temporary file instead.
+REPORT_MAX_MEMORY_SIZE = 5 * 1024 * 1024
+
+
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. Rows may be passed in as any iterable, including generators,
+    which are written out as they are consumed so that the whole dataset
+    need not be held in memory.
     """
     @classmethod
     def from_config(cls, config_name):
@@ -264,12 +270,63 @@ class DjangoStorageReportStore(ReportStore):
         """
         Given a course_id, filename, and rows (each row is an iterable of
         strings), write the rows to the storage backend in csv format.
+
+        `rows` is consumed as it is written, into a buffer that is spooled
+        to a temporary file once it exceeds REPORT_MAX_MEMORY_SIZE.
+        """
+        with SpooledTemporaryFile(max_size=REPORT_MAX_MEMORY_SIZE) as output_buffer:
+            csvwriter = csv.writer(output_buffer)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            output_buffer.seek(0)
+            self.store(course_id, filename, File(output_buffer))
+
+    def merge_rows(self, course_id, filename, chunk_filenames, header_row):
+        """
+        Given a course_id, filename, and the filenames of CSV chunks that
+        were stored with `store_rows`, write the header row followed by
+        the rows of each chunk to the storage backend in csv format, and
+        delete the chunks.  Chunks that do not exist are skipped.
+
+        Returns the number of merged chunks.
+        """
+        chunk_paths = [self.path_to(course_id, chunk_filename) for chunk_filename in chunk_filenames]
+        chunk_paths = [chunk_path for chunk_path in chunk_paths if self.storage.exists(chunk_path)]
+        if not chunk_paths:
+            return 0
+
+        with SpooledTemporaryFile(max_size=REPORT_MAX_MEMORY_SIZE) as output_buffer:
+            csvwriter = csv.writer(output_buffer)
+            csvwriter.writerows(self._get_utf8_encoded_rows([header_row]))
+            for chunk_path in chunk_paths:
+                with self.storage.open(chunk_path) as chunk_file:
+                    for chunk in chunk_file.chunks():
+                        output_buffer.write(chunk)
+            output_buffer.seek(0)
+            self.store(course_id, filename, File(output_buffer))
+
+        for chunk_path in chunk_paths:
+            self.storage.delete(chunk_path)
+        return len(chunk_paths)
+
+    def missing_chunks(self, course_id, chunk_filenames):
+        """
+        Given a course_id and the filenames of CSV chunks, return the
+        filenames of the chunks which were not stored.
+        """
+        return [
+            chunk_filename for chunk_filename in chunk_filenames
+            if not self.storage.exists(self.path_to(course_id, chunk_filename))
+        ]
+
+    def delete_chunks(self, course_id, chunk_filenames):
+        """
+        Given a course_id and the filenames of CSV chunks, delete the
+        chunks which exist.
         """
-        output_buffer = ContentFile('')
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        output_buffer.seek(0)
-        self.store(course_id, filename, output_buffer)
+        for chunk_filename in chunk_filenames:
+            chunk_path = self.path_to(course_id, chunk_filename)
+            if self.storage.exists(chunk_path):
+                self.storage.delete(chunk_path)
 
     def links_for(self, course_id):
         """
@@ -497,6 +497,21 @@ def update_subtask_status(entry_id, current_task_id, new_subtask_status, retry_c
         _release_subtask_lock(current_task_id)
 
 
+def update_subtask_progress(entry_id, current_task_id, new_subtask_status):
+    """
+    Update the status of a subtask that is still in progress in the parent InstructorTask object,
+    so that the progress of each subtask can be monitored.
+
+    Unlike update_subtask_status(), the lock on the subtask is kept, and failures to update are
+    only logged, since a later update will supersede this one.
+    """
+    try:
+        _update_subtask_status(entry_id, current_task_id, new_subtask_status)
+    except DatabaseError:
+        TASK_LOG.info("Failed to update progress for subtask %s of instructor task %d with status %s",
+                      current_task_id, entry_id, new_subtask_status)
+
+
 @transaction.atomic
 def _update_subtask_status(entry_id, current_task_id, new_subtask_status):
     """
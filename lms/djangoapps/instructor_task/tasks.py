@@ -27,6 +27,7 @@ from django.utils.translation import ugettext_noop
 
 from celery import task
 from bulk_email.tasks import perform_delegate_email_batches
+from lms.djangoapps.instructor_task.subtasks import SubtaskStatus
 from lms.djangoapps.instructor_task.tasks_helper import (
     run_main_task,
     BaseInstructorTask,
@@ -36,6 +37,7 @@ from lms.djangoapps.instructor_task.tasks_helper import (
     delete_problem_module_state,
     upload_problem_responses_csv,
     upload_grades_csv,
+    upload_grades_csv_shard,
     upload_problem_grade_report,
     upload_students_csv,
     cohort_students_and_upload,
@@ -176,6 +178,26 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_grades_csv_shard(entry_id, course_id, user_ids, shard_index, timestamp, action_name, subtask_status_dict):
+    """
+    Grade a shard of the students of a course for a calculate_grades_csv
+    task that was split into subtasks.
+
+    The progress of the shard is recorded in the subtasks of the
+    InstructorTask entry, so its status is returned in a form that can
+    be serialized by Celery into JSON.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    TASK_LOG.info(
+        u"Task: %s, InstructorTask ID: %s, Task type: %s, Preparing to grade shard %s of %s students",
+        subtask_status.task_id, entry_id, action_name, shard_index, len(user_ids)
+    )
+    return upload_grades_csv_shard(
+        entry_id, course_id, user_ids, shard_index, timestamp, action_name, subtask_status
+    ).to_dict()
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     """
@@ -8,7 +8,7 @@ import logging
 from StringIO import StringIO
 from collections import OrderedDict
 from datetime import datetime
-from itertools import chain
+from itertools import chain, count
 from time import time
 
 import dogstats_wrapper as dog_stats_api
@@ -18,6 +18,7 @@ from celery import Task, current_task
 from celery.states import SUCCESS, FAILURE
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.files.storage import DefaultStorage
 from django.db import reset_queries
 from django.db.models import Q
@@ -59,10 +60,18 @@ from shoppingcart.models import (
 )
 from openassessment.data import OraAggregateData
 from lms.djangoapps.instructor_task.models import ReportStore, InstructorTask, PROGRESS
+from lms.djangoapps.instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_progress,
+    update_subtask_status,
+)
 from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort
 from openedx.core.djangoapps.course_groups.models import CourseUserGroup
-from opaque_keys.edx.keys import UsageKey
+from opaque_keys.edx.keys import CourseKey, UsageKey
 from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, is_course_cohorted
 from student.models import CourseEnrollment, CourseAccessRole
 from survey.models import SurveyAnswer
@@ -89,6 +98,12 @@ GRADES_RESCORE_EVENT_TYPE = 'edx.grades.problem.rescored'
 # The setting name used for events when "settings" (account settings, preferences, profile information) change.
 REPORT_REQUESTED_EVENT_NAME = u'edx.instructor.report.requested'
 
+# Format of the timestamps in the filenames of reports.
+REPORT_TIMESTAMP_FORMAT = "%Y-%m-%d-%H%M"
+
+# Header row of the grade report's error report.
+GRADE_REPORT_ERR_HEADER = ["id", "username", "error_msg"]
+
 
 class BaseInstructorTask(Task):
     """
@@ -175,6 +190,14 @@ class BaseInstructorTask(Task):
             entry.save_now()
 
 
+class GradeReportIncompleteError(Exception):
+    """
+    Error signaling that some of the shards of a sharded grade report
+    failed, so the report was not published.
+    """
+    pass
+
+
 class UpdateProblemModuleStateError(Exception):
     """
     Error signaling a fatal condition while updating problem modules.
@@ -648,22 +671,31 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
                 [row1_colum1, row1_colum2, ...],
                 ...
             ]
+            Any iterable of rows may be given, such as a generator, whose
+            rows are written as they are generated.
         csv_name: Name of the resulting CSV
         course_id: ID of the course
     """
     report_store = ReportStore.from_config(config_name)
     report_store.store_rows(
         course_id,
-        u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-            course_prefix=course_filename_prefix_generator(course_id),
-            csv_name=csv_name,
-            timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-        ),
+        _report_filename(csv_name, course_id, timestamp.strftime(REPORT_TIMESTAMP_FORMAT)),
         rows
     )
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": csv_name, })
 
 
+def _report_filename(csv_name, course_id, timestamp_str):
+    """
+    Returns the filename of the CSV report with the given name.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp_str
+    )
+
+
 def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at, config_name='FINANCIAL_REPORTS'):
     """
     Upload Executive Summary Html file using ReportStore.
@@ -690,7 +722,7 @@ def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": report_name})
 
 
-def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):  # pylint: disable=too-many-statements
+def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
     """
     For a given `course_id`, generate a grades CSV file for all students that
     are enrolled, and store using a `ReportStore`. Once created, the files can
@@ -699,13 +731,17 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
     that are visible in ReportStore will be complete ones.
 
+    If the course has more than GRADES_DOWNLOAD_STUDENTS_PER_SHARD enrolled
+    students, the students are instead graded by subtasks, each of which
+    stores a chunk of the CSV files.  The last subtask to complete merges
+    the chunks into the final files.
+
     As we start to add more CSV downloads, it will probably be worthwhile to
     make a more general CSVDoc class instead of building out the rows like we
     do here.
     """
     start_time = time()
     start_date = datetime.now(UTC)
-    status_interval = 100
     enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
     total_enrolled_students = enrolled_students.count()
     task_progress = TaskProgress(action_name, total_enrolled_students, start_time)
@@ -719,25 +755,17 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     )
     TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
-    course = get_course_by_id(course_id)
-    course_is_cohorted = is_course_cohorted(course.id)
-    teams_enabled = course.teams_enabled
-    cohorts_header = ['Cohort Name'] if course_is_cohorted else []
-    teams_header = ['Team Name'] if teams_enabled else []
-
-    experiment_partitions = get_split_user_partitions(course.user_partitions)
-    group_configs_header = [u'Experiment Group ({})'.format(partition.name) for partition in experiment_partitions]
-
-    certificate_info_header = ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
-    certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
-    whitelisted_user_ids = [entry.user_id for entry in certificate_whitelist]
+    students_per_shard = settings.GRADES_DOWNLOAD_STUDENTS_PER_SHARD
+    if students_per_shard and total_enrolled_students > students_per_shard:
+        TASK_LOG.info(u'%s, Task type: %s, Queuing grade report shards', task_info_string, action_name)
+        return _queue_grade_report_shards(
+            _entry_id, course_id, enrolled_students, total_enrolled_students, action_name, start_date
+        )
 
-    # Loop over all our students and build our CSV lists in memory
-    rows = []
-    err_rows = [["id", "username", "error_msg"]]
+    course = get_course_by_id(course_id)
+    report_context = _GradeReportContext(course)
     current_step = {'step': 'Calculating Grades'}
 
-    student_counter = 0
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s',
         task_info_string,
@@ -746,62 +774,97 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
         total_enrolled_students,
     )
 
-    graded_assignments = _graded_assignments(course_id)
-    grade_header = []
-    for assignment_info in graded_assignments.itervalues():
-        if assignment_info['use_subsection_headers']:
-            grade_header.extend(assignment_info['subsection_headers'].itervalues())
-        grade_header.append(assignment_info['average_header'])
-
-    rows.append(
-        ["Student ID", "Email", "Username", "Grade"] +
-        grade_header +
-        cohorts_header +
-        group_configs_header +
-        teams_header +
-        ['Enrollment Track', 'Verification Status'] +
-        certificate_info_header
+    # The rows are uploaded as the students are graded, rather than being
+    # built up in memory.  Only the error rows are kept.
+    err_rows = []
+    rows = _grade_report_rows(
+        report_context,
+        enrolled_students,
+        total_enrolled_students,
+        task_progress,
+        lambda: task_progress.update_task_state(extra_meta=current_step),
+        task_info_string,
+        action_name,
+        current_step,
+        err_rows,
     )
+    upload_csv_to_report_store(chain([report_context.header_row()], rows), 'grade_report', course_id, start_date)
 
-    for student, course_grade, err_msg in CourseGradeFactory().iter(course, enrolled_students):
-        # Periodically update task status (this is a cache write)
-        if task_progress.attempted % status_interval == 0:
-            task_progress.update_task_state(extra_meta=current_step)
-        task_progress.attempted += 1
+    TASK_LOG.info(
+        u'%s, Task type: %s, Current step: %s, Grade calculation completed for students: %s/%s',
+        task_info_string,
+        action_name,
+        current_step,
+        task_progress.attempted,
+        total_enrolled_students
+    )
 
-        # Now add a log entry after each student is graded to get a sense
-        # of the task's progress
-        student_counter += 1
-        TASK_LOG.info(
-            u'%s, Task type: %s, Current step: %s, Grade calculation in-progress for students: %s/%s',
-            task_info_string,
-            action_name,
-            current_step,
-            student_counter,
-            total_enrolled_students
-        )
+    current_step = {'step': 'Uploading CSVs'}
+    task_progress.update_task_state(extra_meta=current_step)
+    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
 
-        if not course_grade:
-            # An empty gradeset means we failed to grade a student.
-            task_progress.failed += 1
-            err_rows.append([student.id, student.username, err_msg])
-            continue
+    # If there are any error rows, write them out as well
+    if err_rows:
+        upload_csv_to_report_store([GRADE_REPORT_ERR_HEADER] + err_rows, 'grade_report_err', course_id, start_date)
 
-        # We were able to successfully grade this student for this course.
-        task_progress.succeeded += 1
+    # One last update before we close out...
+    TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
+    return task_progress.update_task_state(extra_meta=current_step)
+
+
+class _GradeReportContext(object):
+    """
+    Course-wide data used to build the rows of a course's grade report.
+    """
+    def __init__(self, course):
+        self.course = course
+        self.course_is_cohorted = is_course_cohorted(course.id)
+        self.teams_enabled = course.teams_enabled
+        self.experiment_partitions = get_split_user_partitions(course.user_partitions)
+
+        certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course.id, whitelist=True)
+        self.whitelisted_user_ids = set(entry.user_id for entry in certificate_whitelist)
+
+        self.graded_assignments = _graded_assignments(course.id)
+
+    def header_row(self):
+        """
+        Returns the header row of the grade report.
+        """
+        grade_header = []
+        for assignment_info in self.graded_assignments.itervalues():
+            if assignment_info['use_subsection_headers']:
+                grade_header.extend(assignment_info['subsection_headers'].itervalues())
+            grade_header.append(assignment_info['average_header'])
+
+        return (
+            ["Student ID", "Email", "Username", "Grade"] +
+            grade_header +
+            (['Cohort Name'] if self.course_is_cohorted else []) +
+            [u'Experiment Group ({})'.format(partition.name) for partition in self.experiment_partitions] +
+            (['Team Name'] if self.teams_enabled else []) +
+            ['Enrollment Track', 'Verification Status'] +
+            ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
+        )
+
+    def student_row(self, student, course_grade):
+        """
+        Returns the grade report row of the given student.
+        """
+        course_id = self.course.id
 
         cohorts_group_name = []
-        if course_is_cohorted:
+        if self.course_is_cohorted:
             group = get_cohort(student, course_id, assign=False)
             cohorts_group_name.append(group.name if group else '')
 
         group_configs_group_names = []
-        for partition in experiment_partitions:
+        for partition in self.experiment_partitions:
             group = LmsPartitionService(student, course_id).get_group(partition, assign=False)
             group_configs_group_names.append(group.name if group else '')
 
         team_name = []
-        if teams_enabled:
+        if self.teams_enabled:
             try:
                 membership = CourseTeamMembership.objects.get(user=student, team__course_id=course_id)
                 team_name.append(membership.team.name)
@@ -818,11 +881,11 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             student,
             course_id,
             course_grade.letter_grade,
-            student.id in whitelisted_user_ids
+            student.id in self.whitelisted_user_ids
         )
 
         grade_results = []
-        for assignment_type, assignment_info in graded_assignments.iteritems():
+        for assignment_type, assignment_info in self.graded_assignments.iteritems():
             for subsection_location in assignment_info['subsection_headers']:
                 try:
                     subsection_grade = course_grade.graded_subsections_by_format[assignment_type][subsection_location]
@@ -841,36 +904,231 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
 
         grade_results = list(chain.from_iterable(grade_results))
 
-        rows.append(
+        return (
             [student.id, student.email, student.username, course_grade.percent] +
             grade_results + cohorts_group_name + group_configs_group_names + team_name +
             [enrollment_mode] + [verification_status] + certificate_info
         )
 
-    TASK_LOG.info(
-        u'%s, Task type: %s, Current step: %s, Grade calculation completed for students: %s/%s',
-        task_info_string,
+
+def _grade_report_rows(
+        report_context, students, num_students, task_progress, update_progress, task_info_string, action_name,
+        current_step, err_rows,
+):
+    """
+    Grades the given students and yields the rows of the grade report,
+    without its header row, while appending the rows of its error report
+    to the given err_rows list.
+
+    The 'attempted', 'succeeded' and 'failed' counts of the given
+    task_progress (TaskProgress or SubtaskStatus) are updated for each
+    student, and update_progress is periodically called to report them.
+    """
+    status_interval = 100
+
+    for student, course_grade, err_msg in CourseGradeFactory().iter(report_context.course, students):
+        # Periodically update task status (this is a cache write)
+        if task_progress.attempted % status_interval == 0:
+            update_progress()
+        task_progress.attempted += 1
+
+        # Now add a log entry after each student is graded to get a sense
+        # of the task's progress
+        TASK_LOG.info(
+            u'%s, Task type: %s, Current step: %s, Grade calculation in-progress for students: %s/%s',
+            task_info_string,
+            action_name,
+            current_step,
+            task_progress.attempted,
+            num_students
+        )
+
+        if not course_grade:
+            # An empty gradeset means we failed to grade a student.
+            task_progress.failed += 1
+            err_rows.append([student.id, student.username, err_msg])
+            continue
+
+        # We were able to successfully grade this student for this course.
+        task_progress.succeeded += 1
+        yield report_context.student_row(student, course_grade)
+
+
+def _queue_grade_report_shards(
+        entry_id, course_id, enrolled_students, total_enrolled_students, action_name, start_date,
+):
+    """
+    Queues the subtasks that grade the given enrolled students for
+    upload_grades_csv, GRADES_DOWNLOAD_STUDENTS_PER_SHARD students each,
+    and returns the task progress as stored in the InstructorTask.
+    """
+    # Import here to avoid a circular import with the tasks module.
+    from lms.djangoapps.instructor_task.tasks import calculate_grades_csv_shard
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    # As with bulk email, the task may be requeued after a loss of connection
+    # to the broker, in which case its shards have already been queued.
+    if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+        TASK_LOG.warning(u"Task %s has already queued its grade report shards", entry.task_id)
+        return json.loads(entry.task_output)
+
+    # Make sure the collected block structure of the course is in the
+    # cache, so that every shard grades its students with it.
+    get_block_structure_manager(course_id).get_collected()
+
+    timestamp = start_date.strftime(REPORT_TIMESTAMP_FORMAT)
+    shard_indices = count()
+
+    def _create_shard_subtask(item_list, initial_subtask_status):
+        """Creates a subtask to grade the students in the given item list."""
+        return calculate_grades_csv_shard.subtask(
+            (
+                entry_id,
+                unicode(course_id),
+                [item['pk'] for item in item_list],
+                next(shard_indices),
+                timestamp,
+                action_name,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    return queue_subtasks_for_query(
+        entry,
         action_name,
-        current_step,
-        student_counter,
-        total_enrolled_students
+        _create_shard_subtask,
+        [enrolled_students.order_by('id')],
+        [],
+        settings.GRADES_DOWNLOAD_STUDENTS_PER_SHARD,
+        total_enrolled_students,
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
-    current_step = {'step': 'Uploading CSVs'}
-    task_progress.update_task_state(extra_meta=current_step)
-    TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
 
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
+def upload_grades_csv_shard(entry_id, course_id, user_ids, shard_index, timestamp, action_name, subtask_status):
+    """
+    Grades the students with the given user_ids for a sharded
+    upload_grades_csv task and stores their rows as a chunk of the grade
+    report.  Once the last shard of the task completes, the chunks of
+    all shards are merged into the final grade report.
 
-    # If there are any error rows (don't count the header), write them out as well
-    if len(err_rows) > 1:
-        upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
+    Returns the updated SubtaskStatus.
+    """
+    current_task_id = subtask_status.task_id
+    course_key = CourseKey.from_string(course_id)
+    task_info_string = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}, Shard: {shard}'.format(
+        task_id=current_task_id,
+        entry_id=entry_id,
+        course_id=course_id,
+        shard=shard_index,
+    )
+    current_step = {'step': 'Calculating Grades'}
 
-    # One last update before we close out...
-    TASK_LOG.info(u'%s, Task type: %s, Finalizing grade task', task_info_string, action_name)
-    return task_progress.update_task_state(extra_meta=current_step)
+    # Raises DuplicateTaskException if the shard was already run.
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    course = get_course_by_id(course_key)
+    try:
+        subtask_status.state = PROGRESS
+        err_rows = []
+        rows = _grade_report_rows(
+            _GradeReportContext(course),
+            User.objects.filter(id__in=user_ids).order_by('id'),
+            len(user_ids),
+            subtask_status,
+            lambda: update_subtask_progress(entry_id, current_task_id, subtask_status),
+            task_info_string,
+            action_name,
+            current_step,
+            err_rows,
+        )
+
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        report_store.store_rows(course_key, _grade_report_chunk_name(entry_id, 'grade_report', shard_index), rows)
+        if err_rows:
+            report_store.store_rows(
+                course_key, _grade_report_chunk_name(entry_id, 'grade_report_err', shard_index), err_rows
+            )
+    except Exception:
+        # Since we don't know how far the shard got, we count all of its
+        # students as having failed, which keeps the counts consistent.
+        TASK_LOG.exception(u'%s, Grade report shard failed unexpectedly', task_info_string)
+        subtask_status = SubtaskStatus.create(current_task_id, failed=len(user_ids), state=FAILURE)
+        _complete_grade_report_shard(entry_id, course, timestamp, subtask_status)
+        raise
+
+    TASK_LOG.info(u'%s, Stored grade report chunk for students: %s', task_info_string, len(user_ids))
+    subtask_status.state = SUCCESS
+    _complete_grade_report_shard(entry_id, course, timestamp, subtask_status)
+    return subtask_status
+
+
+def _complete_grade_report_shard(entry_id, course, timestamp, subtask_status):
+    """
+    Records the final status of a grade report shard and, if it was the
+    last shard of the task to complete, merges the chunks of all shards.
+    """
+    update_subtask_status(entry_id, subtask_status.task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    if entry.task_state == SUCCESS and cache.add(u'grade-report-merge-{}'.format(entry_id), 'true'):
+        _merge_grade_report_chunks(entry, course, timestamp)
+
+
+def _merge_grade_report_chunks(entry, course, timestamp):
+    """
+    Merges the chunks stored by the shards of the given completed
+    InstructorTask into the final grade report files.
+
+    If any shard failed, or its chunk is missing, the report would lack
+    that shard's students, so instead of publishing it, the chunks are
+    deleted and the InstructorTask is marked as failed.
+    """
+    subtask_dict = json.loads(entry.subtasks)
+    num_shards = subtask_dict['total']
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+    chunk_names = {
+        csv_name: [_grade_report_chunk_name(entry.id, csv_name, index) for index in xrange(num_shards)]
+        for csv_name in ('grade_report', 'grade_report_err')
+    }
+
+    missing_chunks = report_store.missing_chunks(course.id, chunk_names['grade_report'])
+    if subtask_dict['failed'] or missing_chunks:
+        error = GradeReportIncompleteError(
+            u'Grade report not published: {} of {} shards failed or did not store their rows'.format(
+                max(subtask_dict['failed'], len(missing_chunks)),
+                num_shards,
+            )
+        )
+        TASK_LOG.error(u'InstructorTask ID: %s, %s', entry.id, error.message)
+        for csv_chunk_names in chunk_names.itervalues():
+            report_store.delete_chunks(course.id, csv_chunk_names)
+        entry.task_output = InstructorTask.create_output_for_failure(error, None)
+        entry.task_state = FAILURE
+        entry.save_now()
+        return
+
+    for csv_name, header_row in (
+            ('grade_report', _GradeReportContext(course).header_row()),
+            ('grade_report_err', GRADE_REPORT_ERR_HEADER),
+    ):
+        filename = _report_filename(csv_name, course.id, timestamp)
+        if report_store.merge_rows(course.id, filename, chunk_names[csv_name], header_row):
+            tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": csv_name, })
+
+
+def _grade_report_chunk_name(entry_id, csv_name, shard_index):
+    """
+    Returns the filename of a shard's chunk of a grade report.  Chunks
+    are stored in a subdirectory, so they are not listed as reports.
+    """
+    return u"{csv_name}_chunks_{entry_id}/{shard_index:05d}.csv".format(
+        csv_name=csv_name,
+        entry_id=entry_id,
+        shard_index=shard_index,
+    )
 
 
 def _graded_assignments(course_key):
@@ -983,44 +1241,52 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
     graded_scorable_blocks = _graded_scorable_blocks_to_header(course_id)
 
     # Just generate the static fields for now.
-    rows = [list(header_row.values()) + ['Grade'] + list(chain.from_iterable(graded_scorable_blocks.values()))]
+    header = list(header_row.values()) + ['Grade'] + list(chain.from_iterable(graded_scorable_blocks.values()))
     error_rows = [list(header_row.values()) + ['error_msg']]
     current_step = {'step': 'Calculating Grades'}
 
-    course = get_course_by_id(course_id)
-    for student, course_grade, err_msg in CourseGradeFactory().iter(course, enrolled_students):
-        student_fields = [getattr(student, field_name) for field_name in header_row]
-        task_progress.attempted += 1
+    def _problem_grade_rows():
+        """
+        Grades the students and yields the rows of the successfully graded
+        students, while appending those of the others to error_rows.
+        """
+        course = get_course_by_id(course_id)
+        for student, course_grade, err_msg in CourseGradeFactory().iter(course, enrolled_students):
+            student_fields = [getattr(student, field_name) for field_name in header_row]
+            task_progress.attempted += 1
 
-        if not course_grade:
-            # There was an error grading this student.
-            if not err_msg:
-                err_msg = u'Unknown error'
-            error_rows.append(student_fields + [err_msg])
-            task_progress.failed += 1
-            continue
+            if not course_grade:
+                # There was an error grading this student.
+                if not err_msg:
+                    err_msg = u'Unknown error'
+                error_rows.append(student_fields + [err_msg])
+                task_progress.failed += 1
+                continue
 
-        earned_possible_values = []
-        for block_location in graded_scorable_blocks:
-            try:
-                problem_score = course_grade.locations_to_scores[block_location]
-            except KeyError:
-                earned_possible_values.append([u'Not Available', u'Not Available'])
-            else:
-                if problem_score.attempted:
-                    earned_possible_values.append([problem_score.earned, problem_score.possible])
+            earned_possible_values = []
+            for block_location in graded_scorable_blocks:
+                try:
+                    problem_score = course_grade.locations_to_scores[block_location]
+                except KeyError:
+                    earned_possible_values.append([u'Not Available', u'Not Available'])
                 else:
-                    earned_possible_values.append([u'Not Attempted', problem_score.possible])
+                    if problem_score.attempted:
+                        earned_possible_values.append([problem_score.earned, problem_score.possible])
+                    else:
+                        earned_possible_values.append([u'Not Attempted', problem_score.possible])
 
-        rows.append(student_fields + [course_grade.percent] + list(chain.from_iterable(earned_possible_values)))
+            task_progress.succeeded += 1
+            if task_progress.attempted % status_interval == 0:
+                task_progress.update_task_state(extra_meta=current_step)
 
-        task_progress.succeeded += 1
-        if task_progress.attempted % status_interval == 0:
-            task_progress.update_task_state(extra_meta=current_step)
+            yield student_fields + [course_grade.percent] + list(chain.from_iterable(earned_possible_values))
 
-    # Perform the upload if any students have been successfully graded
-    if len(rows) > 1:
-        upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
+    # The rows are uploaded as the students are graded, rather than being
+    # built up in memory, once any student has been successfully graded.
+    rows = _problem_grade_rows()
+    first_row = next(rows, None)
+    if first_row is not None:
+        upload_csv_to_report_store(chain([header, first_row], rows), 'problem_grade_report', course_id, start_date)
     # If there are any error rows, write them out as well
     if len(error_rows) > 1:
         upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
@@ -1082,13 +1348,9 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
     )
     TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
-    # Loop over all our students and build our CSV lists in memory
-    rows = []
-    header = None
     current_step = {'step': 'Gathering Profile Information'}
     enrollment_report_provider = PaidCourseEnrollmentReportProvider()
     total_students = students_in_course.count()
-    student_counter = 0
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, generating detailed enrollment report for total students: %s',
         task_info_string,
@@ -1097,86 +1359,93 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
         total_students
     )
 
-    for student in students_in_course:
-        # Periodically update task status (this is a cache write)
-        if task_progress.attempted % status_interval == 0:
-            task_progress.update_task_state(extra_meta=current_step)
-        task_progress.attempted += 1
+    def _enrollment_report_rows():
+        """
+        Yields the header row followed by the row of each student.
+        """
+        header = None
+        for student in students_in_course.iterator():
+            # Periodically update task status (this is a cache write)
+            if task_progress.attempted % status_interval == 0:
+                task_progress.update_task_state(extra_meta=current_step)
+            task_progress.attempted += 1
 
-        # Now add a log entry after certain intervals to get a hint that task is in progress
-        student_counter += 1
-        if student_counter % 100 == 0:
-            TASK_LOG.info(
-                u'%s, Task type: %s, Current step: %s, gathering enrollment profile for students in progress: %s/%s',
-                task_info_string,
-                action_name,
-                current_step,
-                student_counter,
-                total_students
-            )
+            # Now add a log entry after certain intervals to get a hint that task is in progress
+            if task_progress.attempted % 100 == 0:
+                TASK_LOG.info(
+                    u'%s, Task type: %s, Current step: %s, '
+                    u'gathering enrollment profile for students in progress: %s/%s',
+                    task_info_string,
+                    action_name,
+                    current_step,
+                    task_progress.attempted,
+                    total_students
+                )
 
-        user_data = enrollment_report_provider.get_user_profile(student.id)
-        course_enrollment_data = enrollment_report_provider.get_enrollment_info(student, course_id)
-        payment_data = enrollment_report_provider.get_payment_info(student, course_id)
-
-        # display name map for the column headers
-        enrollment_report_headers = {
-            'User ID': _('User ID'),
-            'Username': _('Username'),
-            'Full Name': _('Full Name'),
-            'First Name': _('First Name'),
-            'Last Name': _('Last Name'),
-            'Company Name': _('Company Name'),
-            'Title': _('Title'),
-            'Language': _('Language'),
-            'Year of Birth': _('Year of Birth'),
-            'Gender': _('Gender'),
-            'Level of Education': _('Level of Education'),
-            'Mailing Address': _('Mailing Address'),
-            'Goals': _('Goals'),
-            'City': _('City'),
-            'Country': _('Country'),
-            'Enrollment Date': _('Enrollment Date'),
-            'Currently Enrolled': _('Currently Enrolled'),
-            'Enrollment Source': _('Enrollment Source'),
-            'Manual (Un)Enrollment Reason': _('Manual (Un)Enrollment Reason'),
-            'Enrollment Role': _('Enrollment Role'),
-            'List Price': _('List Price'),
-            'Payment Amount': _('Payment Amount'),
-            'Coupon Codes Used': _('Coupon Codes Used'),
-            'Registration Code Used': _('Registration Code Used'),
-            'Payment Status': _('Payment Status'),
-            'Transaction Reference Number': _('Transaction Reference Number')
-        }
+            user_data = enrollment_report_provider.get_user_profile(student.id)
+            course_enrollment_data = enrollment_report_provider.get_enrollment_info(student, course_id)
+            payment_data = enrollment_report_provider.get_payment_info(student, course_id)
+
+            # display name map for the column headers
+            enrollment_report_headers = {
+                'User ID': _('User ID'),
+                'Username': _('Username'),
+                'Full Name': _('Full Name'),
+                'First Name': _('First Name'),
+                'Last Name': _('Last Name'),
+                'Company Name': _('Company Name'),
+                'Title': _('Title'),
+                'Language': _('Language'),
+                'Year of Birth': _('Year of Birth'),
+                'Gender': _('Gender'),
+                'Level of Education': _('Level of Education'),
+                'Mailing Address': _('Mailing Address'),
+                'Goals': _('Goals'),
+                'City': _('City'),
+                'Country': _('Country'),
+                'Enrollment Date': _('Enrollment Date'),
+                'Currently Enrolled': _('Currently Enrolled'),
+                'Enrollment Source': _('Enrollment Source'),
+                'Manual (Un)Enrollment Reason': _('Manual (Un)Enrollment Reason'),
+                'Enrollment Role': _('Enrollment Role'),
+                'List Price': _('List Price'),
+                'Payment Amount': _('Payment Amount'),
+                'Coupon Codes Used': _('Coupon Codes Used'),
+                'Registration Code Used': _('Registration Code Used'),
+                'Payment Status': _('Payment Status'),
+                'Transaction Reference Number': _('Transaction Reference Number')
+            }
 
-        if not header:
-            header = user_data.keys() + course_enrollment_data.keys() + payment_data.keys()
-            display_headers = []
-            for header_element in header:
-                # translate header into a localizable display string
-                display_headers.append(enrollment_report_headers.get(header_element, header_element))
-            rows.append(display_headers)
+            if not header:
+                header = user_data.keys() + course_enrollment_data.keys() + payment_data.keys()
+                display_headers = []
+                for header_element in header:
+                    # translate header into a localizable display string
+                    display_headers.append(enrollment_report_headers.get(header_element, header_element))
+                yield display_headers
 
-        rows.append(user_data.values() + course_enrollment_data.values() + payment_data.values())
-        task_progress.succeeded += 1
+            task_progress.succeeded += 1
+            yield user_data.values() + course_enrollment_data.values() + payment_data.values()
+
+    # Loop over all our students and upload their rows as they are
+    # generated, rather than building our CSV lists in memory.
+    upload_csv_to_report_store(
+        _enrollment_report_rows(), 'enrollment_report', course_id, start_date, config_name='FINANCIAL_REPORTS'
+    )
 
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Detailed enrollment report generated for students: %s/%s',
         task_info_string,
         action_name,
         current_step,
-        student_counter,
+        task_progress.attempted,
         total_students
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
     current_step = {'step': 'Uploading CSVs'}
     task_progress.update_task_state(extra_meta=current_step)
     TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
 
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'enrollment_report', course_id, start_date, config_name='FINANCIAL_REPORTS')
-
     # One last update before we close out...
     TASK_LOG.info(u'%s, Task type: %s, Finalizing detailed enrollment task', task_info_string, action_name)
     return task_progress.update_task_state(extra_meta=current_step)
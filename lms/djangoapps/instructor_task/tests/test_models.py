@@ -9,6 +9,7 @@ import boto
 from django.conf import settings
 from django.test import SimpleTestCase, override_settings, TestCase
 from mock import patch
+import unicodecsv
 
 from common.test.utils import MockS3Mixin
 from lms.djangoapps.instructor_task.models import ReportStore
@@ -61,6 +62,39 @@ class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTe
         """
         return ReportStore.from_config(config_name='GRADES_DOWNLOAD')
 
+    def read_rows(self, report_store, filename):
+        """
+        Returns the rows of the given CSV file in the report store.
+        """
+        with report_store.storage.open(report_store.path_to(self.course_id, filename)) as csv_file:
+            return [row for row in unicodecsv.reader(csv_file, encoding='utf-8')]
+
+    @patch('lms.djangoapps.instructor_task.models.REPORT_MAX_MEMORY_SIZE', 64)
+    def test_store_rows_from_generator(self):
+        report_store = self.create_report_store()
+        rows = ([unicode(index), u'r\xf6w'] for index in range(100))
+        report_store.store_rows(self.course_id, 'report.csv', rows)
+        self.assertEqual(
+            self.read_rows(report_store, 'report.csv'),
+            [[unicode(index), u'r\xf6w'] for index in range(100)],
+        )
+
+    def test_merge_rows(self):
+        report_store = self.create_report_store()
+        report_store.store_rows(self.course_id, 'chunks/00000.csv', [['1'], ['2']])
+        report_store.store_rows(self.course_id, 'chunks/00002.csv', [['3']])
+
+        num_merged = report_store.merge_rows(
+            self.course_id,
+            'report.csv',
+            ['chunks/00000.csv', 'chunks/00001.csv', 'chunks/00002.csv'],
+            ['header'],
+        )
+        self.assertEqual(num_merged, 2)
+        self.assertEqual(self.read_rows(report_store, 'report.csv'), [['header'], ['1'], ['2'], ['3']])
+        self.assertEqual([link[0] for link in report_store.links_for(self.course_id)], ['report.csv'])
+        self.assertFalse(report_store.storage.exists(report_store.path_to(self.course_id, 'chunks/00000.csv')))
+
 
 @patch.dict(settings.GRADES_DOWNLOAD, {'STORAGE_TYPE': 's3'})
 class S3ReportStoreTestCase(MockS3Mixin, ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
@@ -8,11 +8,13 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 
 """
 
+import json
 import os
 import shutil
 from datetime import datetime
 import urllib
 
+from celery.states import SUCCESS, FAILURE
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.test.utils import override_settings
@@ -48,7 +50,7 @@ from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.partitions.partitions import Group, UserPartition
 
-from ..models import ReportStore
+from ..models import InstructorTask, ReportStore
 from ..tasks_helper import (
     cohort_students_and_upload,
     upload_problem_responses_csv,
@@ -65,6 +67,7 @@ from ..tasks_helper import (
     UPDATE_STATUS_SUCCEEDED,
 )
 
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     TestReportMixin,
@@ -313,6 +316,71 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
         result = upload_grades_csv(None, None, self.course.id, None, 'graded')
         self.assertDictContainsSubset({'attempted': 1, 'succeeded': 1, 'failed': 0}, result)
 
+    @override_settings(GRADES_DOWNLOAD_STUDENTS_PER_SHARD=2)
+    @patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task')
+    def test_sharded_grade_report(self, _mock_current_task):
+        """
+        Test that the grade report of a course with more students than
+        GRADES_DOWNLOAD_STUDENTS_PER_SHARD is merged from its shards.
+        """
+        students = [self.create_student(u'student{}'.format(i), u'student{}@example.com'.format(i)) for i in range(5)]
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_type='grade_course',
+            task_id='grade-course-task',
+            requester=self.create_instructor('instructor'),
+        )
+
+        upload_grades_csv(None, entry.id, self.course.id, None, 'graded')
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertDictContainsSubset({'total': 3, 'succeeded': 3, 'failed': 0}, json.loads(entry.subtasks))
+        self.assertDictContainsSubset(
+            {'attempted': 5, 'succeeded': 5, 'failed': 0},
+            json.loads(entry.task_output),
+        )
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(len(report_store.links_for(self.course.id)), 1)
+        self.verify_rows_in_csv(
+            [{'Student ID': unicode(student.id), 'Username': student.username} for student in students],
+            ignore_other_columns=True,
+        )
+
+    @override_settings(GRADES_DOWNLOAD_STUDENTS_PER_SHARD=2)
+    @patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task')
+    def test_sharded_grade_report_with_failed_shard(self, _mock_current_task):
+        """
+        Test that the grade report of a course is not published if one of
+        its shards fails.
+        """
+        for i in range(5):
+            self.create_student(u'student{}'.format(i), u'student{}@example.com'.format(i))
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_type='grade_course',
+            task_id='grade-course-task',
+            requester=self.create_instructor('instructor'),
+        )
+
+        def student_row(student, _course_grade):
+            """Fails to build the row of one of the students"""
+            if student.username == u'student4':
+                raise Exception('error')
+            return [student.id]
+
+        with patch(
+            'lms.djangoapps.instructor_task.tasks_helper._GradeReportContext.student_row',
+            side_effect=student_row,
+        ):
+            upload_grades_csv(None, entry.id, self.course.id, None, 'graded')
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(json.loads(entry.task_output)['exception'], 'GradeReportIncompleteError')
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(report_store.links_for(self.course.id), [])
+
 
 class TestTeamGradeReport(InstructorGradeReportTestCase):
     """ Test that teams appear correctly in the grade report when it is enabled for the course. """
@@ -267,6 +267,10 @@ BULK_EMAIL_ROUTING_KEY_SMALL_JOBS = ENV_TOKENS.get('BULK_EMAIL_ROUTING_KEY_SMALL
 # Queue to use for updating persistent grades
 RECALCULATE_GRADES_ROUTING_KEY = ENV_TOKENS.get('RECALCULATE_GRADES_ROUTING_KEY', LOW_PRIORITY_QUEUE)
 
+# Deferred writes of XBlock user state fields which don't affect scores
+STUDENT_MODULE_WRITE_BEHIND.update(ENV_TOKENS.get('STUDENT_MODULE_WRITE_BEHIND', {}))
+STUDENT_MODULE_WRITE_BEHIND_ROUTING_KEY = ENV_TOKENS.get('STUDENT_MODULE_WRITE_BEHIND_ROUTING_KEY', LOW_PRIORITY_QUEUE)
+
 # Message expiry time in seconds
 CELERY_EVENT_QUEUE_TTL = ENV_TOKENS.get('CELERY_EVENT_QUEUE_TTL', None)
 
@@ -552,6 +556,12 @@ XQUEUE_INTERFACE = AUTH_TOKENS['XQUEUE_INTERFACE']
 MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTORE', MODULESTORE))
 CONTENTSTORE = AUTH_TOKENS.get('CONTENTSTORE', CONTENTSTORE)
 DOC_STORE_CONFIG = AUTH_TOKENS.get('DOC_STORE_CONFIG', DOC_STORE_CONFIG)
+COURSE_STRUCTURE_LRU_CACHE_SIZE = ENV_TOKENS.get('COURSE_STRUCTURE_LRU_CACHE_SIZE', COURSE_STRUCTURE_LRU_CACHE_SIZE)
+COURSE_STRUCTURE_MMAP_STORE_DIR = ENV_TOKENS.get('COURSE_STRUCTURE_MMAP_STORE_DIR', COURSE_STRUCTURE_MMAP_STORE_DIR)
+COURSE_STRUCTURE_MMAP_STORE_MAX_SIZE = ENV_TOKENS.get(
+    'COURSE_STRUCTURE_MMAP_STORE_MAX_SIZE', COURSE_STRUCTURE_MMAP_STORE_MAX_SIZE
+)
+MODULESTORE_QUERY_PROFILING.update(ENV_TOKENS.get('MODULESTORE_QUERY_PROFILING', {}))
 MONGODB_LOG = AUTH_TOKENS.get('MONGODB_LOG', {})
 
 EMAIL_HOST_USER = AUTH_TOKENS.get('EMAIL_HOST_USER', '')  # django default is ''
@@ -603,6 +613,9 @@ BROKER_USE_SSL = ENV_TOKENS.get('CELERY_BROKER_USE_SSL', False)
 
 # Block Structures
 BLOCK_STRUCTURES_SETTINGS = ENV_TOKENS.get('BLOCK_STRUCTURES_SETTINGS', BLOCK_STRUCTURES_SETTINGS)
+COURSE_BLOCKS_TRANSFORMED_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'COURSE_BLOCKS_TRANSFORMED_CACHE_TIMEOUT', COURSE_BLOCKS_TRANSFORMED_CACHE_TIMEOUT
+)
 
 # upload limits
 STUDENT_FILEUPLOAD_MAX_SIZE = ENV_TOKENS.get("STUDENT_FILEUPLOAD_MAX_SIZE", STUDENT_FILEUPLOAD_MAX_SIZE)
@@ -630,6 +643,9 @@ VERIFY_STUDENT = AUTH_TOKENS.get("VERIFY_STUDENT", VERIFY_STUDENT)
 GRADES_DOWNLOAD_ROUTING_KEY = ENV_TOKENS.get('GRADES_DOWNLOAD_ROUTING_KEY', HIGH_MEM_QUEUE)
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
+GRADES_DOWNLOAD_STUDENTS_PER_SHARD = ENV_TOKENS.get(
+    'GRADES_DOWNLOAD_STUDENTS_PER_SHARD', GRADES_DOWNLOAD_STUDENTS_PER_SHARD
+)
 
 # financial reports
 FINANCIAL_REPORTS = ENV_TOKENS.get("FINANCIAL_REPORTS", FINANCIAL_REPORTS)
@@ -889,6 +905,9 @@ CREDENTIALS_GENERATION_ROUTING_KEY = ENV_TOKENS.get('CREDENTIALS_GENERATION_ROUT
 # The extended StudentModule history table
 if FEATURES.get('ENABLE_CSMH_EXTENDED'):
     INSTALLED_APPS += ('coursewarehistoryextended',)
+STUDENTMODULEHISTORYEXTENDED_RETENTION_DAYS = ENV_TOKENS.get(
+    'STUDENTMODULEHISTORYEXTENDED_RETENTION_DAYS', STUDENTMODULEHISTORYEXTENDED_RETENTION_DAYS
+)
 
 API_ACCESS_MANAGER_EMAIL = ENV_TOKENS.get('API_ACCESS_MANAGER_EMAIL')
 API_ACCESS_FROM_EMAIL = ENV_TOKENS.get('API_ACCESS_FROM_EMAIL')
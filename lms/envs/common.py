@@ -772,6 +772,28 @@ MODULESTORE = {
     }
 }
 
+# Maximum size, in bytes, of the per-process cache of deserialized split course
+# structures that sits in front of the 'course_structure_cache'. 0 disables it.
+COURSE_STRUCTURE_LRU_CACHE_SIZE = 0
+
+# Local directory of the store of split course structures which is shared by all of the
+# processes on a host through memory-mapped files. None disables it.
+COURSE_STRUCTURE_MMAP_STORE_DIR = None
+
+# Maximum total size, in bytes, of the files of that store, beyond which the least
+# recently used structures are deleted. 0 leaves it unbounded.
+COURSE_STRUCTURE_MMAP_STORE_MAX_SIZE = 1024 * 1024 * 1024
+
+# Profiling of the modulestore's Mongo operations in each request
+# (see openedx.core.djangoapps.performance.middleware).
+MODULESTORE_QUERY_PROFILING = {
+    'ENABLED': False,
+    # Add a summary of the operations to responses, in the X-Modulestore-Queries header.
+    'HEADER': False,
+    # Maximum number of operations of views, by url name, e.g. {'courseware': {'structures': 2}}.
+    'BUDGETS': {},
+}
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -1107,6 +1129,7 @@ MIDDLEWARE_CLASSES = (
 
     'request_cache.middleware.RequestCache',
     'newrelic_custom_metrics.middleware.NewRelicCustomMetrics',
+    'openedx.core.djangoapps.performance.middleware.ModulestoreQueryProfileMiddleware',
 
     'mobile_api.middleware.AppVersionUpgrade',
     'openedx.core.djangoapps.header_control.middleware.HeaderControlMiddleware',
@@ -1826,6 +1849,11 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     # DIRECTORY_PREFIX='/modeltest/',
 )
 
+# Timeout, in seconds, of the per-user cache of transformed course block
+# structures, which is enabled by the course_blocks.cache_transformed_blocks
+# waffle switch.
+COURSE_BLOCKS_TRANSFORMED_CACHE_TIMEOUT = 5 * 60
+
 ################################ Bulk Email ###################################
 
 # Suffix used to construct 'from' email address for bulk emails.
@@ -1875,6 +1903,29 @@ BULK_EMAIL_RETRY_DELAY_BETWEEN_SENDS = 0.02
 # Queue to use for updating persistent grades
 RECALCULATE_GRADES_ROUTING_KEY = LOW_PRIORITY_QUEUE
 
+############################# Student Module Write Behind ##########################
+
+# Deferred writes of XBlock user state fields which don't affect scores
+# (see courseware.user_state_write_behind).
+STUDENT_MODULE_WRITE_BEHIND = {
+    'ENABLED': False,
+    # Names of the fields whose writes are deferred, by block type. The fields of
+    # block types which can have a score are never deferred.
+    'FIELDS': {
+        'course': ['position'],
+        'chapter': ['position'],
+        'sequential': ['position'],
+        'video': ['saved_video_position', 'speed'],
+    },
+    # Seconds over which writes are coalesced before they are flushed.
+    'DELAY': 5,
+    # Seconds for which writes which haven't been flushed are kept.
+    'TIMEOUT': 60 * 60,
+}
+
+# Queue to use for flushing deferred user state writes
+STUDENT_MODULE_WRITE_BEHIND_ROUTING_KEY = LOW_PRIORITY_QUEUE
+
 ############################# Email Opt In ####################################
 
 # Minimum age for organization-wide email opt in
@@ -2089,7 +2140,7 @@ INSTALLED_APPS = (
     'openedx.core.djangoapps.content.course_overviews',
     'openedx.core.djangoapps.content.course_structures.apps.CourseStructuresConfig',
     'openedx.core.djangoapps.content.block_structure.apps.BlockStructureConfig',
-    'lms.djangoapps.course_blocks',
+    'lms.djangoapps.course_blocks.apps.CourseBlocksConfig',
 
     # Coursegraph
     'openedx.core.djangoapps.coursegraph.apps.CoursegraphConfig',
@@ -2432,6 +2483,11 @@ BADGR_TIMEOUT = 10
 # the ones that contain information other than grades.
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
+# Maximum number of students graded by each subtask of a grade report.
+# Grade reports of courses with more enrolled students are split into
+# subtasks, whose results are merged.  0 disables splitting.
+GRADES_DOWNLOAD_STUDENTS_PER_SHARD = 0
+
 GRADES_DOWNLOAD = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-grades',
@@ -3007,6 +3063,10 @@ APP_UPGRADE_CACHE_TIMEOUT = 3600
 # if you want to avoid an overlap in ids while searching for history across the two tables.
 STUDENTMODULEHISTORYEXTENDED_OFFSET = 10000
 
+# Number of days for which coursewarehistoryextended.StudentModuleHistoryExtended records
+# are kept by the prune_student_module_history management command.  None keeps them forever.
+STUDENTMODULEHISTORYEXTENDED_RETENTION_DAYS = None
+
 # Cutoff date for granting audit certificates
 
 AUDIT_CERT_CUTOFF_DATE = None
@@ -0,0 +1,177 @@
+"""
+Module for the array-indexed traversal and filtering of block structures.
+
+A BlockIndex assigns each block that is reachable from the root of a
+block structure an integer index, in topological order, and stores the
+parents of each block as an array of indices.  Once built, removal
+filters can be applied to the structure in a single pass over these
+arrays, rather than with a generator-based graph traversal.
+
+Filters may either provide a removal_condition, which is called for
+each block reached by the pass, or a removal_mask, which is called once
+with all of the indexed block keys and returns a boolean per block.
+"""
+from array import array
+
+
+# Type code of the arrays used to store block indices.
+_INDEX_TYPECODE = 'i'
+
+# States of the blocks during a filtering pass.  Blocks through which
+# their descendants remain reachable have their lowest bit set.
+_UNREACHED = 0
+_RETAINED = 1
+_REMOVED = 2
+_REMOVED_KEEPING_DESCENDANTS = 3
+
+
+class RemovalFilter(object):
+    """
+    A filter that removes the blocks of a block structure that satisfy
+    its removal_condition or are selected by its removal_mask.  A
+    filter with neither removes no blocks.
+
+    Filters are callable with a block key, for use with
+    BlockStructureBlockData.filter_topological_traversal, in which case
+    the block is immediately removed if it is to be filtered out.
+    """
+    def __init__(self, block_structure, removal_condition=None, removal_mask=None, keep_descendants=False):
+        """
+        Arguments:
+            block_structure (BlockStructureBlockData) - The structure
+                from which blocks are removed.
+
+            removal_condition ((usage_key)->bool) - A function that
+                takes a block's usage key as input and returns whether
+                or not to remove that block from the block structure.
+
+            removal_mask (([usage_key])->[bool]) - A function that takes
+                a list of usage keys as input and returns a list of
+                whether or not to remove each of those blocks from the
+                block structure.
+
+            keep_descendants (bool) - See the description in
+                BlockStructureBlockData.remove_block.
+        """
+        self.block_structure = block_structure
+        self.removal_condition = removal_condition
+        self.removal_mask = removal_mask
+        self.keep_descendants = keep_descendants
+
+    def __call__(self, block_key):
+        """
+        Removes the given block if it is to be filtered out.  Returns
+        True if the block was retained, and False if it was removed.
+        """
+        return self.block_structure.retain_or_remove(
+            block_key,
+            removal_condition=self.should_remove,
+            keep_descendants=self.keep_descendants,
+        )
+
+    def should_remove(self, block_key):
+        """
+        Returns whether the given block is to be filtered out.
+        """
+        if self.removal_condition:
+            return self.removal_condition(block_key)
+        elif self.removal_mask:
+            return self.removal_mask([block_key])[0]
+        return False
+
+    @property
+    def is_universal(self):
+        """
+        Returns whether this filter retains all blocks.
+        """
+        return self.removal_condition is None and self.removal_mask is None
+
+
+class BlockIndex(object):
+    """
+    An array-indexed view of the relations of the blocks reachable from
+    the root of a block structure.  The index must be rebuilt whenever
+    the relations of the structure change.
+    """
+    def __init__(self, block_structure):
+        self.root_block_usage_key = block_structure.root_block_usage_key
+
+        # List of the reachable blocks' usage keys, in topological
+        # order, so that the root block has index 0.
+        # list [UsageKey]
+        self.block_keys = _get_topological_order(self.root_block_usage_key, block_structure.get_children)
+
+        # Map of a block's usage key to its index.
+        # dict {UsageKey: int}
+        self.positions = {block_key: index for index, block_key in enumerate(self.block_keys)}
+
+        # Indices of each block's reachable parents, by block index.
+        # list [array of int]
+        self.parents = [array(_INDEX_TYPECODE) for _ in self.block_keys]
+        for index, block_key in enumerate(self.block_keys):
+            for child_key in block_structure.get_children(block_key):
+                self.parents[self.positions[child_key]].append(index)
+
+    def __len__(self):
+        return len(self.block_keys)
+
+    def get_removals(self, filters):
+        """
+        Applies the given filters (list of RemovalFilter) in a single
+        pass over the index and returns the list of (usage key,
+        keep_descendants) pairs of the blocks to be removed, in
+        topological order.
+
+        As with filter_topological_traversal, filters are only applied
+        to blocks that remain reachable from the root, and for each
+        block, only until the first filter that removes it.
+        """
+        filters = [block_filter for block_filter in filters if not block_filter.is_universal]
+        masks = [
+            block_filter.removal_mask(self.block_keys) if block_filter.removal_mask else None
+            for block_filter in filters
+        ]
+
+        states = bytearray(len(self.block_keys))
+        removals = []
+        for index, block_key in enumerate(self.block_keys):
+            if index and not any(states[parent] & _RETAINED for parent in self.parents[index]):
+                continue
+
+            states[index] = _RETAINED
+            for block_filter, mask in zip(filters, masks):
+                if mask[index] if mask is not None else block_filter.should_remove(block_key):
+                    states[index] = _REMOVED_KEEPING_DESCENDANTS if block_filter.keep_descendants else _REMOVED
+                    removals.append((block_key, block_filter.keep_descendants))
+                    break
+
+        return removals
+
+
+def _get_topological_order(root_block_usage_key, get_children):
+    """
+    Returns the keys of the blocks reachable from the given root in
+    topological order, visiting children in their listed order.
+    """
+    # Count the edges into each reachable block.
+    num_unvisited_parents = {root_block_usage_key: 0}
+    stack = [root_block_usage_key]
+    while stack:
+        for child_key in get_children(stack.pop()):
+            if child_key in num_unvisited_parents:
+                num_unvisited_parents[child_key] += 1
+            else:
+                num_unvisited_parents[child_key] = 1
+                stack.append(child_key)
+
+    # Visit each block once all of its parents have been visited.
+    block_keys = []
+    stack = [root_block_usage_key]
+    while stack:
+        block_key = stack.pop()
+        block_keys.append(block_key)
+        for child_key in reversed(get_children(block_key)):
+            num_unvisited_parents[child_key] -= 1
+            if num_unvisited_parents[child_key] == 0:
+                stack.append(child_key)
+    return block_keys
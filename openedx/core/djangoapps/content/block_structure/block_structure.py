@@ -9,11 +9,11 @@ The following internal data structures are implemented:
     _BlockData - Data structure for a single block's data.
 """
 from copy import deepcopy
-from functools import partial
 from logging import getLogger
 
 from openedx.core.lib.graph_traversals import traverse_topologically, traverse_post_order
 
+from .block_index import BlockIndex, RemovalFilter
 from .exceptions import TransformerException
 
 
@@ -62,6 +62,11 @@ class BlockStructure(object):
         # dict {UsageKey: _BlockRelations}
         self._block_relations = {}
 
+        # Array-indexed view of the relations, built on demand and
+        # discarded whenever the relations change.
+        # BlockIndex
+        self._block_index = None
+
         # Add the root block.
         self._add_block(self._block_relations, root_block_usage_key)
 
@@ -119,6 +124,8 @@ class BlockStructure(object):
             usage_key - The usage key of the block that is to be set as the
                 new root of the block structure.
         """
+        if usage_key != self.root_block_usage_key:
+            self._block_index = None
         self.root_block_usage_key = usage_key
         self._block_relations[usage_key].parents = []
 
@@ -198,6 +205,15 @@ class BlockStructure(object):
             filter_func=filter_func,
         )
 
+    def get_block_index(self):
+        """
+        Returns the BlockIndex of this block structure, which is built
+        once and reused until the structure's relations change.
+        """
+        if self._block_index is None:
+            self._block_index = BlockIndex(self)
+        return self._block_index
+
     #--- Internal methods ---#
     # To be used within the block_structure framework or by tests.
 
@@ -228,6 +244,7 @@ class BlockStructure(object):
 
         # Replace this structure's relations with the newly pruned one.
         self._block_relations = pruned_block_relations
+        self._block_index = None
 
     def _add_relation(self, parent_key, child_key):
         """
@@ -238,6 +255,7 @@ class BlockStructure(object):
             child_key (UsageKey) - Usage key of the child block.
         """
         self._add_to_relations(self._block_relations, parent_key, child_key)
+        self._block_index = None
 
     @staticmethod
     def _add_to_relations(block_relations, parent_key, child_key):
@@ -420,12 +438,15 @@ class BlockStructureBlockData(BlockStructure):
         deep-copy of this instance's contents.
         """
         from .factory import BlockStructureFactory
-        return BlockStructureFactory.create_new(
+        block_structure = BlockStructureFactory.create_new(
             self.root_block_usage_key,
             deepcopy(self._block_relations),
             deepcopy(self.transformer_data),
             deepcopy(self._block_data_map),
         )
+        # The index is immutable, so it can be shared with the copy.
+        block_structure._block_index = self._block_index
+        return block_structure
 
     def iteritems(self):
         """
@@ -616,6 +637,7 @@ class BlockStructureBlockData(BlockStructure):
         # Remove block.
         self._block_relations.pop(usage_key, None)
         self._block_data_map.pop(usage_key, None)
+        self._block_index = None
 
         # Recreate the graph connections if descendants are to be kept.
         if keep_descendants:
@@ -627,7 +649,7 @@ class BlockStructureBlockData(BlockStructure):
         """
         Returns a filter function that always returns True for all blocks.
         """
-        return lambda block_key: True
+        return RemovalFilter(self)
 
     def create_removal_filter(self, removal_condition, keep_descendants=False):
         """
@@ -642,11 +664,24 @@ class BlockStructureBlockData(BlockStructure):
             keep_descendants (bool) - See the description in
                 remove_block.
         """
-        return partial(
-            self.retain_or_remove,
-            removal_condition=removal_condition,
-            keep_descendants=keep_descendants,
-        )
+        return RemovalFilter(self, removal_condition=removal_condition, keep_descendants=keep_descendants)
+
+    def create_removal_mask_filter(self, removal_mask, keep_descendants=False):
+        """
+        Returns a filter function that automatically removes blocks that are
+        selected by the removal_mask.  Prefer this over create_removal_filter
+        when the blocks to remove can be computed for all blocks at once.
+
+        Arguments:
+            removal_mask (([usage_key])->[bool]) - A function that
+                takes a list of usage keys as input and returns a list
+                of whether or not to remove each of those blocks from
+                the block structure.
+
+            keep_descendants (bool) - See the description in
+                remove_block.
+        """
+        return RemovalFilter(self, removal_mask=removal_mask, keep_descendants=keep_descendants)
 
     def retain_or_remove(self, block_key, removal_condition, keep_descendants=False):
         """
@@ -683,11 +718,30 @@ class BlockStructureBlockData(BlockStructure):
             keep_descendants (bool) - See the description in
                 remove_block.
         """
-        self.filter_topological_traversal(
-            filter_func=self.create_removal_filter(
-                removal_condition, keep_descendants
+        self.filter_with_removal([self.create_removal_filter(removal_condition, keep_descendants)])
+
+    def filter_with_removal(self, filters):
+        """
+        Removes all blocks that are filtered out by any of the given
+        filters.
+
+        Filters created by the create_*_filter methods are applied in a
+        single pass over the structure's BlockIndex.  Any other filter
+        functions are combined and applied with
+        filter_topological_traversal.
+
+        Arguments:
+            filters ([(usage_key)->bool]) - Filter functions that
+                remove the given block if it is to be filtered out and
+                return whether or not the block was retained.
+        """
+        if all(isinstance(block_filter, RemovalFilter) for block_filter in filters):
+            for block_key, keep_descendants in self.get_block_index().get_removals(filters):
+                self.remove_block(block_key, keep_descendants)
+        else:
+            self.filter_topological_traversal(
+                filter_func=lambda block_key: all(block_filter(block_key) for block_filter in filters),
             )
-        )
 
     def filter_topological_traversal(self, filter_func, **kwargs):
         """
@@ -57,6 +57,49 @@ class BlockStructureFactory(object):
         build_block_structure(root_xblock)
         return block_structure
 
+    @classmethod
+    def create_partial_from_modulestore(cls, root_block_usage_key, modulestore, children_map, block_keys):
+        """
+        Creates and returns a block structure from the modulestore that
+        contains only the given block_keys, which must include all
+        ancestors of each of its blocks.
+
+        The xBlocks of the direct children of the included blocks are
+        instantiated as well, so they can be accessed during collect, but
+        they are not added to the block structure unless they are
+        included in block_keys.
+
+        Arguments:
+            root_block_usage_key (UsageKey) - The usage_key for the root
+                of the block structure that is to be created.
+
+            modulestore (ModuleStoreRead) - The modulestore that
+                contains the data for the xBlocks.
+
+            children_map (dict {UsageKey: [UsageKey]}) - The children
+                of each block in the modulestore's current version of
+                the structure.
+
+            block_keys (set(UsageKey)) - The usage keys of the blocks
+                that are to be added to the block structure.
+
+        Returns:
+            BlockStructureModulestoreData - The created block structure
+                with instantiated xBlocks from the given modulestore.
+        """
+        block_structure = BlockStructureModulestoreData(root_block_usage_key)
+        xblock_keys = set(block_keys)
+
+        for block_key in block_keys:
+            for child_key in children_map.get(block_key, []):
+                xblock_keys.add(child_key)
+                if child_key in block_keys:
+                    block_structure._add_relation(block_key, child_key)  # pylint: disable=protected-access
+
+        for block_key in xblock_keys:
+            block_structure._add_xblock(block_key, modulestore.get_item(block_key))  # pylint: disable=protected-access
+        return block_structure
+
     @classmethod
     def create_from_store(cls, root_block_usage_key, block_structure_store):
         """
@@ -0,0 +1,161 @@
+"""
+Module for incrementally updating the collected data of a stored block
+structure, by re-collecting only the blocks affected by the changes
+between two versions of a split modulestore course.
+"""
+# pylint: disable=protected-access
+from collections import namedtuple
+from logging import getLogger
+
+from xmodule.modulestore import ModuleStoreEnum
+
+from .block_structure import BlockStructure
+from .factory import BlockStructureFactory
+
+
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+
+# children_map (dict {UsageKey: [UsageKey]}) - The children of each block
+#     reachable from the root in the current version of the course.
+# changed_block_keys (set(UsageKey)) - The blocks that were added or
+#     modified since the previous version of the course.
+CourseChanges = namedtuple('CourseChanges', ['children_map', 'changed_block_keys'])
+
+
+def get_course_changes(modulestore, root_block_usage_key, from_version):
+    """
+    Returns the CourseChanges between the split structure with the given
+    from_version and the current version of the course, or None if they
+    cannot be computed (for example, for courses in Old Mongo).
+    """
+    course_key = root_block_usage_key.course_key
+    split_store = _get_split_store(modulestore, course_key)
+    if split_store is None or from_version is None:
+        return None
+
+    to_version = modulestore.get_item(root_block_usage_key).course_version
+    old_structure = split_store.get_structure(course_key, course_key.as_object_id(from_version))
+    new_structure = split_store.get_structure(course_key, course_key.as_object_id(to_version))
+    if old_structure is None or new_structure is None:
+        return None
+
+    def _usage_key(block_key):
+        """
+        Returns the usage key for the given split BlockKey.
+        """
+        return course_key.make_usage_key(block_key.type, block_key.id)
+
+    if _usage_key(new_structure['root']) != root_block_usage_key:
+        return None
+
+    children_map = {}
+    changed_block_keys = set()
+    blocks_to_visit = [new_structure['root']]
+    while blocks_to_visit:
+        block_key = blocks_to_visit.pop()
+        usage_key = _usage_key(block_key)
+        if usage_key in children_map:
+            continue
+
+        block = new_structure['blocks'][block_key]
+        children = [child for child in block.fields.get('children', []) if child in new_structure['blocks']]
+        children_map[usage_key] = [_usage_key(child) for child in children]
+        blocks_to_visit.extend(children)
+
+        if _has_block_changed(old_structure['blocks'].get(block_key), block):
+            changed_block_keys.add(usage_key)
+
+    return CourseChanges(children_map, changed_block_keys)
+
+
+def get_block_keys_to_collect(root_block_usage_key, course_changes):
+    """
+    Returns the set of blocks that need to be re-collected for the given
+    CourseChanges: the changed blocks, all of their descendants and all
+    ancestors of those.  The root block is always included, since it
+    provides course-wide data.
+    """
+    children_map = course_changes.children_map
+
+    changed_subtrees = set()
+    blocks_to_visit = list(course_changes.changed_block_keys)
+    while blocks_to_visit:
+        block_key = blocks_to_visit.pop()
+        if block_key not in changed_subtrees:
+            changed_subtrees.add(block_key)
+            blocks_to_visit.extend(children_map.get(block_key, []))
+
+    parents_map = {}
+    for parent_key, children in children_map.iteritems():
+        for child_key in children:
+            parents_map.setdefault(child_key, []).append(parent_key)
+
+    block_keys = set()
+    blocks_to_visit = list(changed_subtrees) + [root_block_usage_key]
+    while blocks_to_visit:
+        block_key = blocks_to_visit.pop()
+        if block_key not in block_keys:
+            block_keys.add(block_key)
+            blocks_to_visit.extend(parents_map.get(block_key, []))
+    return block_keys
+
+
+def merge_collected(stored_block_structure, partial_block_structure, children_map, collected_block_keys):
+    """
+    Returns a new block structure with the relations of the given
+    children_map, the block data of the collected_block_keys from the
+    partial_block_structure and the block data of all other blocks from
+    the stored_block_structure.
+    """
+    block_relations = {}
+    for parent_key, children in children_map.iteritems():
+        BlockStructure._add_block(block_relations, parent_key)
+        for child_key in children:
+            BlockStructure._add_to_relations(block_relations, parent_key, child_key)
+
+    block_data_map = {}
+    for block_key in block_relations:
+        source = partial_block_structure if block_key in collected_block_keys else stored_block_structure
+        block_data = source._block_data_map.get(block_key)
+        if block_data is not None:
+            block_data_map[block_key] = block_data
+
+    logger.info(
+        "BlockStructure: Incrementally collected %d of %d blocks; %r.",
+        len(collected_block_keys),
+        len(block_relations),
+        unicode(stored_block_structure.root_block_usage_key),
+    )
+    return BlockStructureFactory.create_new(
+        stored_block_structure.root_block_usage_key,
+        block_relations,
+        partial_block_structure.transformer_data,
+        block_data_map,
+    )
+
+
+def _get_split_store(modulestore, course_key):
+    """
+    Returns the split modulestore that contains the given course, or
+    None if the course is not in a split modulestore.
+    """
+    get_store = getattr(modulestore, '_get_modulestore_for_courselike', None)
+    store = get_store(course_key) if get_store else modulestore
+    if store.get_modulestore_type(course_key) != ModuleStoreEnum.Type.split:
+        return None
+    return store
+
+
+def _has_block_changed(old_block, new_block):
+    """
+    Returns whether the given split block data differs between the
+    versions of the structure.
+    """
+    return (
+        old_block is None or
+        old_block.edit_info.update_version != new_block.edit_info.update_version or
+        old_block.definition != new_block.definition or
+        old_block.fields != new_block.fields or
+        old_block.defaults != new_block.defaults
+    )
@@ -7,6 +7,7 @@ from contextlib import contextmanager
 from . import config
 from .exceptions import UsageKeyNotInBlockStructure, TransformerDataIncompatible, BlockStructureNotFound
 from .factory import BlockStructureFactory
+from .incremental import get_block_keys_to_collect, get_course_changes, merge_collected
 from .store import BlockStructureStore
 from .transformers import BlockStructureTransformers
 
@@ -60,7 +61,14 @@ class BlockStructureManager(object):
             BlockStructureBlockData - A transformed block structure,
                 starting at starting_block_usage_key.
         """
-        block_structure = collected_block_structure.copy() if collected_block_structure else self.get_collected()
+        if collected_block_structure:
+            if starting_block_usage_key in (None, collected_block_structure.root_block_usage_key):
+                # Index the shared collected structure, so that the index
+                # is built only once for all of its copies.
+                collected_block_structure.get_block_index()
+            block_structure = collected_block_structure.copy()
+        else:
+            block_structure = self.get_collected()
 
         if starting_block_usage_key:
             # Override the root_block_usage_key so traversals start at the
@@ -109,25 +117,77 @@ class BlockStructureManager(object):
         """
         The store is updated with newly collected transformers data from
         the modulestore, only if the data in the store is outdated.
+
+        If incremental collection is enabled, only the blocks affected by
+        the changes since the stored version are re-collected, when
+        possible.
         """
         with self._bulk_operations():
             if not self.store.is_up_to_date(self.root_block_usage_key, self.modulestore):
-                self._update_collected()
+                self._update_collected(incremental=config.is_enabled(config.INCREMENTAL_COLLECT))
 
-    def _update_collected(self):
+    def _update_collected(self, incremental=False):
         """
         The store is updated with newly collected transformers data from
         the modulestore.
+
+        Arguments:
+            incremental (bool) - Whether to attempt to re-collect only
+                the blocks that changed since the stored version, falling
+                back to collecting the entire structure.
         """
         with self._bulk_operations():
-            block_structure = BlockStructureFactory.create_from_modulestore(
-                self.root_block_usage_key,
-                self.modulestore,
-            )
-            BlockStructureTransformers.collect(block_structure)
+            block_structure = self._collect_incrementally() if incremental else None
+            if block_structure is None:
+                block_structure = BlockStructureFactory.create_from_modulestore(
+                    self.root_block_usage_key,
+                    self.modulestore,
+                )
+                BlockStructureTransformers.collect(block_structure)
             self.store.add(block_structure)
             return block_structure
 
+    def _collect_incrementally(self):
+        """
+        Returns the block structure resulting from re-collecting only the
+        blocks that changed since the version in the store, merged with
+        the stored data of all other blocks.
+
+        Returns None if the stored data cannot be updated incrementally.
+        """
+        try:
+            stored_block_structure = self.store.get(self.root_block_usage_key)
+            stored_version = self.store.get_data_version(self.root_block_usage_key)
+        except BlockStructureNotFound:
+            return None
+
+        if not BlockStructureTransformers.supports_incremental_collect(stored_block_structure):
+            return None
+
+        course_changes = get_course_changes(self.modulestore, self.root_block_usage_key, stored_version)
+        if course_changes is None:
+            return None
+
+        # Blocks without stored data must be collected, even if unchanged.
+        course_changes.changed_block_keys.update(
+            block_key for block_key in course_changes.children_map if block_key not in stored_block_structure
+        )
+        block_keys_to_collect = get_block_keys_to_collect(self.root_block_usage_key, course_changes)
+
+        partial_block_structure = BlockStructureFactory.create_partial_from_modulestore(
+            self.root_block_usage_key,
+            self.modulestore,
+            course_changes.children_map,
+            block_keys_to_collect,
+        )
+        BlockStructureTransformers.collect(partial_block_structure)
+        return merge_collected(
+            stored_block_structure,
+            partial_block_structure,
+            course_changes.children_map,
+            block_keys_to_collect,
+        )
+
     def clear(self):
         """
         Removes data for the block structure associated with the given
@@ -0,0 +1,323 @@
+"""
+Module for the compact, array-backed serialization format of
+BlockStructure objects.
+
+Rather than pickling the structure's dicts of objects as a whole, the
+compact format stores:
+
+    * an index table of the structure's block keys, so that every other
+      part of the format refers to blocks by their integer index.
+    * the parent/child relations as integer adjacency arrays.
+    * the collected block data as columns, one per (owner, field name),
+      where the owner is either None (for xBlock fields) or the name of
+      the transformer that collected the field.  Each column is pickled
+      separately and is only unpickled when a field in that column is
+      first read.
+
+Deserialized blocks are instances of _ColumnarBlockData, which read their
+field values lazily from the columns, so that fields that are never read
+for a request are never unpickled.
+"""
+# pylint: disable=protected-access
+import zlib
+from array import array
+from collections import defaultdict
+
+import cPickle as pickle
+
+from .block_structure import (
+    BlockData,
+    TransformerData,
+    TransformerDataMap,
+    _BlockRelations,
+)
+from .factory import BlockStructureFactory
+
+
+# Prefix of all data serialized in the compact format. The trailing
+# digit is the version of the format, which is to be incremented
+# whenever the layout of the payload changes.
+COMPACT_FORMAT_PREFIX = b'BSC1'
+
+# Type code of the arrays used to store block indices.
+_INDEX_TYPECODE = 'i'
+
+
+def is_compact_format(serialized_data):
+    """
+    Returns whether the given serialized data is in the compact format.
+    """
+    return serialized_data[:len(COMPACT_FORMAT_PREFIX)] == COMPACT_FORMAT_PREFIX
+
+
+def serialize_compact(block_structure):
+    """
+    Serializes the given block_structure (BlockStructureBlockData) into
+    the compact format.
+    """
+    block_relations = block_structure._block_relations
+    block_data_map = block_structure._block_data_map
+
+    # Blocks with relations come first in the index table, followed by
+    # any blocks that only have collected data.
+    block_keys = list(block_relations)
+    num_related = len(block_keys)
+    block_keys.extend(key for key in block_data_map if key not in block_relations)
+    block_indices = {block_key: index for index, block_key in enumerate(block_keys)}
+
+    parents = _AdjacencyArrays()
+    children = _AdjacencyArrays()
+    for block_key in block_keys[:num_related]:
+        relations = block_relations[block_key]
+        parents.append([block_indices[parent] for parent in relations.parents])
+        children.append([block_indices[child] for child in relations.children])
+
+    data_indices = array(_INDEX_TYPECODE)
+    transformer_indices = defaultdict(lambda: array(_INDEX_TYPECODE))
+    # dict {owner: {field_name: {block_index: value}}}
+    columns = defaultdict(lambda: defaultdict(dict))
+
+    for index, block_key in enumerate(block_keys):
+        block_data = block_data_map.get(block_key)
+        if block_data is None:
+            continue
+        data_indices.append(index)
+
+        for field_name, value in block_data.fields.iteritems():
+            columns[None][field_name][index] = value
+
+        for transformer_name, transformer_data in block_data.transformer_data.iteritems():
+            transformer_indices[transformer_name].append(index)
+            for field_name, value in transformer_data.fields.iteritems():
+                columns[transformer_name][field_name][index] = value
+
+    payload = {
+        'block_keys': block_keys,
+        'num_related': num_related,
+        'parents': parents.to_storable(),
+        'children': children.to_storable(),
+        'data_indices': data_indices.tostring(),
+        'transformer_indices': {
+            transformer_name: indices.tostring()
+            for transformer_name, indices in transformer_indices.iteritems()
+        },
+        'transformer_data': block_structure.transformer_data,
+        'columns': {
+            owner: {
+                field_name: pickle.dumps(column, pickle.HIGHEST_PROTOCOL)
+                for field_name, column in owner_columns.iteritems()
+            }
+            for owner, owner_columns in columns.iteritems()
+        },
+    }
+    return COMPACT_FORMAT_PREFIX + zlib.compress(pickle.dumps(payload, pickle.HIGHEST_PROTOCOL))
+
+
+def deserialize_compact(serialized_data, root_block_usage_key):
+    """
+    Deserializes the given data, which must be in the compact format,
+    and returns the parsed BlockStructureBlockData.
+    """
+    payload = pickle.loads(zlib.decompress(serialized_data[len(COMPACT_FORMAT_PREFIX):]))
+    block_keys = payload['block_keys']
+
+    parents = _AdjacencyArrays.from_storable(payload['parents'])
+    children = _AdjacencyArrays.from_storable(payload['children'])
+    block_relations = {}
+    for index in xrange(payload['num_related']):
+        relations = _BlockRelations()
+        relations.parents = [block_keys[parent] for parent in parents[index]]
+        relations.children = [block_keys[child] for child in children[index]]
+        block_relations[block_keys[index]] = relations
+
+    columns = _BlockDataColumns(payload['columns'], payload['transformer_indices'])
+    block_data_map = {
+        block_keys[index]: _ColumnarBlockData(block_keys[index], columns, index)
+        for index in _index_array(payload['data_indices'])
+    }
+
+    return BlockStructureFactory.create_new(
+        root_block_usage_key,
+        block_relations,
+        payload['transformer_data'],
+        block_data_map,
+    )
+
+
+def _index_array(data):
+    """
+    Returns an array of block indices from its storable representation.
+    """
+    indices = array(_INDEX_TYPECODE)
+    indices.fromstring(data)
+    return indices
+
+
+class _AdjacencyArrays(object):
+    """
+    Compressed sparse row representation of a block adjacency list: the
+    neighbors of the block at index i are
+    values[offsets[i]:offsets[i + 1]].
+    """
+    def __init__(self, offsets=None, values=None):
+        self.offsets = offsets if offsets is not None else array(_INDEX_TYPECODE, [0])
+        self.values = values if values is not None else array(_INDEX_TYPECODE)
+
+    def append(self, neighbors):
+        """
+        Appends the neighbors of the next block.
+        """
+        self.values.extend(neighbors)
+        self.offsets.append(len(self.values))
+
+    def __getitem__(self, index):
+        return self.values[self.offsets[index]:self.offsets[index + 1]]
+
+    def to_storable(self):
+        """
+        Returns a representation of the arrays that is cheap to pickle.
+        """
+        return self.offsets.tostring(), self.values.tostring()
+
+    @classmethod
+    def from_storable(cls, storable):
+        """
+        Returns the arrays for the given result of to_storable.
+        """
+        offsets, values = storable
+        return cls(_index_array(offsets), _index_array(values))
+
+
+class _BlockDataColumns(object):
+    """
+    The collected block data of a deserialized block structure, stored
+    as pickled columns that are unpickled on first access.
+    """
+    def __init__(self, pickled_columns, transformer_indices):
+        # dict {owner: {field_name: pickled {block_index: value}}}
+        self._pickled_columns = pickled_columns
+
+        # dict {transformer_name: array of block indices}
+        self._pickled_transformer_indices = transformer_indices
+
+        # dict {(owner, field_name): {block_index: value}}
+        self._columns = {}
+
+        # dict {block_index: [transformer_name]}
+        self._transformers_by_index = None
+
+    def __deepcopy__(self, memo):
+        """
+        Copies share the (immutable) pickled columns, but not any of
+        the unpickled values, which may be mutated by their users.
+        """
+        return _BlockDataColumns(self._pickled_columns, self._pickled_transformer_indices)
+
+    def get_value(self, owner, field_name, index):
+        """
+        Returns the value of the given field for the block at the given
+        index.  Raises KeyError if there is no such value.
+        """
+        column = self._columns.get((owner, field_name))
+        if column is None:
+            column = pickle.loads(self._pickled_columns[owner][field_name])
+            self._columns[(owner, field_name)] = column
+        return column[index]
+
+    def get_fields(self, owner, index):
+        """
+        Returns a new dict of all field values for the given owner of
+        the block at the given index.
+        """
+        fields = {}
+        for field_name in self._pickled_columns.get(owner, {}):
+            try:
+                fields[field_name] = self.get_value(owner, field_name, index)
+            except KeyError:
+                pass
+        return fields
+
+    def get_transformer_names(self, index):
+        """
+        Returns the names of the transformers that collected data for
+        the block at the given index.
+        """
+        if self._transformers_by_index is None:
+            self._transformers_by_index = defaultdict(list)
+            for transformer_name, indices in self._pickled_transformer_indices.iteritems():
+                for block_index in _index_array(indices):
+                    self._transformers_by_index[block_index].append(transformer_name)
+        return self._transformers_by_index.get(index, [])
+
+
+class _ColumnarFieldDataMixin(object):
+    """
+    Mixin for FieldData classes whose fields are read lazily from
+    _BlockDataColumns.
+
+    Individual fields are read directly from the columns until the
+    'fields' dict itself is requested (or written to), at which point
+    all of the owner's fields are copied into it.
+    """
+    COLUMNAR_FIELD_NAMES = ['_columns', '_owner', '_index']
+
+    def class_field_names(self):
+        return super(_ColumnarFieldDataMixin, self).class_field_names() + self.COLUMNAR_FIELD_NAMES
+
+    def _init_columns(self, columns, owner, index):
+        """
+        Associates this object with its data in the given columns.
+        """
+        self._columns = columns
+        self._owner = owner
+        self._index = index
+
+    def __getattr__(self, field_name):
+        # Note: __getattr__ is only called when regular attribute lookup
+        # fails, so this is only reached for not yet loaded fields.
+        if field_name.startswith('__') or field_name in self.COLUMNAR_FIELD_NAMES:
+            raise AttributeError(field_name)
+
+        if field_name == 'fields':
+            self.fields = self._columns.get_fields(self._owner, self._index)
+            return self.fields
+
+        if self._is_own_field(field_name):
+            raise AttributeError(field_name)
+
+        if 'fields' in self.__dict__:
+            return super(_ColumnarFieldDataMixin, self).__getattr__(field_name)
+
+        try:
+            return self._columns.get_value(self._owner, field_name, self._index)
+        except KeyError:
+            raise AttributeError("Field {0} does not exist".format(field_name))
+
+
+class _ColumnarTransformerData(_ColumnarFieldDataMixin, TransformerData):
+    """
+    TransformerData for a single block whose fields are read lazily
+    from _BlockDataColumns.
+    """
+    def __init__(self, columns, transformer_name, index):  # pylint: disable=super-init-not-called
+        self._init_columns(columns, transformer_name, index)
+
+
+class _ColumnarBlockData(_ColumnarFieldDataMixin, BlockData):
+    """
+    BlockData whose xBlock fields and transformer data are read lazily
+    from _BlockDataColumns.
+    """
+    def __init__(self, usage_key, columns, index):  # pylint: disable=super-init-not-called
+        self.location = usage_key
+        self._init_columns(columns, None, index)
+
+    def __getattr__(self, field_name):
+        if field_name == 'transformer_data':
+            self.transformer_data = TransformerDataMap(
+                (transformer_name, _ColumnarTransformerData(self._columns, transformer_name, self._index))
+                for transformer_name in self._columns.get_transformer_names(self._index)
+            )
+            return self.transformer_data
+        return super(_ColumnarBlockData, self).__getattr__(field_name)
+
@@ -11,6 +11,7 @@ from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
 from .models import BlockStructureModel
+from .serialization import deserialize_compact, is_compact_format, serialize_compact
 from .transformer_registry import TransformerRegistry
 
 
@@ -125,6 +126,19 @@ class BlockStructureStore(object):
 
         return False
 
+    def get_data_version(self, root_block_usage_key):
+        """
+        Returns the version of the modulestore data from which the
+        stored block structure for the given key was collected.
+
+        Raises:
+            BlockStructureNotFound if storage backing is disabled or
+            the root_block_usage_key is not found.
+        """
+        if not _is_storage_backing_enabled():
+            raise BlockStructureNotFound(root_block_usage_key)
+        return self._get_model(root_block_usage_key).data_version
+
     def _get_model(self, root_block_usage_key):
         """
         Returns the model associated with the given key.
@@ -191,7 +205,13 @@ class BlockStructureStore(object):
     def _serialize(self, block_structure):
         """
         Serializes the data for the given block_structure.
+
+        The compact format is used if enabled, otherwise the
+        structure's data is pickled as a whole.
         """
+        if config.is_enabled(config.COMPACT_STORAGE_FORMAT):
+            return serialize_compact(block_structure)
+
         data_to_cache = (
             block_structure._block_relations,
             block_structure.transformer_data,
@@ -202,7 +222,13 @@ class BlockStructureStore(object):
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
         Deserializes the given data and returns the parsed block_structure.
+
+        Data in either the compact or the pickled format is accepted,
+        regardless of which format is currently enabled for writes.
         """
+        if is_compact_format(serialized_data):
+            return deserialize_compact(serialized_data, root_block_usage_key)
+
         block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
         return BlockStructureFactory.create_new(
             root_block_usage_key,
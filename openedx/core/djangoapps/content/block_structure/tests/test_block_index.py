@@ -0,0 +1,86 @@
+"""
+Tests for block_index.py
+"""
+# pylint: disable=protected-access
+import ddt
+from nose.plugins.attrib import attr
+from unittest import TestCase
+
+from .helpers import ChildrenMapTestMixin
+
+
+@attr(shard=2)
+@ddt.ddt
+class TestBlockIndex(TestCase, ChildrenMapTestMixin):
+    """
+    Tests for BlockIndex and filtering block structures with it.
+    """
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_topological_order(self, children_map):
+        block_index = self.create_block_structure(children_map).get_block_index()
+        self.assertEquals(sorted(block_index.block_keys), range(len(children_map)))
+        self.assertEquals(block_index.block_keys[0], 0)
+        for parent, children in enumerate(children_map):
+            for child in children:
+                self.assertLess(block_index.positions[parent], block_index.positions[child])
+                self.assertIn(block_index.positions[parent], block_index.parents[block_index.positions[child]])
+
+    def test_index_is_rebuilt(self):
+        block_structure = self.create_block_structure(self.LINEAR_CHILDREN_MAP)
+        block_index = block_structure.get_block_index()
+        self.assertIs(block_structure.get_block_index(), block_index)
+        self.assertIs(block_structure.copy().get_block_index(), block_index)
+
+        block_structure.remove_block(2, keep_descendants=True)
+        self.assertEquals(block_structure.get_block_index().block_keys, [0, 1, 3])
+
+        block_structure.set_root_block(1)
+        self.assertEquals(block_structure.get_block_index().block_keys, [1, 3])
+
+    @ddt.data(
+        ([3], False, [[1, 2], [], [4], [], [], [], []], [3]),
+        ([2], False, [[1], [3], [], [5, 6], [], [], []], [2]),
+        # Blocks that are no longer reachable are neither filtered nor pruned.
+        ([1, 2, 3], False, [[], [], [], [5, 6], [], [], []], [1, 2]),
+        ([3], True, [[1, 2], [5, 6], [4, 5, 6], [], [], [], []], [3]),
+        ([0], False, [[], [3], [3, 4], [5, 6], [], [], []], [0]),
+    )
+    @ddt.unpack
+    def test_filter_with_removal(self, blocks_to_remove, keep_descendants, expected_children_map, missing_blocks):
+        for create_filter, removal_function in (
+                ('create_removal_filter', lambda block_key: block_key in blocks_to_remove),
+                ('create_removal_mask_filter', lambda block_keys: [key in blocks_to_remove for key in block_keys]),
+        ):
+            block_structure = self.create_block_structure(self.DAG_CHILDREN_MAP)
+            removal_filter = getattr(block_structure, create_filter)(removal_function, keep_descendants)
+            block_structure.filter_with_removal([block_structure.create_universal_filter(), removal_filter])
+            self.assert_block_structure(block_structure, expected_children_map, missing_blocks)
+
+    def test_filters_applied_until_removed(self):
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+        filtered_blocks = []
+
+        def _removal_condition(block_key):
+            """
+            Records the blocks that the filter is applied to.
+            """
+            filtered_blocks.append(block_key)
+            return False
+
+        block_structure.filter_with_removal([
+            block_structure.create_removal_mask_filter(lambda block_keys: [key == 1 for key in block_keys]),
+            block_structure.create_removal_filter(_removal_condition),
+        ])
+        self.assert_block_structure(block_structure, [[2], [], [], [], []], missing_blocks=[1])
+        self.assertEquals(sorted(filtered_blocks), [0, 2])
+
+    def test_filter_functions(self):
+        block_structure = self.create_block_structure(self.LINEAR_CHILDREN_MAP)
+        block_structure.filter_with_removal([
+            lambda block_key: block_structure.retain_or_remove(block_key, lambda key: key == 2),
+        ])
+        self.assert_block_structure(block_structure, [[1], [], [], []], missing_blocks=[2])
@@ -0,0 +1,73 @@
+"""
+Tests for incremental.py
+"""
+# pylint: disable=protected-access
+import ddt
+from nose.plugins.attrib import attr
+from unittest import TestCase
+
+from ..incremental import CourseChanges, get_block_keys_to_collect, merge_collected
+from .helpers import ChildrenMapTestMixin, MockTransformer
+
+
+@attr(shard=2)
+@ddt.ddt
+class TestIncrementalCollect(TestCase, ChildrenMapTestMixin):
+    """
+    Tests for incrementally collecting block structures.
+    """
+    #     0
+    #    / \
+    #   1  2
+    #   \ / \
+    #    3  4
+    #   / \
+    #  5  6
+    CHILDREN_MAP = dict(enumerate(ChildrenMapTestMixin.DAG_CHILDREN_MAP))
+
+    @ddt.data(
+        ([], {0}),
+        ([0], {0, 1, 2, 3, 4, 5, 6}),
+        ([4], {0, 2, 4}),
+        ([5], {0, 1, 2, 3, 5}),
+        # The descendants of block 3 are collected along with all of their ancestors.
+        ([3], {0, 1, 2, 3, 5, 6}),
+        ([1, 4], {0, 1, 2, 3, 4, 5, 6}),
+    )
+    @ddt.unpack
+    def test_block_keys_to_collect(self, changed_block_keys, expected_block_keys):
+        course_changes = CourseChanges(self.CHILDREN_MAP, set(changed_block_keys))
+        self.assertEquals(get_block_keys_to_collect(0, course_changes), expected_block_keys)
+
+    def test_merge_collected(self):
+        stored_block_structure = self.create_block_structure(self.DAG_CHILDREN_MAP)
+        for block_key in stored_block_structure:
+            stored_block_structure._get_or_create_block(block_key).display_name = 'stored'
+        stored_block_structure._add_transformer(MockTransformer)
+
+        # Block 4 is removed and block 7 is added as a child of block 2.
+        children_map = dict(self.CHILDREN_MAP)
+        children_map.update({2: [3, 7], 7: []})
+        del children_map[4]
+        collected_block_keys = get_block_keys_to_collect(0, CourseChanges(children_map, {7}))
+
+        partial_block_structure = self.create_block_structure([[2], [], [7], [], [], [], [], []])
+        for block_key in collected_block_keys:
+            partial_block_structure._get_or_create_block(block_key).display_name = 'collected'
+        partial_block_structure.set_transformer_data(MockTransformer, 'collected', True)
+
+        block_structure = merge_collected(
+            stored_block_structure,
+            partial_block_structure,
+            children_map,
+            collected_block_keys,
+        )
+
+        expected_children_map = [[1, 2], [3], [3, 7], [5, 6], [], [], [], []]
+        self.assert_block_structure(block_structure, expected_children_map, missing_blocks=[4])
+        for block_key in children_map:
+            self.assertEquals(
+                block_structure.get_xblock_field(block_key, 'display_name'),
+                'collected' if block_key in {0, 2, 7} else 'stored',
+            )
+        self.assertTrue(block_structure.get_transformer_data(MockTransformer, 'collected'))
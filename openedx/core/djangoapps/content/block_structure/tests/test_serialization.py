@@ -0,0 +1,92 @@
+"""
+Tests for serialization.py
+"""
+# pylint: disable=protected-access
+import ddt
+from nose.plugins.attrib import attr
+from unittest import TestCase
+
+from openedx.core.lib.cache_utils import zpickle
+
+from ..serialization import deserialize_compact, is_compact_format, serialize_compact
+from .helpers import ChildrenMapTestMixin, MockTransformer
+
+
+@attr(shard=2)
+@ddt.ddt
+class TestCompactSerialization(TestCase, ChildrenMapTestMixin):
+    """
+    Tests for the compact serialization format of block structures.
+    """
+    def setUp(self):
+        super(TestCompactSerialization, self).setUp()
+        self.block_structure = self.create_block_structure(self.DAG_CHILDREN_MAP)
+        self.block_structure._add_transformer(MockTransformer)
+        for block_key in self.block_structure:
+            block_data = self.block_structure._get_or_create_block(block_key)
+            block_data.display_name = 'Block {}'.format(block_key)
+        self.block_structure.set_transformer_block_field(3, MockTransformer, 'children_count', 2)
+
+    def _round_trip(self, block_structure):
+        """
+        Serializes and deserializes the given block structure.
+        """
+        serialized_data = serialize_compact(block_structure)
+        self.assertTrue(is_compact_format(serialized_data))
+        return deserialize_compact(serialized_data, block_structure.root_block_usage_key)
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_relations(self, children_map):
+        block_structure = self._round_trip(self.create_block_structure(children_map))
+        self.assert_block_structure(block_structure, children_map)
+
+    def test_legacy_format(self):
+        self.assertFalse(is_compact_format(zpickle(('relations', 'transformer data', 'block data'))))
+
+    def test_block_data(self):
+        block_structure = self._round_trip(self.block_structure)
+        for block_key in range(len(self.DAG_CHILDREN_MAP)):
+            self.assertEquals(
+                block_structure.get_xblock_field(block_key, 'display_name'),
+                'Block {}'.format(block_key),
+            )
+            self.assertIsNone(block_structure.get_xblock_field(block_key, 'other_field'))
+        self.assertEquals(block_structure[0].fields, {'display_name': 'Block 0'})
+
+    def test_transformer_data(self):
+        block_structure = self._round_trip(self.block_structure)
+        self.assertEquals(
+            block_structure._get_transformer_data_version(MockTransformer),
+            MockTransformer.WRITE_VERSION,
+        )
+        self.assertEquals(block_structure.get_transformer_block_field(3, MockTransformer, 'children_count'), 2)
+        self.assertEquals(block_structure.get_transformer_block_field(4, MockTransformer, 'children_count', 0), 0)
+        with self.assertRaises(KeyError):
+            block_structure.get_transformer_block_data(4, MockTransformer)
+
+    def test_updates_after_deserialization(self):
+        block_structure = self._round_trip(self.block_structure)
+        block_structure.set_transformer_block_field(3, MockTransformer, 'children_count', 5)
+        block_structure.set_transformer_block_field(4, MockTransformer, 'children_count', 0)
+        block_structure[1].display_name = 'Updated'
+
+        block_structure = self._round_trip(block_structure)
+        self.assertEquals(block_structure.get_transformer_block_field(3, MockTransformer, 'children_count'), 5)
+        self.assertEquals(block_structure.get_transformer_block_field(4, MockTransformer, 'children_count'), 0)
+        self.assertEquals(block_structure.get_xblock_field(1, 'display_name'), 'Updated')
+
+    def test_copy_is_independent(self):
+        self.block_structure.set_transformer_block_field(3, MockTransformer, 'list_field', [1])
+        block_structure = self._round_trip(self.block_structure)
+        block_structure_copy = block_structure.copy()
+
+        block_structure_copy.get_transformer_block_field(3, MockTransformer, 'list_field').append(2)
+        block_structure_copy.remove_block(4, keep_descendants=False)
+
+        self.assertEquals(block_structure.get_transformer_block_field(3, MockTransformer, 'list_field'), [1])
+        self.assertIn(4, block_structure)
+        self.assertEquals(block_structure_copy.get_transformer_block_field(3, MockTransformer, 'list_field'), [1, 2])
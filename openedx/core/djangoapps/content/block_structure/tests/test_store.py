@@ -6,7 +6,7 @@ from nose.plugins.attrib import attr
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
-from ..config import STORAGE_BACKING_FOR_CACHE
+from ..config import COMPACT_STORAGE_FORMAT, STORAGE_BACKING_FOR_CACHE
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
 from ..store import BlockStructureStore
@@ -59,6 +59,20 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             self.assertIsNotNone(stored_value)
             self.assert_block_structure(stored_value, self.children_map)
 
+    @ddt.data(True, False)
+    def test_add_and_get_compact_format(self, with_storage_backing):
+        with override_config_setting(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
+            with override_config_setting(COMPACT_STORAGE_FORMAT, active=True):
+                self.store.add(self.block_structure)
+
+            # Stored data is readable regardless of the format enabled for writes.
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+            self.assert_block_structure(stored_value, self.children_map)
+            self.assertEquals(
+                stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+                '{} val'.format(MockTransformer.name()),
+            )
+
     @ddt.data(True, False)
     def test_delete(self, with_storage_backing):
         with override_config_setting(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
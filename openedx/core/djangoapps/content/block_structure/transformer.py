@@ -55,6 +55,24 @@ class BlockStructureTransformer(object):
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Whether the data collected by the Transformer for a block depends
+    # only on that block, its ancestors and the course-wide data of the
+    # root block - not on the block's descendants or siblings.
+    #
+    # When all registered Transformers collect subtree-local data, the
+    # block_structure framework can update a stored block structure
+    # incrementally after a publish: only the changed blocks, their
+    # descendants and all of their ancestors are re-collected, while
+    # the stored data of all other blocks is reused.
+    #
+    # Note that the collect method is then called with a block structure
+    # that contains only the blocks to be re-collected. The xBlocks of
+    # the direct children of those blocks are still available through
+    # get_xblock, even if the children themselves are not part of the
+    # structure.
+    #
+    SUBTREE_LOCAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
@@ -175,7 +193,7 @@ class FilteringTransformerMixin(BlockStructureTransformer):
         transform_block_filters calls will be combined and used in a single
         tree traversal.
         """
-        block_structure.filter_topological_traversal(self.transform_block_filters(usage_info, block_structure))
+        block_structure.filter_with_removal(self.transform_block_filters(usage_info, block_structure))
 
     @abstractmethod
     def transform_block_filters(self, usage_info, block_structure):
@@ -189,6 +207,7 @@ class FilteringTransformerMixin(BlockStructureTransformer):
         methods are commonly used by implementations of transform_block_filters:
             create_universal_filter
             create_removal_filter
+            create_removal_mask_filter
 
         Note: Transformers that implement this alternative should be
         independent of all other registered transformers as they may not
@@ -1,7 +1,6 @@
 """
 Module for a collection of BlockStructureTransformers.
 """
-import functools
 from logging import getLogger
 
 from .exceptions import TransformerException, TransformerDataIncompatible
@@ -82,6 +81,20 @@ class BlockStructureTransformers(object):
         # Collect all fields that were requested by the transformers.
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
 
+    @classmethod
+    def supports_incremental_collect(cls, block_structure):
+        """
+        Returns whether the collected data in the given block structure
+        can be updated incrementally: all registered Transformers must
+        collect subtree-local data, and the block structure must contain
+        data collected by their current versions.
+        """
+        return all(
+            transformer.SUBTREE_LOCAL_COLLECT and
+            block_structure._get_transformer_data_version(transformer) == transformer.WRITE_VERSION  # pylint: disable=protected-access
+            for transformer in TransformerRegistry.get_registered_transformers()
+        )
+
     @classmethod
     def verify_versions(cls, block_structure):
         """
@@ -129,20 +142,7 @@ class BlockStructureTransformers(object):
         filters = []
         for transformer in self._transformers['supports_filter']:
             filters.extend(transformer.transform_block_filters(self.usage_info, block_structure))
-
-        combined_filters = functools.reduce(
-            self._filter_chain,
-            filters,
-            block_structure.create_universal_filter()
-        )
-        block_structure.filter_topological_traversal(combined_filters)
-
-    def _filter_chain(self, accumulated, additional):
-        """
-        Given two functions that take a block_key and return a boolean, yield
-        a function that takes a block key, and 'ands' the functions together
-        """
-        return lambda block_key: accumulated(block_key) and additional(block_key)
+        block_structure.filter_with_removal(filters)
 
     def _transform_without_filters(self, block_structure):
         """
@@ -0,0 +1,57 @@
+"""
+Middleware for profiling the modulestore's Mongo operations in each request.
+
+It is configured by the MODULESTORE_QUERY_PROFILING setting:
+
+    ENABLED: Whether to record the Mongo operations of each request.
+    HEADER: Whether to add a summary of them to the response, in the
+        X-Modulestore-Queries header.
+    BUDGETS: A dict of the budgets of views, by url name: the maximum number of
+        operations, or a dict of the maximum number of operations on each collection.
+        A warning is logged for each request which exceeds its view's budget.
+"""
+from django.conf import settings
+
+from xmodule.modulestore.query_profile import QueryProfile, start_profile, stop_profile
+
+QUERY_PROFILE_HEADER = 'X-Modulestore-Queries'
+
+
+def _get_profiling_settings():
+    """
+    Returns the MODULESTORE_QUERY_PROFILING setting.
+    """
+    return getattr(settings, 'MODULESTORE_QUERY_PROFILING', {})
+
+
+class ModulestoreQueryProfileMiddleware(object):
+    """
+    Records the Mongo operations made by the modulestore while handling each request.
+    """
+    def process_request(self, request):
+        """
+        Start recording the request's Mongo operations.
+        """
+        if _get_profiling_settings().get('ENABLED', False):
+            request.modulestore_query_profile = QueryProfile()
+            start_profile(request.modulestore_query_profile)
+
+    def process_response(self, request, response):
+        """
+        Stop recording the request's Mongo operations, and report them.
+        """
+        profile = getattr(request, 'modulestore_query_profile', None)
+        if profile is None:
+            return response
+        stop_profile(profile)
+
+        profiling_settings = _get_profiling_settings()
+        resolver_match = getattr(request, 'resolver_match', None)
+        url_name = resolver_match.url_name if resolver_match is not None else None
+        budget = profiling_settings.get('BUDGETS', {}).get(url_name)
+        if budget is not None:
+            profile.check_budget(budget, u'{} ({})'.format(url_name, request.path))
+
+        if profiling_settings.get('HEADER', False):
+            response[QUERY_PROFILE_HEADER] = profile.summary()
+        return response
@@ -0,0 +1,52 @@
+"""
+Tests for the modulestore query profiling middleware.
+"""
+from django.http import HttpResponse
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from mock import Mock, patch
+
+from openedx.core.djangoapps.performance.middleware import ModulestoreQueryProfileMiddleware, QUERY_PROFILE_HEADER
+from xmodule.modulestore.query_profile import is_profiling, record_query
+
+
+class ModulestoreQueryProfileMiddlewareTest(TestCase):
+    """
+    Tests that the middleware records and reports the Mongo operations of requests.
+    """
+    def setUp(self):
+        super(ModulestoreQueryProfileMiddlewareTest, self).setUp()
+        self.middleware = ModulestoreQueryProfileMiddleware()
+        self.request = RequestFactory().get('/courses/')
+        self.request.resolver_match = Mock(url_name='courseware')
+
+    def _handle_request(self):
+        """
+        Passes the request through the middleware, making two Mongo operations in between.
+        """
+        self.middleware.process_request(self.request)
+        record_query('get_structure', 'structures', keys=1)
+        record_query('get_definitions', 'definitions', keys=5)
+        return self.middleware.process_response(self.request, HttpResponse())
+
+    def test_disabled(self):
+        response = self._handle_request()
+        self.assertFalse(hasattr(self.request, 'modulestore_query_profile'))
+        self.assertNotIn(QUERY_PROFILE_HEADER, response)
+
+    @override_settings(MODULESTORE_QUERY_PROFILING={'ENABLED': True, 'HEADER': True})
+    def test_header(self):
+        response = self._handle_request()
+        self.assertFalse(is_profiling())
+        self.assertEqual(len(self.request.modulestore_query_profile), 2)
+        self.assertTrue(response[QUERY_PROFILE_HEADER].startswith('2 ops '))
+
+    @override_settings(MODULESTORE_QUERY_PROFILING={
+        'ENABLED': True, 'BUDGETS': {'courseware': {'structures': 0}, 'other': 0},
+    })
+    def test_budget(self):
+        with patch('xmodule.modulestore.query_profile.log') as mock_log:
+            response = self._handle_request()
+        self.assertEqual(mock_log.warning.call_count, 1)
+        self.assertNotIn(QUERY_PROFILE_HEADER, response)